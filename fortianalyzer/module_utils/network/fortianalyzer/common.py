@@ -26,6 +26,23 @@
 # LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
 # USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import json
+from ansible.module_utils.six import binary_type
+from ansible.module_utils.six import string_types
+
+# check for optional faster JSON libraries
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import ujson
+    HAS_UJSON = True
+except ImportError:
+    HAS_UJSON = False
+
 
 # BEGIN STATIC DATA / MESSAGES
 class FAZMethods:
@@ -250,7 +267,234 @@ class FAZCommon(object):
             pass
 
 
+class FAZRequestStats(object):
+    """
+    Keeps per-URL latency histograms and payload sizes for the JSON-RPC requests sent by the connection plugin.
+    """
+    # UPPER BOUNDS OF THE LATENCY HISTOGRAM BUCKETS, IN SECONDS
+    LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+    def __init__(self):
+        self._stats = dict()
+
+    @classmethod
+    def _bucket_label(cls, elapsed):
+        for bucket in cls.LATENCY_BUCKETS:
+            if elapsed <= bucket:
+                return "<=" + str(bucket) + "s"
+        return ">" + str(cls.LATENCY_BUCKETS[-1]) + "s"
+
+    def record(self, method, url, elapsed, request_bytes, response_bytes):
+        """
+        Records a single request.
+
+        :param method: The JSON-RPC method of the request.
+        :type method: str
+        :param url: The FortiAnalyzer URL of the request.
+        :type url: str
+        :param elapsed: Wall time of the request, in seconds.
+        :type elapsed: float
+        :param request_bytes: Size of the request payload.
+        :type request_bytes: int
+        :param response_bytes: Size of the response payload.
+        :type response_bytes: int
+        """
+        key = method + " " + url
+        entry = self._stats.get(key)
+        if entry is None:
+            entry = {
+                "method": method,
+                "url": url,
+                "count": 0,
+                "total_time": 0.0,
+                "min_time": elapsed,
+                "max_time": elapsed,
+                "request_bytes": 0,
+                "response_bytes": 0,
+                "histogram": dict(),
+            }
+            self._stats[key] = entry
+        entry["count"] += 1
+        entry["total_time"] += elapsed
+        entry["min_time"] = min(entry["min_time"], elapsed)
+        entry["max_time"] = max(entry["max_time"], elapsed)
+        entry["request_bytes"] += request_bytes
+        entry["response_bytes"] += response_bytes
+        label = self._bucket_label(elapsed)
+        entry["histogram"][label] = entry["histogram"].get(label, 0) + 1
+
+    def summary(self):
+        """
+        Returns the recorded statistics, with the URLs that took the most total time first.
+
+        :return: A dictionary with overall totals and the per-URL entries.
+        :rtype: dict
+        """
+        requests = sorted(self._stats.values(), key=lambda entry: entry["total_time"], reverse=True)
+        return {
+            "totals": {
+                "count": sum(entry["count"] for entry in requests),
+                "total_time": sum(entry["total_time"] for entry in requests),
+                "request_bytes": sum(entry["request_bytes"] for entry in requests),
+                "response_bytes": sum(entry["response_bytes"] for entry in requests),
+            },
+            "requests": requests,
+        }
+
+
+class FAZCassette(object):
+    """
+    Records the JSON-RPC request/response pairs handled by the connection plugin to a file, one JSON document per
+    line, and serves them back in replay mode so modules can run without a live FortiAnalyzer.
+    Requests are matched on their method and params. Passwords and session IDs are masked before anything is
+    written, and identical requests are replayed in the order they were recorded.
+    """
+    MODES = ("off", "record", "replay")
+    MASKED_KEYS = ("passwd", "password", "session")
+    MASK = "********"
+
+    def __init__(self, path, mode):
+        if mode not in self.MODES:
+            raise FAZBaseException(msg="Unknown cassette mode: " + str(mode))
+        if mode != "off" and not path:
+            raise FAZBaseException(msg="A cassette path is required when the cassette mode is " + str(mode))
+        self._path = path
+        self._mode = mode
+        self._recorded = None
+
+    @property
+    def mode(self):
+        return self._mode
+
+    @classmethod
+    def mask(cls, obj):
+        """
+        Returns a copy of obj with the values of any secret keys masked.
+        """
+        if isinstance(obj, dict):
+            return dict((k, cls.MASK if k in cls.MASKED_KEYS and v is not None else cls.mask(v))
+                        for k, v in obj.items())
+        if isinstance(obj, list):
+            return [cls.mask(v) for v in obj]
+        return obj
+
+    @classmethod
+    def request_key(cls, method, params):
+        return json.dumps({"method": method, "params": cls.mask(params)}, sort_keys=True)
+
+    def record(self, method, params, response):
+        """
+        Appends a request and its decoded response to the cassette.
+        """
+        entry = {
+            "method": method,
+            "params": self.mask(params),
+            "response": self.mask(response),
+        }
+        try:
+            with open(self._path, "a") as cassette:
+                cassette.write(json.dumps(entry, sort_keys=True) + "\n")
+        except (IOError, OSError) as err:
+            raise FAZBaseException(msg="Couldn't write to the cassette " + str(self._path) + ": " + str(err))
+
+    def replay(self, method, params):
+        """
+        Returns the next recorded response for a request. Once the recordings for a request are used up, the last
+        one is served again, so polling loops still terminate.
+        """
+        if self._recorded is None:
+            self._load()
+        key = self.request_key(method, params)
+        responses = self._recorded.get(key)
+        if not responses:
+            raise FAZBaseException(msg="The cassette has no recorded response for: " + key)
+        if len(responses) > 1:
+            return responses.pop(0)
+        return responses[0]
+
+    def _load(self):
+        self._recorded = dict()
+        try:
+            with open(self._path, "r") as cassette:
+                for line in cassette:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    key = self.request_key(entry["method"], entry["params"])
+                    self._recorded.setdefault(key, list()).append(entry["response"])
+        except (IOError, OSError, ValueError, KeyError) as err:
+            raise FAZBaseException(msg="Couldn't read the cassette " + str(self._path) + ": " + str(err))
+
+
+class FAZJSONCodec(object):
+    """
+    Encodes JSON-RPC requests and decodes responses with the fastest JSON library available. orjson is preferred,
+    then ujson, and the standard library is used when neither is installed.
+    """
+    if HAS_ORJSON:
+        name = "orjson"
+    elif HAS_UJSON:
+        name = "ujson"
+    else:
+        name = "json"
+
+    @staticmethod
+    def _dumps(obj):
+        if HAS_ORJSON:
+            try:
+                return orjson.dumps(obj).decode("utf-8")
+            except TypeError:
+                # ORJSON IS STRICTER ABOUT TYPES (I.E. NON-STRING KEYS), SO FALL BACK TO THE STANDARD LIBRARY
+                pass
+        elif HAS_UJSON:
+            return ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False)
+        return json.dumps(obj, ensure_ascii=False)
+
+    @classmethod
+    def encode_request(cls, obj):
+        """
+        Serializes a JSON-RPC request.
+
+        Backslash sequences inside string values are sent to the FortiAnalyzer as JSON escapes, so a literal "\\n" in a
+        playbook reaches the API as a newline. Only payloads that actually contain a backslash are translated, and
+        the common case is a single serialization with no extra pass over the payload.
+
+        :param obj: The JSON-RPC request.
+        :type obj: dict
+
+        :return: The serialized request.
+        :rtype: str
+        """
+        data = cls._dumps(obj)
+        if "\\\\" in data:
+            data = cls._dumps(decode_escape_sequences(obj))
+        return data
+
+    @staticmethod
+    def decode_response(data):
+        """
+        Deserializes a JSON-RPC response.
+
+        :param data: The raw response body.
+        :type data: bytes or str
+
+        :return: The decoded response.
+        :rtype: dict
+        """
+        if HAS_ORJSON:
+            return orjson.loads(data)
+        if HAS_UJSON:
+            return ujson.loads(data)
+        if isinstance(data, binary_type):
+            data = data.decode("utf-8")
+        return json.loads(data)
+
+
 # RECURSIVE FUNCTIONS START
+# PARAMGRAM KEYS THAT ONLY MEAN SOMETHING TO THE MODULE, AND ARE STRIPPED BEFORE THE PARAMGRAM IS SENT
+MODULE_ONLY_KEYS = ("mode", "adom", "host", "username", "password")
+
+
 def prepare_dict(obj):
     """
     Removes any keys from a dictionary that are only specific to our use in the module. FortiAnalyzer will reject
@@ -263,10 +507,8 @@ def prepare_dict(obj):
     :rtype: dict
     """
 
-    list_of_elems = ["mode", "adom", "host", "username", "password"]
-
     if isinstance(obj, dict):
-        obj = dict((key, prepare_dict(value)) for (key, value) in obj.items() if key not in list_of_elems)
+        obj = dict((key, prepare_dict(value)) for (key, value) in obj.items() if key not in MODULE_ONLY_KEYS)
     return obj
 
 
@@ -282,7 +524,67 @@ def scrub_dict(obj):
     :rtype: dict
     """
 
+    return _scrub(obj, ())
+
+
+def prepare_and_scrub_dict(obj):
+    """
+    Same as scrub_dict(prepare_dict(obj)), in a single pass over the dictionary.
+
+    :param obj: Dictionary object to be processed.
+    :type obj: dict
+
+    :return: Processed dictionary.
+    :rtype: dict
+    """
+    return _scrub(obj, MODULE_ONLY_KEYS)
+
+
+def _scrub(obj, drop_keys):
+    """
+    Scrubs every subtree exactly once, so the cost grows with the size of the dictionary and not with its depth.
+    Dictionaries inside lists are scrubbed too, and the ones left empty are removed from the list. drop_keys are
+    only removed from dictionaries, as prepare_dict() never looked inside lists.
+    """
     if isinstance(obj, dict):
-        return dict((k, scrub_dict(v)) for k, v in obj.items() if v and scrub_dict(v))
-    else:
-        return obj
+        scrubbed = dict()
+        for key, value in obj.items():
+            if not value or key in drop_keys:
+                continue
+            value = _scrub(value, drop_keys)
+            if value:
+                scrubbed[key] = value
+        return scrubbed
+    if isinstance(obj, list):
+        scrubbed = list()
+        for value in obj:
+            if isinstance(value, (dict, list)):
+                value = _scrub(value, ())
+                if isinstance(value, dict) and not value:
+                    continue
+            scrubbed.append(value)
+        return scrubbed
+    return obj
+
+
+def decode_escape_sequences(obj):
+    """
+    Translates backslash sequences in strings into the characters they stand for, as JSON escapes. Strings without a
+    backslash are returned untouched, and sequences that aren't valid JSON escapes are kept as literal backslashes.
+
+    :param obj: Object to be processed.
+    :type obj: dict or list or str
+
+    :return: Processed object.
+    :rtype: dict or list or str
+    """
+    if isinstance(obj, dict):
+        return dict((decode_escape_sequences(k), decode_escape_sequences(v)) for k, v in obj.items())
+    if isinstance(obj, list):
+        return [decode_escape_sequences(v) for v in obj]
+    if isinstance(obj, string_types) and "\\" in obj:
+        try:
+            return json.loads('"' + obj.replace('"', '\\"') + '"', strict=False)
+        except ValueError:
+            return obj
+    return obj
@@ -416,8 +416,7 @@ class FortiAnalyzerHandler(object):
                                      invocation={"module_args": ansible_facts["ansible_params"]})
         return msg
 
-    @staticmethod
-    def construct_ansible_facts(response, ansible_params, paramgram, *args, **kwargs):
+    def construct_ansible_facts(self, response, ansible_params, paramgram, *args, **kwargs):
         """
         Constructs a dictionary to return to ansible facts, containing various information about the execution.
 
@@ -440,6 +439,14 @@ class FortiAnalyzerHandler(object):
             "paramgram": scrub_dict(paramgram),
         }
 
+        # THE PLUGIN ONLY RETURNS REQUEST STATISTICS WHEN ITS DEBUG OPTION IS ENABLED
+        try:
+            request_stats = self._conn.return_request_stats()
+            if request_stats:
+                facts["request_stats"] = request_stats
+        except Exception:
+            pass
+
         if args:
             facts["custom_args"] = args
         if kwargs:
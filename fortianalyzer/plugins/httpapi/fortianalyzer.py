@@ -30,16 +30,54 @@ short_description: HttpApi Plugin for Fortinet FortiAnalyzer Appliance or VM.
 description:
   - This HttpApi plugin provides methods to connect to Fortinet FortiAnalyzer Appliance or VM via JSON RPC API.
 version_added: "2.8"
-
+options:
+  debug:
+    description:
+      - Adds the per-URL request latency and payload-size statistics collected by the plugin to the ansible facts
+        returned by modules.
+    type: boolean
+    default: False
+    env:
+      - name: ANSIBLE_FAZ_DEBUG
+    vars:
+      - name: ansible_httpapi_faz_debug
+  cassette_mode:
+    description:
+      - When set to C(record), every JSON-RPC request/response pair handled by the plugin is appended to
+        I(cassette_path).
+      - When set to C(replay), the recorded responses are served from I(cassette_path) without contacting the
+        FortiAnalyzer. Useful to benchmark and debug modules offline and deterministically.
+      - Passwords and session IDs are masked before anything is written to the cassette.
+    type: string
+    choices: ['off', 'record', 'replay']
+    default: 'off'
+    env:
+      - name: ANSIBLE_FAZ_CASSETTE_MODE
+    vars:
+      - name: ansible_httpapi_faz_cassette_mode
+  cassette_path:
+    description:
+      - Path of the cassette file used by I(cassette_mode).
+    type: path
+    env:
+      - name: ANSIBLE_FAZ_CASSETTE_PATH
+    vars:
+      - name: ansible_httpapi_faz_cassette_path
 """
 
 import json
+import time
+from io import BytesIO
 from ansible.plugins.httpapi import HttpApiBase
+from ansible.module_utils.basic import to_bytes
 from ansible.module_utils.basic import to_text
 from ansible.module_utils.network.fortianalyzer.common import BASE_HEADERS
+from ansible.module_utils.network.fortianalyzer.common import FAZCassette
 from ansible.module_utils.network.fortianalyzer.common import FAZBaseException
 from ansible.module_utils.network.fortianalyzer.common import FAZCommon
+from ansible.module_utils.network.fortianalyzer.common import FAZJSONCodec
 from ansible.module_utils.network.fortianalyzer.common import FAZMethods
+from ansible.module_utils.network.fortianalyzer.common import FAZRequestStats
 
 
 class HttpApi(HttpApiBase):
@@ -63,6 +101,8 @@ class HttpApi(HttpApiBase):
         self._uses_adoms = False
         self._adom_list = list()
         self._logged_in_user = None
+        self._request_stats = FAZRequestStats()
+        self._cassette = None
 
     def set_become(self, become_context):
         """
@@ -91,6 +131,10 @@ class HttpApi(HttpApiBase):
         """
 
         self._logged_in_user = username
+        self.debug = self._get_plugin_option("debug", False)
+        cassette_mode = self._get_plugin_option("cassette_mode", "off")
+        if cassette_mode != "off":
+            self._cassette = FAZCassette(self._get_plugin_option("cassette_path"), cassette_mode)
         self.send_request(FAZMethods.EXEC, self._tools.format_request(FAZMethods.EXEC, "sys/login/user",
                                                                       passwd=password, user=username,))
 
@@ -137,6 +181,18 @@ class HttpApi(HttpApiBase):
             self.sid = None
             return ret_code, response
 
+    def _get_plugin_option(self, option, default=None):
+        """
+        Returns the value of a plugin option, or the default if it isn't set or can't be read.
+        """
+        try:
+            value = self.get_option(option)
+        except Exception:
+            return default
+        if value is None:
+            return default
+        return value
+
     def send_request(self, method, params):
         """
         Responsible for actual sending of data to the connection httpapi base plugin. Does some formatting as well.
@@ -168,18 +224,42 @@ class HttpApi(HttpApiBase):
             "id": self.req_id,
             "verbose": 1
         }
-        data = json.dumps(json_request, ensure_ascii=False).replace('\\\\', '\\')
+        data = FAZJSONCodec.encode_request(json_request)
         try:
             # Sending URL and Data in Unicode, per Ansible Specifications for Connection Plugins
-            response, response_data = self.connection.send(path=to_text(self._url), data=to_text(data),
-                                                           headers=BASE_HEADERS)
-            # Get Unicode Response - Must convert from StringIO to unicode first so we can do a replace function below
-            result = json.loads(to_text(response_data.getvalue()))
+            start_time = time.time()
+            if self._cassette is not None and self._cassette.mode == "replay":
+                response_data = BytesIO(to_bytes(json.dumps(self._cassette.replay(method, params))))
+            else:
+                response, response_data = self.connection.send(path=to_text(self._url), data=to_text(data),
+                                                               headers=BASE_HEADERS)
+                if self._cassette is not None and self._cassette.mode == "record":
+                    self._cassette.record(method, params, FAZJSONCodec.decode_response(response_data.getvalue()))
+            self._record_request(method, params, data, response_data, time.time() - start_time)
+            result = FAZJSONCodec.decode_response(response_data.getvalue())
             self._update_self_from_response(result, self._url, data)
             return self._handle_response(result)
         except Exception as err:
             raise FAZBaseException(err)
 
+    def _record_request(self, method, params, data, response_data, elapsed):
+        """
+        Records the latency and payload sizes of a request in the per-URL statistics.
+        """
+        try:
+            url = params[0]["url"]
+            if len(params) > 1:
+                url = "[batch] " + url
+            # SEEKING TO THE END GIVES THE SIZE WITHOUT COPYING THE BUFFER
+            position = response_data.tell()
+            response_data.seek(0, 2)
+            response_bytes = response_data.tell()
+            response_data.seek(position)
+            self._request_stats.record(method, to_text(url), elapsed, len(to_bytes(data)), response_bytes)
+        except Exception:
+            # STATISTICS ARE INFORMATIONAL ONLY AND MUST NEVER BREAK A REQUEST
+            pass
+
     def _handle_response(self, response):
         self._set_sid(response)
         if isinstance(response["result"], list):
@@ -219,6 +299,16 @@ class HttpApi(HttpApiBase):
         except Exception:
             raise FAZBaseException("Couldn't Retrieve Connected FAZ Stats")
 
+    def return_request_stats(self):
+        """
+        Returns the per-URL request statistics collected so far, if the debug option is enabled.
+
+        :return: dict
+        """
+        if not self.debug:
+            return None
+        return self._request_stats.summary()
+
     def get_system_status(self):
         """
         Returns the system status page from the FortiAnalyzer, for logging and other uses.
@@ -26,6 +26,28 @@
 # LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
 # USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import codecs
+import json
+import random
+import socket
+import threading
+import time
+from ansible.module_utils.six import binary_type
+from ansible.module_utils.six import string_types
+
+# check for optional faster JSON libraries
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import ujson
+    HAS_UJSON = True
+except ImportError:
+    HAS_UJSON = False
+
 
 # BEGIN STATIC DATA / MESSAGES
 class FMGRMethods:
@@ -46,6 +68,16 @@ BASE_HEADERS = {
     'Accept': 'application/json'
 }
 
+# MAXIMUM NUMBER OF OPERATIONS PACKED INTO A SINGLE MULTI-PARAMS JSON-RPC REQUEST
+FMGR_BATCH_SIZE = 100
+
+# NUMBER OF OBJECTS REQUESTED PER PAGE BY THE PAGED GET HELPERS
+FMGR_PAGE_SIZE = 1000
+
+# DOTTED IPV4 NETMASK OF EVERY PREFIX LENGTH, I.E. FMGR_NETMASKS[24] == "255.255.255.0"
+FMGR_NETMASKS = tuple(".".join(str((((0xffffffff << (32 - prefix)) & 0xffffffff) >> shift) & 0xff)
+                               for shift in (24, 16, 8, 0)) for prefix in range(33))
+
 
 # FMGR RETURN CODES
 FMGR_RC = {
@@ -132,7 +164,6 @@ class FMGBaseException(Exception):
 
 # BEGIN CLASSES
 class FMGRCommon(object):
-
     @staticmethod
     def format_request(method, url, *args, **kwargs):
         """
@@ -147,23 +178,18 @@ class FMGRCommon(object):
         :return: Properly formatted dictionary payload for API Request via Connection Plugin.
         :rtype: dict
         """
-
-        params = [{"url": url}]
-        if args:
-            for arg in args:
-                params[0].update(arg)
+        params = {"url": url}
+        for arg in args:
+            params.update(arg)
         if kwargs:
-            keylist = list(kwargs)
-            for k in keylist:
-                kwargs[k.replace("__", "-")] = kwargs.pop(k)
-            if method == "get" or method == "clone":
-                params[0].update(kwargs)
+            payload = {key.replace("__", "-"): value for key, value in kwargs.items()}
+            if method in [FMGRMethods.GET, FMGRMethods.CLONE]:
+                params.update(payload)
+            elif payload.get("data", False):
+                params["data"] = payload["data"]
             else:
-                if kwargs.get("data", False):
-                    params[0]["data"] = kwargs["data"]
-                else:
-                    params[0]["data"] = kwargs
-        return params
+                params["data"] = payload
+        return [params]
 
     @staticmethod
     def split_comma_strings_into_lists(obj):
@@ -199,19 +225,19 @@ class FMGRCommon(object):
         Converts a CIDR Network string to full blown IP/Subnet format in decimal format.
         Decided not use IP Address module to keep includes to a minimum.
 
-        :param cidr: String object in CIDR format to be processed
-        :type cidr: str
+        :param cidr: The prefix length to be processed, as an int or a string.
+        :type cidr: int or str
 
-        :return: A string object that looks like this "x.x.x.x/y.y.y.y"
+        :return: A string object that looks like this "y.y.y.y"
         :rtype: str
         """
-        if isinstance(cidr, str):
-            cidr = int(cidr)
-            mask = (0xffffffff >> (32 - cidr)) << (32 - cidr)
-            return (str((0xff000000 & mask) >> 24) + '.'
-                    + str((0x00ff0000 & mask) >> 16) + '.'
-                    + str((0x0000ff00 & mask) >> 8) + '.'
-                    + str((0x000000ff & mask)))
+        try:
+            prefix = int(cidr)
+        except (TypeError, ValueError):
+            prefix = -1
+        if isinstance(cidr, bool) or not 0 <= prefix <= 32:
+            raise FMGBaseException(msg="Invalid IPv4 prefix length: " + repr(cidr))
+        return FMGR_NETMASKS[prefix]
 
     @staticmethod
     def paramgram_child_list_override(list_overrides, paramgram, module):
@@ -250,7 +276,487 @@ class FMGRCommon(object):
             pass
 
 
+class FMGRRequestStats(object):
+    """
+    Keeps per-URL latency histograms and payload sizes for the JSON-RPC requests sent by the connection plugin.
+    """
+    # UPPER BOUNDS OF THE LATENCY HISTOGRAM BUCKETS, IN SECONDS
+    LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+    def __init__(self):
+        self._stats = dict()
+
+    @classmethod
+    def _bucket_label(cls, elapsed):
+        for bucket in cls.LATENCY_BUCKETS:
+            if elapsed <= bucket:
+                return "<=" + str(bucket) + "s"
+        return ">" + str(cls.LATENCY_BUCKETS[-1]) + "s"
+
+    def record(self, method, url, elapsed, request_bytes, response_bytes):
+        """
+        Records a single request.
+
+        :param method: The JSON-RPC method of the request.
+        :type method: str
+        :param url: The FortiManager URL of the request.
+        :type url: str
+        :param elapsed: Wall time of the request, in seconds.
+        :type elapsed: float
+        :param request_bytes: Size of the request payload.
+        :type request_bytes: int
+        :param response_bytes: Size of the response payload.
+        :type response_bytes: int
+        """
+        key = method + " " + url
+        entry = self._stats.get(key)
+        if entry is None:
+            entry = {
+                "method": method,
+                "url": url,
+                "count": 0,
+                "total_time": 0.0,
+                "min_time": elapsed,
+                "max_time": elapsed,
+                "request_bytes": 0,
+                "response_bytes": 0,
+                "histogram": dict(),
+            }
+            self._stats[key] = entry
+        entry["count"] += 1
+        entry["total_time"] += elapsed
+        entry["min_time"] = min(entry["min_time"], elapsed)
+        entry["max_time"] = max(entry["max_time"], elapsed)
+        entry["request_bytes"] += request_bytes
+        entry["response_bytes"] += response_bytes
+        label = self._bucket_label(elapsed)
+        entry["histogram"][label] = entry["histogram"].get(label, 0) + 1
+
+    def summary(self):
+        """
+        Returns the recorded statistics, with the URLs that took the most total time first.
+
+        :return: A dictionary with overall totals and the per-URL entries.
+        :rtype: dict
+        """
+        requests = sorted(self._stats.values(), key=lambda entry: entry["total_time"], reverse=True)
+        return {
+            "totals": {
+                "count": sum(entry["count"] for entry in requests),
+                "total_time": sum(entry["total_time"] for entry in requests),
+                "request_bytes": sum(entry["request_bytes"] for entry in requests),
+                "response_bytes": sum(entry["response_bytes"] for entry in requests),
+            },
+            "requests": requests,
+        }
+
+
+class FMGRRetryPolicy(object):
+    """
+    Decides whether a failed JSON-RPC request can be sent again, and how long to back off before the next attempt.
+    Idempotent GETs are retried on any transient transport failure. Writes are only retried when the failure
+    clearly happened before the request reached the FortiManager.
+    """
+    PRE_SEND = "pre-send failure"
+    TRANSIENT = "transient failure"
+
+    # HTTP STATUS CODES RETURNED BY LOAD BALANCERS AND PROXIES WHEN THE FORTIMANAGER IS BRIEFLY UNAVAILABLE
+    TRANSIENT_HTTP_CODES = (502, 503, 504)
+    # ERRORS THAT MEAN WE NEVER GOT A CONNECTION, SO NOTHING WAS SENT
+    PRE_SEND_ERRORS = ("connection refused", "name or service not known", "nodename nor servname provided",
+                       "temporary failure in name resolution", "no route to host", "network is unreachable")
+    # ERRORS THAT CAN HAPPEN AFTER THE REQUEST WAS SENT, SO ONLY IDEMPOTENT REQUESTS ARE RETRIED
+    TRANSIENT_ERRORS = ("connection reset", "connection aborted", "broken pipe", "timed out",
+                        "remote end closed connection", "badstatusline", "bad gateway", "service unavailable",
+                        "gateway timeout")
+
+    def __init__(self, retries=2, backoff=1.0, max_backoff=30.0):
+        self.retries = int(retries)
+        self.backoff = float(backoff)
+        self.max_backoff = float(max_backoff)
+
+    def classify(self, err):
+        """
+        Classifies a transport exception.
+
+        :param err: The exception raised while sending a request.
+        :type err: Exception
+
+        :return: PRE_SEND, TRANSIENT, or None if the error shouldn't be retried.
+        :rtype: str
+        """
+        code = getattr(err, "code", None)
+        if isinstance(code, int) and code in self.TRANSIENT_HTTP_CODES:
+            return self.TRANSIENT
+        message = (str(err) + " " + str(getattr(err, "reason", ""))).lower()
+        if any(error in message for error in self.PRE_SEND_ERRORS):
+            return self.PRE_SEND
+        if any(error in message for error in self.TRANSIENT_ERRORS):
+            return self.TRANSIENT
+        if isinstance(err, (socket.timeout, socket.gaierror)):
+            return self.TRANSIENT
+        return None
+
+    def retry_reason(self, method, err, attempt):
+        """
+        Returns why a failed request may be retried, or None if it must not be.
+
+        :param method: The JSON-RPC method of the failed request.
+        :type method: str
+        :param err: The exception raised while sending the request.
+        :type err: Exception
+        :param attempt: The number of retries already made for this request.
+        :type attempt: int
+
+        :return: The retry reason, or None.
+        :rtype: str
+        """
+        if attempt >= self.retries:
+            return None
+        kind = self.classify(err)
+        if kind == self.PRE_SEND:
+            return kind
+        if kind == self.TRANSIENT and method == FMGRMethods.GET:
+            return kind
+        return None
+
+    def delay(self, attempt):
+        """
+        Returns the backoff before the next attempt: exponential, capped, with full jitter.
+        """
+        return random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+
+
+class FMGRCassette(object):
+    """
+    Records the JSON-RPC request/response pairs handled by the connection plugin to a file, one JSON document per
+    line, and serves them back in replay mode so modules can run without a live FortiManager.
+    Requests are matched on their method and params. Passwords and session IDs are masked before anything is
+    written, and identical requests are replayed in the order they were recorded.
+    """
+    MODES = ("off", "record", "replay")
+    MASKED_KEYS = ("passwd", "password", "session")
+    MASK = "********"
+
+    def __init__(self, path, mode):
+        if mode not in self.MODES:
+            raise FMGBaseException(msg="Unknown cassette mode: " + str(mode))
+        if mode != "off" and not path:
+            raise FMGBaseException(msg="A cassette path is required when the cassette mode is " + str(mode))
+        self._path = path
+        self._mode = mode
+        self._recorded = None
+
+    @property
+    def mode(self):
+        return self._mode
+
+    @classmethod
+    def mask(cls, obj):
+        """
+        Returns a copy of obj with the values of any secret keys masked.
+        """
+        if isinstance(obj, dict):
+            return dict((k, cls.MASK if k in cls.MASKED_KEYS and v is not None else cls.mask(v))
+                        for k, v in obj.items())
+        if isinstance(obj, list):
+            return [cls.mask(v) for v in obj]
+        return obj
+
+    @classmethod
+    def request_key(cls, method, params):
+        return json.dumps({"method": method, "params": cls.mask(params)}, sort_keys=True)
+
+    def record(self, method, params, response):
+        """
+        Appends a request and its decoded response to the cassette.
+        """
+        entry = {
+            "method": method,
+            "params": self.mask(params),
+            "response": self.mask(response),
+        }
+        try:
+            with open(self._path, "a") as cassette:
+                cassette.write(json.dumps(entry, sort_keys=True) + "\n")
+        except (IOError, OSError) as err:
+            raise FMGBaseException(msg="Couldn't write to the cassette " + str(self._path) + ": " + str(err))
+
+    def replay(self, method, params):
+        """
+        Returns the next recorded response for a request. Once the recordings for a request are used up, the last
+        one is served again, so polling loops still terminate.
+        """
+        if self._recorded is None:
+            self._load()
+        key = self.request_key(method, params)
+        responses = self._recorded.get(key)
+        if not responses:
+            raise FMGBaseException(msg="The cassette has no recorded response for: " + key)
+        if len(responses) > 1:
+            return responses.pop(0)
+        return responses[0]
+
+    def _load(self):
+        self._recorded = dict()
+        try:
+            with open(self._path, "r") as cassette:
+                for line in cassette:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    key = self.request_key(entry["method"], entry["params"])
+                    self._recorded.setdefault(key, list()).append(entry["response"])
+        except (IOError, OSError, ValueError, KeyError) as err:
+            raise FMGBaseException(msg="Couldn't read the cassette " + str(self._path) + ": " + str(err))
+
+
+class FMGRJSONCodec(object):
+    """
+    Encodes JSON-RPC requests and decodes responses with the fastest JSON library available. orjson is preferred,
+    then ujson, and the standard library is used when neither is installed.
+    """
+    if HAS_ORJSON:
+        name = "orjson"
+    elif HAS_UJSON:
+        name = "ujson"
+    else:
+        name = "json"
+
+    @staticmethod
+    def _dumps(obj):
+        if HAS_ORJSON:
+            try:
+                return orjson.dumps(obj).decode("utf-8")
+            except TypeError:
+                # ORJSON IS STRICTER ABOUT TYPES (I.E. NON-STRING KEYS), SO FALL BACK TO THE STANDARD LIBRARY
+                pass
+        elif HAS_UJSON:
+            return ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False)
+        return json.dumps(obj, ensure_ascii=False)
+
+    @classmethod
+    def encode_request(cls, obj):
+        """
+        Serializes a JSON-RPC request.
+
+        Backslash sequences inside string values are sent to the FortiManager as JSON escapes, so a literal "\\n" in a
+        playbook reaches the API as a newline. Only payloads that actually contain a backslash are translated, and
+        the common case is a single serialization with no extra pass over the payload.
+
+        :param obj: The JSON-RPC request.
+        :type obj: dict
+
+        :return: The serialized request.
+        :rtype: str
+        """
+        data = cls._dumps(obj)
+        if "\\\\" in data:
+            data = cls._dumps(decode_escape_sequences(obj))
+        return data
+
+    @staticmethod
+    def decode_response(data):
+        """
+        Deserializes a JSON-RPC response.
+
+        :param data: The raw response body.
+        :type data: bytes or str
+
+        :return: The decoded response.
+        :rtype: dict
+        """
+        if HAS_ORJSON:
+            return orjson.loads(data)
+        if HAS_UJSON:
+            return ujson.loads(data)
+        if isinstance(data, binary_type):
+            data = data.decode("utf-8")
+        return json.loads(data)
+
+    @classmethod
+    def decode_buffer(cls, buffer):
+        """
+        Deserializes a JSON-RPC response straight from the buffer the connection returned it in.
+
+        The body is not copied out of the buffer first. orjson parses the buffer in place, and the standard library
+        only makes the one text copy it needs, so a large response peaks at the buffer plus the decoded objects
+        instead of the buffer, a bytes copy and a text copy.
+
+        :param buffer: The raw response body.
+        :type buffer: BytesIO
+
+        :return: The decoded response.
+        :rtype: dict
+        """
+        getbuffer = getattr(buffer, "getbuffer", None)
+        if getbuffer is None or (HAS_UJSON and not HAS_ORJSON):
+            # PYTHON 2 HAS NO BUFFER VIEW, AND UJSON ONLY PARSES BYTES OR TEXT
+            return cls.decode_response(buffer.getvalue())
+        # THE VIEW MUST BE RELEASED BEFORE THE BUFFER CAN BE WRITTEN TO AGAIN
+        with getbuffer() as view:
+            if HAS_ORJSON:
+                return orjson.loads(view)
+            return json.loads(codecs.decode(view, "utf-8"))
+
+
+class FMGRGetCache(object):
+    """
+    A read-through cache of GET responses for the lifetime of a persistent connection. Entries are keyed by the
+    full request parameters and expire after a TTL. Writes invalidate every entry whose URL is a path prefix of the
+    written URL, or the other way around, so a change to an object also drops the cached table it lives in.
+    """
+    # URLS WHOSE ANSWER IS EXPECTED TO CHANGE BETWEEN TWO READS, OR THAT ARE USED TO VALIDATE THE SESSION
+    UNCACHEABLE_URLS = ("/task/", "sys/status")
+
+    def __init__(self, ttl=0):
+        self.ttl = float(ttl or 0)
+        self._entries = dict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self):
+        return self.ttl > 0
+
+    @staticmethod
+    def _normalize_url(url):
+        return "/" + str(url).strip("/")
+
+    @classmethod
+    def _related(cls, cached_url, written_url):
+        return cached_url == written_url or cached_url.startswith(written_url + "/") \
+            or written_url.startswith(cached_url + "/")
+
+    def _key(self, params):
+        if not self.enabled or not isinstance(params, list) or len(params) != 1:
+            return None
+        url = params[0].get("url", "")
+        for uncacheable in self.UNCACHEABLE_URLS:
+            if uncacheable in url:
+                return None
+        # PAGES ARE READ ONCE WHILE WALKING A TABLE. CACHING THEM WOULD KEEP THE WHOLE TABLE IN MEMORY
+        if "range" in params[0]:
+            return None
+        return json.dumps(params, sort_keys=True)
+
+    def get(self, params):
+        """
+        Returns the cached response for a GET request, or None on a miss.
+
+        :param params: The formatted params list of the request.
+        :type params: list
+
+        :return: The cached (code, data) response.
+        :rtype: tuple
+        """
+        key = self._key(params)
+        if key is None:
+            return None
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] > time.time():
+            self.hits += 1
+            return entry[2]
+        if entry is not None:
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def store(self, params, response):
+        """
+        Caches the response of a successful GET request.
+
+        :param params: The formatted params list of the request.
+        :type params: list
+        :param response: The (code, data) response.
+        :type response: tuple
+        """
+        key = self._key(params)
+        if key is None or response[0] != 0:
+            return
+        self._entries[key] = (self._normalize_url(params[0]["url"]), time.time() + self.ttl, response)
+
+    def invalidate(self, method, url):
+        """
+        Drops the entries a write to url may have changed.
+
+        Workspace lock/unlock/commit calls only touch that workspace's entries (i.e. lockinfo). Any other exec may have
+        side effects anywhere, such as installs and scripts, so it clears the whole cache.
+
+        :param method: The JSON-RPC method of the write.
+        :type method: str
+        :param url: The URL of the write.
+        :type url: str
+        """
+        if not self._entries:
+            return
+        written_url = self._normalize_url(url)
+        if method == FMGRMethods.EXEC:
+            if "/workspace/" not in written_url + "/":
+                self.invalidations += len(self._entries)
+                self._entries.clear()
+                return
+            written_url = written_url.rsplit("/", 1)[0]
+        stale = [key for key, entry in self._entries.items() if self._related(entry[0], written_url)]
+        for key in stale:
+            del self._entries[key]
+        self.invalidations += len(stale)
+
+    def summary(self):
+        """
+        Returns the hit, miss and invalidation counters.
+
+        :rtype: dict
+        """
+        return {
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "entries": len(self._entries),
+        }
+
+
+class FMGRPrefetch(object):
+    """
+    Runs a single call in a background thread, so the next page of a paged GET is already on its way while the
+    caller works through the current one. result() waits for the call and returns its value, or re-raises its error.
+    """
+
+    def __init__(self, func, *args, **kwargs):
+        self._func = func
+        self._args = args
+        self._kwargs = kwargs
+        self._result = None
+        self._error = None
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _run(self):
+        try:
+            self._result = self._func(*self._args, **self._kwargs)
+        except Exception as err:
+            self._error = err
+
+    def result(self):
+        """
+        Waits for the call to finish.
+
+        :return: The return value of the call.
+        """
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+
 # RECURSIVE FUNCTIONS START
+# PARAMGRAM KEYS THAT ONLY MEAN SOMETHING TO THE MODULE, AND ARE STRIPPED BEFORE THE PARAMGRAM IS SENT
+MODULE_ONLY_KEYS = ("mode", "adom", "host", "username", "password")
+
+
 def prepare_dict(obj):
     """
     Removes any keys from a dictionary that are only specific to our use in the module. FortiManager will reject
@@ -263,10 +769,8 @@ def prepare_dict(obj):
     :rtype: dict
     """
 
-    list_of_elems = ["mode", "adom", "host", "username", "password"]
-
     if isinstance(obj, dict):
-        obj = dict((key, prepare_dict(value)) for (key, value) in obj.items() if key not in list_of_elems)
+        obj = dict((key, prepare_dict(value)) for (key, value) in obj.items() if key not in MODULE_ONLY_KEYS)
     return obj
 
 
@@ -282,7 +786,67 @@ def scrub_dict(obj):
     :rtype: dict
     """
 
+    return _scrub(obj, ())
+
+
+def prepare_and_scrub_dict(obj):
+    """
+    Same as scrub_dict(prepare_dict(obj)), in a single pass over the dictionary.
+
+    :param obj: Dictionary object to be processed.
+    :type obj: dict
+
+    :return: Processed dictionary.
+    :rtype: dict
+    """
+    return _scrub(obj, MODULE_ONLY_KEYS)
+
+
+def _scrub(obj, drop_keys):
+    """
+    Scrubs every subtree exactly once, so the cost grows with the size of the dictionary and not with its depth.
+    Dictionaries inside lists are scrubbed too, and the ones left empty are removed from the list. drop_keys are
+    only removed from dictionaries, as prepare_dict() never looked inside lists.
+    """
     if isinstance(obj, dict):
-        return dict((k, scrub_dict(v)) for k, v in obj.items() if v and scrub_dict(v))
-    else:
-        return obj
+        scrubbed = dict()
+        for key, value in obj.items():
+            if not value or key in drop_keys:
+                continue
+            value = _scrub(value, drop_keys)
+            if value:
+                scrubbed[key] = value
+        return scrubbed
+    if isinstance(obj, list):
+        scrubbed = list()
+        for value in obj:
+            if isinstance(value, (dict, list)):
+                value = _scrub(value, ())
+                if isinstance(value, dict) and not value:
+                    continue
+            scrubbed.append(value)
+        return scrubbed
+    return obj
+
+
+def decode_escape_sequences(obj):
+    """
+    Translates backslash sequences in strings into the characters they stand for, as JSON escapes. Strings without a
+    backslash are returned untouched, and sequences that aren't valid JSON escapes are kept as literal backslashes.
+
+    :param obj: Object to be processed.
+    :type obj: dict or list or str
+
+    :return: Processed object.
+    :rtype: dict or list or str
+    """
+    if isinstance(obj, dict):
+        return dict((decode_escape_sequences(k), decode_escape_sequences(v)) for k, v in obj.items())
+    if isinstance(obj, list):
+        return [decode_escape_sequences(v) for v in obj]
+    if isinstance(obj, string_types) and "\\" in obj:
+        try:
+            return json.loads('"' + obj.replace('"', '\\"') + '"', strict=False)
+        except ValueError:
+            return obj
+    return obj
@@ -32,6 +32,12 @@ from ansible.module_utils.network.fortimanager.common import FMGBaseException
 from ansible.module_utils.network.fortimanager.common import FMGRCommon
 from ansible.module_utils.network.fortimanager.common import scrub_dict
 from ansible.module_utils.network.fortimanager.common import FMGRMethods
+from ansible.module_utils.network.fortimanager.common import FMGRPrefetch
+from ansible.module_utils.network.fortimanager.common import FMGR_PAGE_SIZE
+from ansible.module_utils.network.fortimanager.common import FMGR_BATCH_SIZE
+from ansible.module_utils.network.fortimanager.fortimanager_diff import FMGRDiff
+from ansible.module_utils.network.fortimanager.fortimanager_diff import FMGR_UNCHANGED_KEY
+from contextlib import contextmanager
 import time
 
 # check for pyFMG lib - DEPRECATING
@@ -54,6 +60,57 @@ except ImportError:
 
 
 # BEGIN HANDLER CLASSES
+class FMGRLazyFacts(dict):
+    """
+    Ansible facts that are only built once they're read, which normally means once the module exits with them.
+    Modules construct facts for every govern_response() call, but most of those calls don't exit.
+    """
+
+    def __init__(self, builder):
+        super(FMGRLazyFacts, self).__init__()
+        self._builder = builder
+
+    def build(self):
+        """
+        Builds the facts, if they haven't been built yet.
+
+        :return: self
+        :rtype: dict
+        """
+        if self._builder is not None:
+            builder = self._builder
+            self._builder = None
+            self.update(builder())
+        return self
+
+    def __getitem__(self, key):
+        return dict.__getitem__(self.build(), key)
+
+    def __contains__(self, key):
+        return dict.__contains__(self.build(), key)
+
+    def __iter__(self):
+        return dict.__iter__(self.build())
+
+    def __len__(self):
+        return dict.__len__(self.build())
+
+    def get(self, key, default=None):
+        return dict.get(self.build(), key, default)
+
+    def keys(self):
+        return dict.keys(self.build())
+
+    def values(self):
+        return dict.values(self.build())
+
+    def items(self):
+        return dict.items(self.build())
+
+    def copy(self):
+        return dict(self.items())
+
+
 class FortiManagerHandler(object):
     def __init__(self, conn, module):
         self._conn = conn
@@ -63,10 +120,23 @@ class FortiManagerHandler(object):
         self._uses_adoms = None
         self._locked_adom_list = list()
         self._lock_info = None
-
-        self.workspace_check()
-        if self._uses_workspace:
-            self.get_lock_info(adom=self._module.paramgram["adom"])
+        self._adom_list = list()
+        self._debug = False
+        self._transaction_adom = None
+        self._transaction_writes = 0
+        self._transaction_depth = 0
+        self._deferred_commit = False
+        self._held_adoms = dict()
+        self._get_cache = False
+        self._facts_mode = "full"
+        self._connected_fmgr = None
+
+        # THE CONNECTION PLUGIN ALREADY CHECKED THE WORKSPACE/ADOM MODE AT LOGIN. ONLY ASK THE FORTIMANAGER AGAIN
+        # IF THE PLUGIN COULDN'T TELL US.
+        if not self.load_session_state():
+            self.workspace_check()
+            if self._uses_workspace:
+                self.get_lock_info(adom=self._module.paramgram["adom"])
 
     def process_request(self, url, datagram, method):
         """
@@ -107,7 +177,14 @@ class FortiManagerHandler(object):
             except BaseException:
                 pass
 
-            if task_id:
+            async_task = False
+            try:
+                # ASYNC TASKS RETURN THEIR TASK ID RIGHT AWAY, AND ARE WAITED ON LATER WITH FMGR_TASK_WAIT
+                async_task = bool(self._module.paramgram["async_task"])
+            except KeyError:
+                pass
+
+            if task_id and not async_task:
                 retry_interval = 5
                 retry_count = 150
                 try:
@@ -120,33 +197,19 @@ class FortiManagerHandler(object):
                         retry_count = int(self._module.paramgram["retry_count"])
                 except KeyError:
                     pass
-                task_status = 0
-                query_count = 0
-                while task_status != 100:
-                    if query_count > retry_count:
-                        self.unlock_adom(adom=adom)
-                        raise FMGBaseException(msg="The Task in workspace mode exceeded the timeout/retry count. "
-                                                   "Please adjust the retry_count and retry_interval variables "
-                                                   "in the playbook/module.")
-                    time.sleep(retry_interval)
-                    task_query_data = self._tools.format_request(FMGRMethods.GET,
-                                                                 '/task/task/{task_id}'.format(task_id=task_id),
-                                                                 {"adom": self._module.paramgram["adom"]})
-                    task_query_response = self._conn.send_request(FMGRMethods.GET, task_query_data)
-                    try:
-                        task_status = task_query_response[1]["percent"]
-                    except BaseException as err:
-                        self.unlock_adom(adom=adom)
-                        raise FMGBaseException(msg="A task was executed in workspace mode, but the task_id wasn't"
-                                                   "returned. Something has gone wrong. We've unlocked the ADOM,"
-                                                   "and no changes should have been made. Error: " + str(err))
-                    query_count += 1
+                try:
+                    # RETRY_INTERVAL IS NOW THE CEILING OF THE BACKOFF, AND THE OLD WORST CASE IS THE TIMEOUT
+                    self.wait_for_tasks([task_id], adom=adom, max_interval=retry_interval,
+                                        timeout=retry_interval * retry_count)
+                except BaseException:
+                    self.unlock_adom(adom=adom)
+                    raise
 
             try:
                 adom = self._module.paramgram["adom"]
                 if self.uses_workspace and adom in self._locked_adom_list \
                         and response[0] == 0 and method != FMGRMethods.GET:
-                    self.commit_changes(adom=adom)
+                    self.commit_write(adom)
             except BaseException as err:
                 raise FMGBaseException(err)
 
@@ -158,6 +221,484 @@ class FortiManagerHandler(object):
 
         return response
 
+    def commit_write(self, adom):
+        """
+        Commits a successful write to a locked ADOM, unless the commit is deferred. In deferred commit mode the play
+        commits with fmgr_workspace, and inside a transaction the commit is left to commit_transaction().
+
+        :param adom: The ADOM that was written to.
+        :type adom: string
+        """
+        if self._deferred_commit:
+            self.mark_adom_dirty(adom)
+        elif self.in_transaction(adom):
+            self._transaction_writes += 1
+        else:
+            self.commit_changes(adom=adom)
+
+    def delete_by_filter(self, url, delete_filter, key="name"):
+        """
+        Deletes every object of a table that matches a JSON-RPC filter, i.e. ["name", "like", "tmp-%"]. The matching
+        keys are resolved with a single GET projected to the key attribute, and the deletes are sent in batched
+        multi-params requests. In workspace mode the ADOM is locked once and committed once.
+
+        :param url: The table URL, i.e. /pm/config/adom/root/obj/firewall/address
+        :type url: string
+        :param delete_filter: The JSON-RPC filter selecting the objects to delete.
+        :type delete_filter: list
+        :param key: The attribute that names an object in its URL, i.e. name, or policyid for policies.
+        :type key: string
+
+        :return: The deleted and failed keys, under "deleted" and "failed".
+        :rtype: tuple
+        """
+        url = url.rstrip("/")
+        query = self._tools.format_request(FMGRMethods.GET, url, filter=delete_filter, fields=[key])
+        matches = self._conn.send_request(FMGRMethods.GET, query)
+        if matches[0] != 0:
+            return matches
+        keys = [match[key] for match in matches[1] or [] if match.get(key) is not None]
+        if not keys:
+            return 0, {"status": {"code": 0, "message": "No objects matched the filter."}, "url": url,
+                       "deleted": [], "failed": [], FMGR_UNCHANGED_KEY: True}
+        return self.delete_objects(url, keys, key=key)
+
+    def delete_objects(self, url, keys, key="name"):
+        """
+        Deletes objects of a table by key, sending the deletes in batched multi-params requests. In workspace mode the
+        ADOM is locked once and committed once.
+
+        :param url: The table URL, i.e. /pm/config/adom/root/obj/firewall/address
+        :type url: string
+        :param keys: The keys of the objects to delete.
+        :type keys: list
+        :param key: The attribute that names an object in its URL, i.e. name, or policyid for policies.
+        :type key: string
+
+        :return: The deleted and failed keys, under "deleted" and "failed".
+        :rtype: tuple
+        """
+        url = url.rstrip("/")
+        adom = self._module.paramgram["adom"]
+        if self.uses_workspace and adom not in self._locked_adom_list:
+            self.lock_adom(adom=adom)
+        requests = [(FMGRMethods.DELETE, "{url}/{key}".format(url=url, key=object_key), {}) for object_key in keys]
+        results = self._conn.send_batch(requests)
+
+        deleted = list()
+        failed = list()
+        for object_key, result in zip(keys, results):
+            if result[0] == 0:
+                deleted.append(object_key)
+            else:
+                failed.append({key: object_key, "code": result[0], "message": self._result_message(result)})
+        if self.uses_workspace and adom in self._locked_adom_list and deleted:
+            self.commit_write(adom)
+
+        code = 0 if not failed else failed[0]["code"]
+        msg = "Deleted " + str(len(deleted)) + " of " + str(len(keys)) + " objects."
+        return code, {"status": {"code": code, "message": msg}, "url": url, "deleted": deleted, "failed": failed}
+
+    def write_objects(self, url, datagrams, method, key="name", chunk_size=FMGR_BATCH_SIZE):
+        """
+        Adds, sets or updates many objects of a table. The datagrams are sent chunk_size at a time, each chunk as the
+        "data" list of its own request, so a failed chunk doesn't hold back the others. The objects of a failed chunk
+        are then sent again one object per operation, so each error is reported against the object that caused it.
+        With add, an object the failed chunk did write is reported as already existing. In workspace mode the ADOM
+        is locked once and committed once.
+
+        :param url: The table URL, i.e. /pm/config/adom/root/obj/firewall/address
+        :type url: string
+        :param datagrams: The prepared payloads of the objects.
+        :type datagrams: list
+        :param method: The API Request method, add, set or update.
+        :type method: basestring
+        :param key: The attribute that names an object, reported for the written and failed objects.
+        :type key: string
+        :param chunk_size: The maximum number of objects per operation.
+        :type chunk_size: int
+
+        :return: The written and failed keys, under "written" and "failed".
+        :rtype: tuple
+        """
+        url = url.rstrip("/")
+        chunk_size = max(int(chunk_size), 1)
+        chunks = [datagrams[index:index + chunk_size] for index in range(0, len(datagrams), chunk_size)]
+        if not chunks:
+            return 0, {"status": {"code": 0, "message": "No objects to write."}, "url": url,
+                       "written": [], "failed": [], FMGR_UNCHANGED_KEY: True}
+
+        adom = self._module.paramgram["adom"]
+        if self.uses_workspace and adom not in self._locked_adom_list:
+            self.lock_adom(adom=adom)
+        # ONE CHUNK PER ROUND TRIP KEEPS THE REQUEST BODIES BOUNDED BY CHUNK_SIZE
+        results = self._conn.send_batch([(method, url, {"data": chunk}) for chunk in chunks], 1)
+
+        written = list()
+        retries = list()
+        for chunk, result in zip(chunks, results):
+            if result[0] == 0:
+                written.extend(datagram.get(key) for datagram in chunk)
+            else:
+                retries.extend(chunk)
+        failed = list()
+        if retries:
+            # THE OBJECTS OF THE FAILED CHUNKS GO AGAIN AS ONE OPERATION EACH, STILL CHUNK_SIZE OPERATIONS PER REQUEST
+            results = self._conn.send_batch([(method, url, {"data": datagram}) for datagram in retries], chunk_size)
+            for datagram, result in zip(retries, results):
+                if result[0] == 0:
+                    written.append(datagram.get(key))
+                else:
+                    failed.append({key: datagram.get(key), "code": result[0],
+                                   "message": self._result_message(result)})
+        if self.uses_workspace and adom in self._locked_adom_list and written:
+            self.commit_write(adom)
+
+        code = 0 if not failed else failed[0]["code"]
+        msg = "Wrote " + str(len(written)) + " of " + str(len(datagrams)) + " objects."
+        return code, {"status": {"code": code, "message": msg}, "url": url, "written": written, "failed": failed}
+
+    @staticmethod
+    def _result_message(result):
+        """
+        Returns the status message of a (code, data) result, or the data itself when it has no status.
+        """
+        if isinstance(result[1], dict) and "status" in result[1]:
+            return result[1]["status"]["message"]
+        return result[1]
+
+    def process_request_if_changed(self, url, datagram, method, name_key="name"):
+        """
+        Runs an add/set/update/delete through process_request() only if it would change something. The object is
+        read first with a GET projected to the attributes in the datagram, and compared with FMGRDiff. Skipped writes
+        also skip the ADOM lock and commit. If the object can't be read, the write is always sent.
+
+        :param url: The table URL for add/set/update, or the object URL for delete, as given to process_request()
+        :type url: string
+        :param datagram: The prepared payload for the API Request in dictionary format
+        :type datagram: dict
+        :param method: The preferred API Request method (GET, ADD, POST, etc....)
+        :type method: basestring
+        :param name_key: The datagram attribute holding the name of the object.
+        :type name_key: string
+
+        :return: The response of the write, or a response marked unchanged. Either carries the diff under "diff".
+        :rtype: tuple
+        """
+        if method == FMGRMethods.DELETE:
+            object_url = url
+            fields = None
+        elif method in [FMGRMethods.ADD, FMGRMethods.SET, FMGRMethods.UPDATE] and datagram.get(name_key):
+            object_url = "{url}/{name}".format(url=url.rstrip("/"), name=datagram[name_key])
+            fields = FMGRDiff.projected_fields(datagram)
+        else:
+            return self.process_request(url, datagram, method)
+
+        try:
+            query = {"fields": fields} if fields else {}
+            current = self._conn.send_request(FMGRMethods.GET,
+                                              self._tools.format_request(FMGRMethods.GET, object_url, **query))
+        except Exception:
+            current = None
+        if not current or current[0] not in [0, -3] or (current[0] == 0 and not isinstance(current[1], dict)):
+            return self.process_request(url, datagram, method)
+
+        if method == FMGRMethods.DELETE:
+            if current[0] == -3:
+                # NOTHING TO DELETE. THIS IS THE SAME "OBJECT DOES NOT EXIST" ANSWER THE DELETE WOULD HAVE RETURNED
+                return current
+            return self.process_request(url, datagram, method)
+
+        if current[0] == -3:
+            diff = FMGRDiff.diff(datagram, dict())
+        else:
+            diff = FMGRDiff.diff(datagram, current[1])
+            if not diff:
+                return 0, {"status": {"code": 0, "message": "No changes needed. The object already matches."},
+                           "url": object_url, "diff": diff, FMGR_UNCHANGED_KEY: True}
+        response = self.process_request(url, datagram, method)
+        if isinstance(response[1], dict):
+            response[1]["diff"] = diff
+        return response
+
+    def wait_for_tasks(self, task_ids, adom=None, first_interval=0.5, max_interval=5, timeout=750):
+        """
+        Waits for one or more FortiManager tasks to reach 100%. Every tick checks all pending tasks with a single
+        filtered /task/task query, and the interval between ticks backs off exponentially from first_interval up
+        to max_interval, so short tasks return quickly without hammering the FortiManager on long ones.
+
+        :param task_ids: The IDs of the tasks to wait for.
+        :type task_ids: list
+        :param adom: The ADOM the tasks were started in.
+        :type adom: string
+        :param first_interval: Seconds to wait before the first check.
+        :type first_interval: float
+        :param max_interval: Ceiling of the interval between checks, in seconds.
+        :type max_interval: float
+        :param timeout: Seconds to wait in total before giving up.
+        :type timeout: float
+
+        :return: The last task record returned for each task ID.
+        :rtype: dict
+        """
+        if adom is None:
+            adom = self._module.paramgram["adom"]
+        pending = dict((int(task_id), task_id) for task_id in task_ids)
+        tasks = dict()
+        interval = max(float(first_interval), 0.1)
+        deadline = time.time() + timeout
+        while pending:
+            time.sleep(interval)
+            if len(pending) == 1:
+                task_filter = ["id", "==", list(pending)[0]]
+            else:
+                task_filter = ["id", "in"] + list(pending)
+            task_query_data = self._tools.format_request(FMGRMethods.GET, "/task/task",
+                                                         {"adom": adom, "filter": task_filter})
+            task_query_response = self._conn.send_request(FMGRMethods.GET, task_query_data)
+            try:
+                for task in task_query_response[1]:
+                    task_id = int(task["id"])
+                    if task_id in pending:
+                        tasks[pending[task_id]] = task
+                        if task["percent"] >= 100:
+                            del pending[task_id]
+            except BaseException as err:
+                raise FMGBaseException(msg="A task was executed, but its status couldn't be read back. "
+                                           "Something has gone wrong. Response: " + str(task_query_response) +
+                                           " Error: " + str(err))
+            if pending and time.time() + interval > deadline:
+                raise FMGBaseException(msg="The Task(s) " + str(list(pending.values())) + " exceeded the timeout/retry "
+                                           "count. Please adjust the retry_count and retry_interval variables in "
+                                           "the playbook/module.")
+            interval = min(interval * 2, max_interval)
+        return tasks
+
+    def in_transaction(self, adom=None):
+        """
+        Checks if a workspace transaction is open, optionally for a specific ADOM.
+
+        :param adom: The ADOM to check for. Any open transaction matches when omitted.
+        :type adom: string
+
+        :return: True if a matching transaction is open.
+        :rtype: bool
+        """
+        if self._transaction_adom is None:
+            return False
+        return adom is None or adom == self._transaction_adom
+
+    def begin_transaction(self, adom=None):
+        """
+        Opens a workspace transaction. The ADOM is locked once, and process_request() stops committing after every
+        write until commit_transaction() or abort_transaction() is called. Does nothing but track state when the
+        FortiManager isn't in workspace mode.
+
+        Transactions nest for the same ADOM, i.e. fmgr_bulk running a function that opens its own transaction. Only
+        the outermost commit_transaction() or abort_transaction() commits or unlocks.
+
+        :param adom: The ADOM to lock. Defaults to the ADOM in the paramgram.
+        :type adom: string
+        """
+        if adom is None:
+            adom = self._module.paramgram["adom"]
+        if self._transaction_adom is not None:
+            if adom != self._transaction_adom:
+                raise FMGBaseException(msg="A transaction is already open for ADOM " + str(self._transaction_adom))
+            self._transaction_depth += 1
+            return
+        if self.uses_workspace and adom not in self._locked_adom_list:
+            self.lock_adom(adom=adom)
+        self._transaction_adom = adom
+        self._transaction_writes = 0
+        self._transaction_depth = 1
+
+    def commit_transaction(self):
+        """
+        Commits every write made since begin_transaction() with a single commit, then unlocks the ADOM.
+        """
+        adom = self._transaction_adom
+        if adom is None:
+            return
+        if self._transaction_depth > 1:
+            self._transaction_depth -= 1
+            return
+        try:
+            if self.uses_workspace and self._transaction_writes:
+                self.commit_changes(adom=adom)
+        finally:
+            self._transaction_adom = None
+            self._transaction_writes = 0
+            self._transaction_depth = 0
+            if self.uses_workspace and adom in self._locked_adom_list and not self._deferred_commit:
+                self.unlock_adom(adom=adom)
+
+    def abort_transaction(self):
+        """
+        Unlocks the transaction ADOM without committing, leaving the uncommitted writes to be discarded. In deferred
+        commit mode the ADOM stays held, because it may carry changes from earlier tasks of the play. A nested abort
+        leaves the decision to the outermost transaction.
+        """
+        if self._transaction_depth > 1:
+            self._transaction_depth -= 1
+            return
+        adom = self._transaction_adom
+        self._transaction_adom = None
+        self._transaction_writes = 0
+        self._transaction_depth = 0
+        if adom is not None and self.uses_workspace and adom in self._locked_adom_list and not self._deferred_commit:
+            self.unlock_adom(adom=adom)
+
+    @contextmanager
+    def transaction(self, adom=None):
+        """
+        Context manager around begin_transaction()/commit_transaction(). Any exception, including a fail_json()
+        from inside the block, aborts the transaction and unlocks the ADOM instead.
+
+        :param adom: The ADOM to lock. Defaults to the ADOM in the paramgram.
+        :type adom: string
+        """
+        self.begin_transaction(adom=adom)
+        try:
+            yield self
+        except BaseException:
+            self.abort_transaction()
+            raise
+        self.commit_transaction()
+
+    def get_task_lines(self, task_ids):
+        """
+        Gets the per-device line logs of finished tasks, with as few requests as the connection plugin can batch
+        them into.
+
+        :param task_ids: The IDs of the tasks.
+        :type task_ids: list
+
+        :return: The lines of each task ID. Tasks whose lines couldn't be read get an empty list.
+        :rtype: dict
+        """
+        requests = [(FMGRMethods.GET, "/task/task/{task_id}/line".format(task_id=task_id), {})
+                    for task_id in task_ids]
+        lines = dict()
+        for task_id, result in zip(task_ids, self._conn.send_batch(requests)):
+            lines[task_id] = result[1] if result[0] == 0 and isinstance(result[1], list) else []
+        return lines
+
+    def iter_pages(self, url, datagram=None, page_size=FMGR_PAGE_SIZE, fields=None, loadsub=False):
+        """
+        Walks a table page by page with the JSON-RPC "range" parameter, so large tables never have to fit into a
+        single response. While the caller works through a page, the next one is already being fetched. The walk
+        stops after the first page shorter than page_size.
+
+        :param url: The table URL, i.e. /pm/config/adom/root/obj/firewall/address
+        :type url: string
+        :param datagram: Extra GET parameters, such as a filter.
+        :type datagram: dict
+        :param page_size: The number of objects to request per page.
+        :type page_size: int
+        :param fields: The attributes to return for each object. All attributes are returned if empty.
+        :type fields: list
+        :param loadsub: Whether to include the sub-tables of each object.
+        :type loadsub: bool
+
+        :return: A generator of pages. Each page is a list of objects.
+        :rtype: generator
+        """
+        query = dict(datagram or {})
+        if fields:
+            query["fields"] = list(fields)
+        if not loadsub:
+            query.setdefault("loadsub", 0)
+        page_size = max(int(page_size), 1)
+
+        def fetch(offset):
+            page_query = dict(query)
+            page_query["range"] = [offset, page_size]
+            return self._conn.send_request(FMGRMethods.GET,
+                                           self._tools.format_request(FMGRMethods.GET, url, **page_query))
+
+        offset = 0
+        pending = FMGRPrefetch(fetch, offset)
+        while pending is not None:
+            response = pending.result()
+            pending = None
+            if response[0] == -3 and offset == 0:
+                # THE TABLE DOESN'T EXIST, SO THERE IS NOTHING TO WALK
+                return
+            if response[0] != 0:
+                raise FMGBaseException(msg="Paged GET of " + str(url) + " failed at offset " + str(offset) +
+                                           " with code " + str(response[0]) + ": " + str(response[1]))
+            page = response[1] or []
+            if isinstance(page, dict):
+                page = [page]
+            offset += page_size
+            if len(page) >= page_size:
+                pending = FMGRPrefetch(fetch, offset)
+            if page:
+                yield page
+
+    def iter_objects(self, url, datagram=None, page_size=FMGR_PAGE_SIZE, fields=None, loadsub=False):
+        """
+        Same as iter_pages(), but yields the objects one at a time.
+
+        :return: A generator of objects.
+        :rtype: generator
+        """
+        for page in self.iter_pages(url, datagram=datagram, page_size=page_size, fields=fields, loadsub=loadsub):
+            for obj in page:
+                yield obj
+
+    def load_session_state(self):
+        """
+        Loads the workspace/ADOM mode that the connection plugin cached at login.
+
+        :return: True if the state was loaded, False if the plugin couldn't provide it.
+        :rtype: bool
+        """
+        try:
+            state = self._conn.return_session_state()
+            self.uses_workspace = state["uses_workspace"]
+            self.uses_adoms = state["uses_adoms"]
+            self._adom_list = state["adom_list"]
+            self._debug = state.get("debug", False)
+            self._deferred_commit = state.get("deferred_commit", False)
+            self._held_adoms = dict(state.get("held_adoms", {}))
+            self._get_cache = state.get("get_cache", False)
+            self._facts_mode = state.get("facts_mode", "full")
+            self._connected_fmgr = state.get("connected_fmgr")
+        except Exception:
+            return False
+        # ADOMS HELD BY EARLIER TASKS OF THE PLAY ARE ALREADY LOCKED BY THIS SESSION
+        for adom in self._held_adoms:
+            self.add_adom_to_lock_list(adom)
+        return True
+
+    def is_adom_held(self, adom):
+        """
+        Checks if an ADOM is held locked by the persistent connection for a deferred commit.
+        """
+        return adom in self._held_adoms
+
+    def is_adom_dirty(self, adom):
+        """
+        Checks if an ADOM held for a deferred commit has uncommitted changes.
+        """
+        return self._held_adoms.get(adom, False)
+
+    def mark_adom_dirty(self, adom):
+        """
+        Records an ADOM as having uncommitted changes, both locally and in the persistent connection.
+        """
+        self._held_adoms[adom] = True
+        self._conn.mark_adom_dirty(adom)
+
+    def mark_adom_clean(self, adom):
+        """
+        Records an ADOM as held with no uncommitted changes, both locally and in the persistent connection.
+        """
+        self._held_adoms[adom] = False
+        self._conn.mark_adom_clean(adom)
+
     def workspace_check(self):
         """
        Checks FortiManager for the use of Workspace mode
@@ -180,11 +721,24 @@ class FortiManagerHandler(object):
         except KeyError:
             raise FMGBaseException(msg="Couldn't determine adom-status in the plugin")
 
-    def run_unlock(self):
+    def run_unlock(self, commit=True):
         """
-        Checks for ADOM status, if locked, it will unlock
+        Checks for ADOM status, if locked, it will unlock. A transaction still open is closed first, however deeply
+        nested, so its writes are committed or discarded rather than left behind in the workspace.
+
+        :param commit: Commits the open transaction if True, aborts it if False.
+        :type commit: boolean
         """
-        for adom_locked in self._locked_adom_list:
+        if self.in_transaction():
+            self._transaction_depth = 1
+            if commit:
+                self.commit_transaction()
+            else:
+                self.abort_transaction()
+        if self._deferred_commit:
+            # THE LOCKS ARE HELD FOR THE REST OF THE PLAY, AND RELEASED BY FMGR_WORKSPACE OR THE CONNECTION PLUGIN
+            return
+        for adom_locked in list(self._locked_adom_list):
             self.unlock_adom(adom_locked)
 
     def lock_adom(self, adom=None):
@@ -204,6 +758,8 @@ class FortiManagerHandler(object):
         code = resp_obj[0]
         if code == 0 and resp_obj[1]["status"]["message"].lower() == "ok":
             self.add_adom_to_lock_list(adom)
+            if self._deferred_commit:
+                self.mark_adom_clean(adom)
         else:
             lockinfo = self.get_lock_info(adom=adom)
             self._module.fail_json(msg=("An error occurred trying to lock the adom. Error: "
@@ -227,6 +783,9 @@ class FortiManagerHandler(object):
         code = resp_obj[0]
         if code == 0 and resp_obj[1]["status"]["message"].lower() == "ok":
             self.remove_adom_from_lock_list(adom)
+            if adom in self._held_adoms:
+                del self._held_adoms[adom]
+                self._conn.release_adom(adom)
         else:
             self._module.fail_json(msg=("An error occurred trying to unlock the adom. Error: " + str(resp_obj)))
         return resp_obj
@@ -274,6 +833,9 @@ class FortiManagerHandler(object):
         if code != 0:
             self._module.fail_json(msg=("An error occurred trying to commit changes to the adom. Error: "
                                         + str(resp_obj)))
+        if adom in self._held_adoms:
+            self.mark_adom_clean(adom)
+        return resp_obj
 
     def govern_response(self, module, results, msg=None, good_codes=None,
                         stop_on_fail=None, stop_on_success=None, skipped=None,
@@ -331,6 +893,9 @@ class FortiManagerHandler(object):
 
         if not rc_data:
             rc_data = {}
+        # A WRITE SKIPPED BY process_request_if_changed() IS A SUCCESS THAT DIDN'T CHANGE ANYTHING
+        if rc == 0 and isinstance(results[1], dict) and results[1].get(FMGR_UNCHANGED_KEY):
+            rc_data = {"msg": results[1]["status"]["message"], "changed": False, "stop_on_success": True}
         # ONLY add to overrides if not none -- This is very important that the keys aren't added at this stage
         # if they are empty. And there aren't that many, so let's just do a few if then statements.
         if good_codes is not None:
@@ -446,9 +1011,11 @@ class FortiManagerHandler(object):
                 if failed and unreachable:
                     failed = False
                 if stop_on_fail:
+                    if isinstance(ansible_facts, FMGRLazyFacts):
+                        ansible_facts = dict(ansible_facts.build())
                     if self._uses_workspace:
                         try:
-                            self.run_unlock()
+                            self.run_unlock(commit=False)
                         except BaseException as err:
                             raise FMGBaseException(msg=("Couldn't unlock ADOM! Error: " + str(err)))
                     module.exit_json(msg=msg, failed=failed, changed=changed, unreachable=unreachable, skipped=skipped,
@@ -459,6 +1026,8 @@ class FortiManagerHandler(object):
                     changed = True
                     success = False
                 if stop_on_success:
+                    if isinstance(ansible_facts, FMGRLazyFacts):
+                        ansible_facts = dict(ansible_facts.build())
                     if self._uses_workspace:
                         try:
                             self.run_unlock()
@@ -473,6 +1042,9 @@ class FortiManagerHandler(object):
         """
         Constructs a dictionary to return to ansible facts, containing various information about the execution.
 
+        The facts are built lazily, when the module exits with them. With the facts_mode option of the connection
+        plugin set to minimal, only the response and the unscrubbed parameters are returned.
+
         :param response: Contains the response from the FortiManager.
         :type response: dict
         :param ansible_params: Contains the parameters Ansible was called with.
@@ -485,13 +1057,36 @@ class FortiManagerHandler(object):
         :return: A dictionary containing lots of information to append to Ansible Facts.
         :rtype: dict
         """
+        return FMGRLazyFacts(lambda: self._build_ansible_facts(response, ansible_params, paramgram, *args, **kwargs))
 
-        facts = {
-            "response": response,
-            "ansible_params": scrub_dict(ansible_params),
-            "paramgram": scrub_dict(paramgram),
-            "connected_fmgr": self._conn.return_connected_fmgr()
-        }
+    def _build_ansible_facts(self, response, ansible_params, paramgram, *args, **kwargs):
+        """
+        Builds the facts returned by construct_ansible_facts()
+        """
+        if self._facts_mode == "minimal":
+            facts = {
+                "response": response,
+                "ansible_params": ansible_params,
+            }
+        else:
+            facts = {
+                "response": response,
+                "ansible_params": scrub_dict(ansible_params),
+                "paramgram": scrub_dict(paramgram),
+                "connected_fmgr": self.return_connected_fmgr(),
+            }
+
+        if self._debug:
+            try:
+                facts["request_stats"] = self._conn.return_request_stats()
+            except Exception:
+                pass
+
+        if self._get_cache:
+            try:
+                facts["get_cache"] = self._conn.return_get_cache_stats()
+            except Exception:
+                pass
 
         if args:
             facts["custom_args"] = args
@@ -500,6 +1095,17 @@ class FortiManagerHandler(object):
 
         return facts
 
+    def return_connected_fmgr(self):
+        """
+        Returns the system status of the connected FortiManager. It comes with the session state of the connection
+        plugin, and is only asked for separately if the plugin couldn't provide it.
+
+        :return: dict
+        """
+        if self._connected_fmgr is None:
+            self._connected_fmgr = self._conn.return_connected_fmgr()
+        return self._connected_fmgr
+
     @property
     def uses_workspace(self):
         return self._uses_workspace
@@ -516,6 +1122,10 @@ class FortiManagerHandler(object):
     def uses_adoms(self, val):
         self._uses_adoms = val
 
+    @property
+    def deferred_commit(self):
+        return self._deferred_commit
+
     def add_adom_to_lock_list(self, adom):
         if adom not in self._locked_adom_list:
             self._locked_adom_list.append(adom)
@@ -0,0 +1,249 @@
+# This code is part of Ansible, but is an independent component.
+# This particular file snippet, and this file snippet only, is BSD licensed.
+# Modules you write using this snippet, which is embedded dynamically by Ansible
+# still belong to the author of the module, and may assign their own license
+# to the complete work.
+#
+# (c) 2017 Fortinet, Inc
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#    * Redistributions in binary form must reproduce the above copyright notice,
+#      this list of conditions and the following disclaimer in the documentation
+#      and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+# USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import socket
+from collections import OrderedDict
+
+from ansible.module_utils.six import string_types
+from ansible.module_utils.network.fortimanager.common import FMGBaseException
+from ansible.module_utils.network.fortimanager.common import FMGR_NETMASKS
+
+# NUMBER OF PARSED ADDRESSES KEPT BY FMGRAddress
+FMGR_ADDRESS_CACHE_SIZE = 8192
+
+
+class FMGRLRUCache(object):
+    """
+    A least recently used cache with a fixed number of entries.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        try:
+            value = self._entries.pop(key)
+        except KeyError:
+            self.misses += 1
+            return default
+        self._entries[key] = value
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self._entries.pop(key, None)
+        self._entries[key] = value
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class FMGRAddress(object):
+    """
+    Parses the address notations accepted by the address-type modules into the form the FortiManager API expects:
+
+    - IPv4 subnets "10.0.0.0/24", "10.0.0.0/255.255.255.0", "10.0.0.0 255.255.255.0" or "10.0.0.1" become
+      ["10.0.0.0", "255.255.255.0"], with /32 assumed when the mask is omitted. Wildcards use the same notation.
+    - IPv4 ranges "10.0.0.1-10.0.0.9" or "10.0.0.1 - 10.0.0.9" become "10.0.0.1-10.0.0.9".
+    - IPv6 addresses and prefixes become the compressed "2001:db8::1/128" form, with /128 assumed.
+
+    Results are kept in an LRU cache, as bulk imports of address lists parse the same notations over and over.
+    Invalid input raises FMGBaseException.
+    """
+    _cache = FMGRLRUCache(FMGR_ADDRESS_CACHE_SIZE)
+
+    @classmethod
+    def _cached(cls, kind, value, parser):
+        if not isinstance(value, string_types):
+            cls._text(value)
+        key = (kind, value)
+        result = cls._cache.get(key)
+        if result is None:
+            result = parser(value)
+            cls._cache.put(key, result)
+        return result
+
+    @staticmethod
+    def _text(value):
+        if not isinstance(value, string_types):
+            raise FMGBaseException(msg="Expected an address string, got " + repr(value))
+        return value.strip()
+
+    @staticmethod
+    def _parse_ipv4(value):
+        octets = value.split(".")
+        if len(octets) != 4 or not all(octet.isdigit() and int(octet) <= 255 for octet in octets):
+            raise FMGBaseException(msg="Invalid IPv4 address: " + value)
+        return ".".join(str(int(octet)) for octet in octets)
+
+    @classmethod
+    def _parse_netmask(cls, value):
+        if value.isdigit():
+            if int(value) > 32:
+                raise FMGBaseException(msg="Invalid IPv4 prefix length: " + value)
+            return FMGR_NETMASKS[int(value)]
+        return cls._parse_ipv4(value)
+
+    @classmethod
+    def _parse_subnet(cls, value):
+        value = cls._text(value)
+        if "/" in value:
+            address, mask = value.split("/", 1)
+        elif " " in value:
+            address, mask = value.split(None, 1)
+        else:
+            address, mask = value, "32"
+        return [cls._parse_ipv4(address.strip()), cls._parse_netmask(mask.strip())]
+
+    @classmethod
+    def _parse_range(cls, value):
+        value = cls._text(value)
+        if "-" not in value:
+            return cls._parse_ipv4(value)
+        start, end = value.split("-", 1)
+        return cls._parse_ipv4(start.strip()) + "-" + cls._parse_ipv4(end.strip())
+
+    @classmethod
+    def _parse_ipv6(cls, value):
+        value = cls._text(value)
+        address, _, prefix = value.partition("/")
+        prefix = prefix.strip() or "128"
+        if not prefix.isdigit() or int(prefix) > 128:
+            raise FMGBaseException(msg="Invalid IPv6 prefix length: " + value)
+        try:
+            address = socket.inet_ntop(socket.AF_INET6, socket.inet_pton(socket.AF_INET6, address.strip()))
+        except (socket.error, ValueError):
+            raise FMGBaseException(msg="Invalid IPv6 address: " + value)
+        return address + "/" + str(int(prefix))
+
+    @classmethod
+    def ipv4_address(cls, value):
+        """
+        :param value: An IPv4 address, i.e. "10.0.0.1"
+        :type value: str
+
+        :return: The address in dotted decimal form.
+        :rtype: str
+        """
+        return cls._cached("ipv4", value, lambda text: cls._parse_ipv4(cls._text(text)))
+
+    @classmethod
+    def netmask(cls, value):
+        """
+        :param value: A prefix length, as an int or a string, or a dotted netmask.
+        :type value: int or str
+
+        :return: The dotted netmask, i.e. "255.255.255.0"
+        :rtype: str
+        """
+        if isinstance(value, int) and not isinstance(value, bool):
+            value = str(value)
+        return cls._cached("netmask", value, lambda text: cls._parse_netmask(cls._text(text)))
+
+    @classmethod
+    def ipv4_subnet(cls, value):
+        """
+        :param value: An IPv4 address with an optional prefix length or netmask, i.e. "10.0.0.0/24"
+        :type value: str
+
+        :return: The address and the netmask, i.e. ["10.0.0.0", "255.255.255.0"]
+        :rtype: list
+        """
+        return list(cls._cached("subnet", value, cls._parse_subnet))
+
+    @classmethod
+    def ipv4_wildcard(cls, value):
+        """
+        :param value: An IPv4 address with a wildcard netmask or prefix length, i.e. "10.0.0.0/255.255.0.255"
+        :type value: str
+
+        :return: The address and the wildcard netmask.
+        :rtype: list
+        """
+        return list(cls._cached("subnet", value, cls._parse_subnet))
+
+    @classmethod
+    def ipv4_range(cls, value):
+        """
+        :param value: An IPv4 address or address range, i.e. "10.0.0.1-10.0.0.9"
+        :type value: str
+
+        :return: The range as "start-end", or the single address.
+        :rtype: str
+        """
+        return cls._cached("range", value, cls._parse_range)
+
+    @classmethod
+    def ipv6_prefix(cls, value):
+        """
+        :param value: An IPv6 address with an optional prefix length, i.e. "2001:0db8:0000::1"
+        :type value: str
+
+        :return: The compressed address and prefix length, i.e. "2001:db8::1/128"
+        :rtype: str
+        """
+        return cls._cached("ipv6", value, cls._parse_ipv6)
+
+    @classmethod
+    def normalize_ranges(cls, obj, keys):
+        """
+        Normalizes the IPv4 address and range attributes of a datagram, including the ones of its nested
+        dictionaries such as dynamic_mapping. Values that aren't IPv4 addresses or ranges are left as they are, for
+        the FortiManager to judge.
+
+        :param obj: The datagram.
+        :type obj: dict or list
+        :param keys: The attributes holding IPv4 addresses or ranges, i.e. ["extip", "mappedip"]
+        :type keys: list
+
+        :return: The datagram, modified in place.
+        :rtype: dict or list
+        """
+        if isinstance(obj, list):
+            for value in obj:
+                cls.normalize_ranges(value, keys)
+        elif isinstance(obj, dict):
+            for key, value in obj.items():
+                if key in keys and isinstance(value, string_types):
+                    try:
+                        obj[key] = ",".join(cls.ipv4_range(item) for item in value.split(","))
+                    except FMGBaseException:
+                        pass
+                elif isinstance(value, (dict, list)):
+                    cls.normalize_ranges(value, keys)
+        return obj
@@ -0,0 +1,170 @@
+# This code is part of Ansible, but is an independent component.
+# This particular file snippet, and this file snippet only, is BSD licensed.
+# Modules you write using this snippet, which is embedded dynamically by Ansible
+# still belong to the author of the module, and may assign their own license
+# to the complete work.
+#
+# (c) 2017 Fortinet, Inc
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#    * Redistributions in binary form must reproduce the above copyright notice,
+#      this list of conditions and the following disclaimer in the documentation
+#      and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+# USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from ansible.module_utils.six import string_types
+
+# RESPONSE KEY THAT MARKS A WRITE THE DIFF ENGINE SKIPPED BECAUSE THE OBJECT ALREADY MATCHED
+FMGR_UNCHANGED_KEY = "unchanged"
+
+
+class FMGRDiff(object):
+    """
+    Compares the object a module wants to write with the object stored on the FortiManager.
+
+    Both sides are normalized before comparing: scalars become lists of text tokens, numbers and numeric strings
+    compare equal, lists of tokens compare in any order, and missing or empty values compare equal. Comma separated
+    strings are only split for attributes that are lists, i.e. "member": "a, b" against ["a", "b"], so a comment
+    of "a, b" still differs from "a,b". Only the attributes the module sends are compared, so attributes the
+    FortiManager adds don't count as a difference. Hyphenated and underscored attribute names are matched with each
+    other.
+    """
+
+    @staticmethod
+    def _text(value):
+        if isinstance(value, bool):
+            return str(value).lower()
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        if isinstance(value, string_types):
+            return value.strip()
+        return str(value)
+
+    @classmethod
+    def normalize(cls, value, split=False):
+        """
+        Normalizes an attribute value for comparison.
+
+        :param value: The value as sent by a module or returned by the FortiManager.
+        :param split: Splits comma separated strings into tokens. Only wanted for attributes that are lists.
+        :type split: bool
+
+        :return: A dict for objects, a list of normalized entries for tables, and a list of text tokens otherwise.
+        """
+        if value is None:
+            return []
+        if isinstance(value, dict):
+            return dict((key, cls.normalize(item, split)) for key, item in value.items() if item is not None)
+        if isinstance(value, (list, tuple)):
+            if any(isinstance(item, dict) for item in value):
+                return [cls.normalize(item, split) for item in value]
+            tokens = list()
+            for item in value:
+                tokens.extend(cls.normalize(item, split))
+            return tokens
+        text = cls._text(value)
+        if split and "," in text:
+            return [token.strip() for token in text.split(",") if token.strip()]
+        if not text:
+            return []
+        return [text]
+
+    @staticmethod
+    def _lookup(current, key):
+        if key in current:
+            return current[key]
+        if key.replace("_", "-") in current:
+            return current[key.replace("_", "-")]
+        return current.get(key.replace("-", "_"))
+
+    @classmethod
+    def _equal(cls, desired, current):
+        """
+        Compares a desired and a current value as they were sent and returned, normalizing them on the way down.
+        """
+        if isinstance(desired, dict):
+            if not isinstance(current, dict):
+                return not cls.normalize(desired) and not cls.normalize(current)
+            for key, item in desired.items():
+                if item is not None and not cls._equal(item, cls._lookup(current, key)):
+                    return False
+            return True
+        if isinstance(desired, (list, tuple)) and any(isinstance(item, dict) for item in desired):
+            current = [] if current is None else current
+            if not isinstance(current, (list, tuple)):
+                current = [current]
+            if len(desired) != len(current):
+                return False
+            return all(cls._equal(want, have) for want, have in zip(desired, current))
+        if isinstance(current, dict):
+            return not cls.normalize(desired) and not cls.normalize(current)
+        # THE FORTIMANAGER RETURNS LIST ATTRIBUTES AS LISTS, AND MODULES SEND THEM AS LISTS OR COMMA SEPARATED STRINGS
+        split = isinstance(desired, (list, tuple)) or isinstance(current, (list, tuple))
+        desired = cls.normalize(desired, split)
+        current = cls.normalize(current, split)
+        if len(desired) != len(current):
+            return False
+        try:
+            return sorted(desired) == sorted(current)
+        except TypeError:
+            return desired == current
+
+    @classmethod
+    def diff(cls, desired, current):
+        """
+        Returns the attributes of desired that differ from current.
+
+        :param desired: The datagram the module would write.
+        :type desired: dict
+        :param current: The object returned by the FortiManager.
+        :type current: dict
+
+        :return: A dictionary of attribute name to {"before": ..., "after": ...}. Empty when nothing differs.
+        :rtype: dict
+        """
+        differences = dict()
+        for key, value in desired.items():
+            if value is None:
+                continue
+            before = cls._lookup(current, key)
+            if not cls._equal(value, before):
+                differences[key] = {"before": before, "after": value}
+        return differences
+
+    @staticmethod
+    def projected_fields(desired):
+        """
+        Returns the attribute names worth asking the FortiManager for, so the GET of the current object stays small.
+        Tables are left out, because the FortiManager returns them on its own. Nested objects can't be projected,
+        so None is returned when the datagram has any, and the whole object should be read instead.
+
+        :param desired: The datagram the module would write.
+        :type desired: dict
+
+        :return: A list of attribute names, or None.
+        :rtype: list
+        """
+        fields = list()
+        for key, value in desired.items():
+            if value is None or value == [] or value == {}:
+                continue
+            if isinstance(value, dict):
+                return None
+            if isinstance(value, (list, tuple)) and any(isinstance(item, dict) for item in value):
+                continue
+            fields.append(key)
+        return fields
@@ -0,0 +1,316 @@
+#!/usr/bin/python
+#
+# This file is part of Ansible
+#
+# Ansible is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Ansible is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Ansible.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+ANSIBLE_METADATA = {
+    "metadata_version": "1.1",
+    "status": ["preview"],
+    "supported_by": "community"
+}
+
+DOCUMENTATION = '''
+---
+module: fmgr_bulk
+version_added: "2.9"
+notes:
+    - Full Documentation at U(https://ftnt-ansible-docs.readthedocs.io/en/latest/).
+    - Supported target modules are fmgr_fwobj_address, fmgr_fwobj_ippool, fmgr_fwobj_ippool6, fmgr_fwobj_service,
+      fmgr_fwobj_vip and fmgr_fwpol_ipv4. They must be installed in the ansible.modules package next to this module.
+author: Luke Weighall (@lweighall)
+short_description: Runs a FortiManager module function over many items in a single task.
+description:
+  - Runs a function of another fmgr_ module, such as fmgr_fwobj_address.fmgr_fwobj_ipv4 or
+    fmgr_fwpol_ipv4.fmgr_firewall_policy_modify, once per item, all inside one module process.
+  - Unlike a loop over the target module, the items share one connection handler and one workspace lock, and their
+    changes are committed together at the end.
+  - Only a FortiManager in workspace mode can hold back changes until the end. Without workspace mode every item's
+    changes are live as soon as the item has run.
+  - Target functions that open their own transaction, such as fmgr_fwobj_address.fmgr_fwobj_group_members, join the
+    transaction of the run.
+  - Returns the result of every item under "results".
+
+options:
+  adom:
+    description:
+      - The ADOM of all the items.
+    required: false
+    default: root
+
+  target_module:
+    description:
+      - The name of the module the function belongs to, i.e. fmgr_fwobj_address.
+    required: true
+    choices: ["fmgr_fwobj_address", "fmgr_fwobj_ippool", "fmgr_fwobj_ippool6", "fmgr_fwobj_service", "fmgr_fwobj_vip",
+              "fmgr_fwpol_ipv4"]
+
+  target_function:
+    description:
+      - The name of the function to run for each item, i.e. fmgr_fwobj_ipv4. Only the functions the main() of the
+        target module calls with the handler and a paramgram are supported.
+    required: true
+
+  mode:
+    description:
+      - The mode of the items that don't set their own.
+    required: false
+    default: add
+    choices: ["add", "set", "update", "delete"]
+
+  items:
+    description:
+      - The paramgrams to run the function with, one per item.
+      - The keys are the paramgram keys of the target module, which are the API attribute names the module builds
+        from its options (i.e. start-ip, not start_ip). Keys left out are passed as unset (None), and the ADOM is
+        always the one of this task.
+    required: true
+    type: list
+
+  good_codes:
+    description:
+      - The FortiManager return codes that count as a success for an item.
+    required: false
+    default: [0]
+    type: list
+
+  continue_on_error:
+    description:
+      - By default the first failed item stops the run. In workspace mode the changes of the items before it are
+        discarded. Without workspace mode they are already live on the FortiManager, and are kept.
+      - When enabled, every item is run and the successful ones are committed, but the task still fails if any item
+        did.
+    required: false
+    default: false
+    type: bool
+'''
+
+EXAMPLES = '''
+- name: ADD 3 IPv4 ADDRESS OBJECTS WITH ONE LOCK AND ONE COMMIT
+  fmgr_bulk:
+    adom: "ansible"
+    target_module: "fmgr_fwobj_address"
+    target_function: "fmgr_fwobj_ipv4"
+    mode: "set"
+    items:
+      - {"ipv4": "ipmask", "name": "bulk_host1", "ipv4addr": "10.7.220.1/32", "color": 22, "visibility": "enable"}
+      - {"ipv4": "ipmask", "name": "bulk_host2", "ipv4addr": "10.7.220.2/32", "color": 22, "visibility": "enable"}
+      - {"ipv4": "ipmask", "name": "bulk_net1", "ipv4addr": "10.7.221.0/24", "color": 22, "visibility": "enable"}
+
+- name: ADD POLICIES FROM A VARIABLE, COMMITTING THE ONES THAT SUCCEED
+  fmgr_bulk:
+    adom: "ansible"
+    target_module: "fmgr_fwpol_ipv4"
+    target_function: "fmgr_firewall_policy_modify"
+    mode: "add"
+    items: "{{ policies }}"
+    continue_on_error: true
+'''
+
+RETURN = """
+api_result:
+  description: full API response, includes status code and message
+  returned: always
+  type: str
+results:
+  description: One entry per item that was run, with its index, name, return code, changed flag and message.
+  returned: always
+  type: list
+"""
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.connection import Connection
+from ansible.module_utils.network.fortimanager.fortimanager import FortiManagerHandler
+from ansible.module_utils.network.fortimanager.fortimanager_diff import FMGR_UNCHANGED_KEY
+from ansible.module_utils.network.fortimanager.common import FMGBaseException
+from ansible.module_utils.network.fortimanager.common import FMGRCommon
+from ansible.module_utils.network.fortimanager.common import DEFAULT_RESULT_OBJ
+from ansible.module_utils.network.fortimanager.common import FAIL_SOCKET_MSG
+# ANSIBALLZ ONLY PACKS THE MODULE_UTILS THIS FILE IMPORTS, SO EVERY MODULE_UTIL A TARGET MODULE NEEDS IS IMPORTED HERE
+from ansible.module_utils.network.fortimanager.fortimanager_address import FMGRAddress  # noqa: F401
+
+# THE TARGET MODULES ARE IMPORTED HERE, NOT LOADED BY NAME AT RUNTIME, SO A MISSING ONE IS REPORTED BY FAIL_JSON
+try:
+    from ansible.modules.network.fortimanager import fmgr_fwobj_address
+    from ansible.modules.network.fortimanager import fmgr_fwobj_ippool
+    from ansible.modules.network.fortimanager import fmgr_fwobj_ippool6
+    from ansible.modules.network.fortimanager import fmgr_fwobj_service
+    from ansible.modules.network.fortimanager import fmgr_fwobj_vip
+    from ansible.modules.network.fortimanager import fmgr_fwpol_ipv4
+    TARGETS_IMPORT_ERROR = None
+except ImportError as err:
+    TARGETS_IMPORT_ERROR = str(err)
+
+# THE FUNCTIONS FMGR_BULK CAN RUN, BY TARGET MODULE. THEY ALL TAKE THE HANDLER AND THE PARAMGRAM OF ONE ITEM
+FMGR_BULK_TARGETS = {
+    "fmgr_fwobj_address": ("fmgr_fwobj_ipv4", "fmgr_fwobj_ipv6", "fmgr_fwobj_multicast", "fmgr_fwobj_group_members",
+                           "fmgr_fwobj_delete_by_filter", "fmgr_fwobj_bulk"),
+    "fmgr_fwobj_ippool": ("fmgr_fwobj_ippool_modify",),
+    "fmgr_fwobj_ippool6": ("fmgr_fwobj_ippool6_modify",),
+    "fmgr_fwobj_service": ("fmgr_fwobj_service_custom", "fmgr_fwobj_service_group", "fmgr_fwobj_service_category"),
+    "fmgr_fwobj_vip": ("fmgr_firewall_vip_modify",),
+    "fmgr_fwpol_ipv4": ("fmgr_firewall_policy_modify", "fmgr_firewall_policy_delete_by_filter"),
+}
+
+
+class FMGRBulkItem(dict):
+    """
+    The paramgram of one item. Keys the item leaves out read as None, like the unset options of a module.
+    """
+
+    def __missing__(self, key):
+        return None
+
+
+def load_target_function(module_name, function_name):
+    """
+    Returns a function of one of the supported target modules.
+
+    :param module_name: The module name, i.e. fmgr_fwobj_address
+    :type module_name: str
+    :param function_name: The function name, i.e. fmgr_fwobj_ipv4
+    :type function_name: str
+    :return: The function.
+    :rtype: function
+    """
+    if TARGETS_IMPORT_ERROR is not None:
+        raise FMGBaseException(msg="Couldn't import the target modules: " + TARGETS_IMPORT_ERROR)
+    if module_name not in FMGR_BULK_TARGETS:
+        raise FMGBaseException(msg=module_name + " isn't supported. Supported target modules: " +
+                               ", ".join(sorted(FMGR_BULK_TARGETS)))
+    if function_name not in FMGR_BULK_TARGETS[module_name]:
+        raise FMGBaseException(msg=module_name + " has no function " + function_name + " to run for each item. "
+                               "Supported functions: " + ", ".join(FMGR_BULK_TARGETS[module_name]))
+    return getattr(globals()[module_name], function_name)
+
+
+def fmgr_bulk_run(fmgr, paramgram, function):
+    """
+    :param fmgr: The fmgr object instance from fortimanager.py
+    :type fmgr: class object
+    :param paramgram: The formatted dictionary of options to process
+    :type paramgram: dict
+    :param function: The target function, called with fmgr and the paramgram of each item.
+    :type function: function
+    :return: The response from the FortiManager
+    :rtype: dict
+    """
+    item_results = list()
+    failed = 0
+    changed = 0
+    for index, item in enumerate(paramgram["items"]):
+        item_paramgram = FMGRBulkItem(item)
+        item_paramgram.setdefault("mode", paramgram["mode"])
+        item_paramgram["adom"] = paramgram["adom"]
+
+        try:
+            response = function(fmgr, item_paramgram)
+        except Exception as err:
+            response = (1, {"status": {"code": 1, "message": str(err)}})
+        if not isinstance(response, (list, tuple)) or len(response) != 2:
+            response = (0, response)
+
+        code = response[0]
+        data = response[1] if isinstance(response[1], dict) else {}
+        result = {
+            "index": index,
+            "name": item_paramgram["name"] or item_paramgram["group_name"] or item_paramgram["policyid"],
+            "rc": code,
+            "changed": code == 0 and not data.get(FMGR_UNCHANGED_KEY, False),
+            "message": data.get("status", {}).get("message") if isinstance(data.get("status"), dict) else None,
+        }
+        if "diff" in data:
+            result["diff"] = data["diff"]
+        item_results.append(result)
+
+        if code not in paramgram["good_codes"]:
+            failed += 1
+            if not paramgram["continue_on_error"]:
+                break
+        elif result["changed"]:
+            changed += 1
+
+    msg = str(len(item_results)) + " of " + str(len(paramgram["items"])) + " items run, " + str(changed) + \
+        " changed, " + str(failed) + " failed."
+    code = 1 if failed else 0
+    return code, {"status": {"code": code, "message": msg}, "results": item_results, "changed_items": changed}
+
+
+def main():
+    argument_spec = dict(
+        adom=dict(required=False, type="str", default="root"),
+        target_module=dict(required=True, type="str", choices=sorted(FMGR_BULK_TARGETS)),
+        target_function=dict(required=True, type="str"),
+        mode=dict(required=False, type="str", default="add", choices=["add", "set", "update", "delete"]),
+        items=dict(required=True, type="list"),
+        good_codes=dict(required=False, type="list", default=[0]),
+        continue_on_error=dict(required=False, type="bool", default=False),
+    )
+
+    module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=False, )
+    paramgram = {
+        "adom": module.params["adom"],
+        "target_module": module.params["target_module"],
+        "target_function": module.params["target_function"],
+        "mode": module.params["mode"],
+        "items": module.params["items"],
+        "good_codes": [int(code) for code in module.params["good_codes"]],
+        "continue_on_error": module.params["continue_on_error"],
+    }
+    module.paramgram = paramgram
+    fmgr = None
+    if module._socket_path:
+        connection = Connection(module._socket_path)
+        fmgr = FortiManagerHandler(connection, module)
+        fmgr.tools = FMGRCommon()
+    else:
+        module.fail_json(**FAIL_SOCKET_MSG)
+
+    if not all(isinstance(item, dict) for item in paramgram["items"]):
+        module.fail_json(msg="Every entry of items must be a dictionary.")
+    try:
+        function = load_target_function(paramgram["target_module"], paramgram["target_function"])
+    except (FMGBaseException, ImportError) as err:
+        module.fail_json(msg=str(err))
+
+    results = DEFAULT_RESULT_OBJ
+    try:
+        # ALL ITEMS SHARE ONE LOCK AND ONE COMMIT. IN WORKSPACE MODE A STOPPED RUN DISCARDS THE WRITES OF THE ITEMS
+        # BEFORE IT. WITHOUT WORKSPACE MODE THOSE WRITES ARE ALREADY LIVE
+        fmgr.begin_transaction(adom=paramgram["adom"])
+        try:
+            results = fmgr_bulk_run(fmgr, paramgram, function)
+        except BaseException:
+            fmgr.abort_transaction()
+            raise
+        if results[0] != 0 and not paramgram["continue_on_error"]:
+            fmgr.abort_transaction()
+        else:
+            fmgr.commit_transaction()
+
+        fmgr.govern_response(module=module, results=results, changed=results[1]["changed_items"] > 0,
+                             ansible_facts=fmgr.construct_ansible_facts(results, module.params, paramgram))
+
+    except Exception as err:
+        raise FMGBaseException(err)
+
+    return module.exit_json(**results[1])
+
+
+if __name__ == "__main__":
+    main()
@@ -219,6 +219,9 @@ def get_device(fmgr, paramgram):
     datagram = {
         "adom": paramgram["adom"],
         "filter": ["name", "==", paramgram["device_unique_name"]],
+        # THE EXISTENCE CHECK ONLY NEEDS A SUMMARY OF THE DEVICE, NOT ITS VDOMS AND FULL CONFIG
+        "fields": ["name", "sn", "ip", "conn_status"],
+        "loadsub": 0,
     }
 
     url = '/dvmdb/adom/{adom}/device/{name}'.format(adom=paramgram["adom"],
@@ -76,6 +76,20 @@ options:
     description:
       - Specify what protocols are allowed on the interface, comma-separated list (see examples).
     required: false
+
+  async_task:
+    description:
+      - Only applies to install_config when FortiManager is in Workspace Mode, where the module otherwise waits for
+        the install to finish.
+      - When true, the module returns the task ID as soon as the install has started, so installs to different
+        devices can run at the same time. Wait for them with the fmgr_task_wait module.
+      - Without Workspace Mode the module never waits for the task, whether this is set or not.
+      - Either way the task ID is returned under results.task, i.e. "{{ config.results.task }}" for a task
+        registered as config.
+    required: false
+    type: bool
+    default: false
+    version_added: 2.9
 '''
 
 EXAMPLES = '''
@@ -97,6 +111,20 @@ EXAMPLES = '''
     adom: "root"
     device_unique_name: "FGT1"
     install_config: "enable"
+
+- name: INSTALL CONFIG WITHOUT WAITING FOR IT
+  fmgr_device_config:
+    adom: "root"
+    device_unique_name: "FGT1"
+    install_config: "enable"
+    async_task: true
+  register: config
+
+- name: WAIT FOR THE INSTALL
+  fmgr_task_wait:
+    adom: "root"
+    task_ids:
+      - "{{ config.results.task }}"
 '''
 
 RETURN = """
@@ -189,6 +217,7 @@ def main():
         interface_ip=dict(required=False, type="str"),
         interface_allow_access=dict(required=False, type="str"),
         install_config=dict(required=False, type="str", default="disable"),
+        async_task=dict(required=False, type="bool", default=False),
     )
 
     module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=False, )
@@ -199,6 +228,7 @@ def main():
         "interface_ip": module.params["interface_ip"],
         "interface_allow_access": module.params["interface_allow_access"],
         "install_config": module.params["install_config"],
+        "async_task": module.params["async_task"],
         "adom": module.params["adom"]
     }
     module.paramgram = paramgram
@@ -227,11 +227,10 @@ def add_group_member(fmgr, paramgram):
     device_member_list = paramgram["grp_members"].replace(' ', '')
     device_member_list = device_member_list.split(',')
 
+    url = '/dvmdb/adom/{adom}/group/{grp_name}/object member'.format(adom=paramgram["adom"],
+                                                                     grp_name=paramgram["grp_name"])
     for dev_name in device_member_list:
         datagram = {'name': dev_name, 'vdom': paramgram["vdom"]}
-
-        url = '/dvmdb/adom/{adom}/group/{grp_name}/object member'.format(adom=paramgram["adom"],
-                                                                         grp_name=paramgram["grp_name"])
         response = fmgr.process_request(url, datagram, FMGRMethods.ADD)
 
     return response
@@ -252,11 +251,10 @@ def delete_group_member(fmgr, paramgram):
     device_member_list = paramgram["grp_members"].replace(' ', '')
     device_member_list = device_member_list.split(',')
 
+    url = '/dvmdb/adom/{adom}/group/{grp_name}/object member'.format(adom=paramgram["adom"],
+                                                                     grp_name=paramgram["grp_name"])
     for dev_name in device_member_list:
         datagram = {'name': dev_name, 'vdom': paramgram["vdom"]}
-
-        url = '/dvmdb/adom/{adom}/group/{grp_name}/object member'.format(adom=paramgram["adom"],
-                                                                         grp_name=paramgram["grp_name"])
         response = fmgr.process_request(url, datagram, FMGRMethods.DELETE)
 
     return response
@@ -66,6 +66,11 @@ options:
       - Takes integers 1-32
     default: 22
 
+  chunk_size:
+    description:
+      - The number of objects sent per request when I(objects) or I(objects_file) is used.
+    default: 100
+
   comment:
     description:
       - Comment for the object in FortiManager.
@@ -74,6 +79,14 @@ options:
     description:
       - Country name. Required if type = geographic.
 
+  delete_filter:
+    description:
+      - A JSON-RPC filter selecting many objects to delete at once, i.e. ["name", "like", "tmp-%"].
+      - Only used when mode = delete. The table is picked by the ipv4, ipv6 or multicast parameter, and
+        name/group_name are ignored.
+      - All matching names are found with a single query and deleted in batched requests, with one commit.
+    type: list
+
   end_ip:
     description:
       - End IP. Only used when ipv4 = iprange.
@@ -82,6 +95,19 @@ options:
     description:
       - Address group member. If this is defined w/out group_name, the operation will fail.
 
+  group_members_add:
+    description:
+      - Address group members to add to the existing group group_name, keeping its other members.
+      - Only the members that are missing are sent, to the member sub-table of the group, so the size of the request
+        doesn't depend on the size of the group. mode is ignored.
+    type: list
+
+  group_members_remove:
+    description:
+      - Address group members to remove from the existing group group_name, keeping its other members.
+      - Only the members that are present are sent, and they're removed after group_members_add is applied.
+    type: list
+
   group_name:
     description:
       - Address group name. If this is defined in playbook task, all other options are ignored.
@@ -137,6 +163,28 @@ options:
     description:
       - Object ID for NSX.
 
+  objects:
+    description:
+      - A list of address, address group and multicast objects to add, set or delete in bulk, in place of a single
+        object.
+      - Each object is a dictionary of the options of this module, i.e. ipv4, name, ipv4addr, start_ip, end_ip, fqdn,
+        wildcard, country, group_members, comment or color. Options left out of an object are taken from the task,
+        except name, group_name and group_members. Groups may be named with either name or group_name, and their
+        group_members may be a list.
+      - Objects are sent as the data list of chunked add/set requests, per table, with addresses written before
+        groups and deleted after them. In workspace mode the ADOM is locked and committed once.
+      - Unlike single objects, bulk writes are sent without first reading the current objects, so they always
+        report a change.
+    type: list
+
+  objects_file:
+    description:
+      - Path of a file holding more objects for I(objects), read on the Ansible controller.
+      - Either a CSV file with a header row of option names, where empty cells are unset options, or a YAML or
+        JSON file holding a list of objects.
+      - YAML files require PyYAML.
+    type: path
+
   start_ip:
     description:
       - Start IP. Only used when ipv4 = iprange.
@@ -248,6 +296,36 @@ EXAMPLES = '''
     group_name: "ansibleIPv6Group"
     group_members: "ansible_v6Obj, ansible_v6range"
 
+- name: ADD ONE MEMBER TO AN IPv4 ADDRESS GROUP AND REMOVE ANOTHER
+  fmgr_fwobj_address:
+    ipv4: "group"
+    group_name: "ansibleIPv4Group"
+    group_members_add: ["ansible_v4Obj"]
+    group_members_remove: ["ansible_range"]
+
+- name: DELETE EVERY IPv4 ADDRESS WHOSE NAME STARTS WITH tmp-
+  fmgr_fwobj_address:
+    ipv4: "ipmask"
+    mode: "delete"
+    delete_filter: ["name", "like", "tmp-%"]
+
+- name: SYNC ADDRESSES AND GROUPS FROM AN IPAM EXPORT
+  fmgr_fwobj_address:
+    adom: "ansible"
+    mode: "set"
+    ipv4: "ipmask"
+    objects_file: "/var/lib/ipam/addresses.csv"
+    chunk_size: 500
+
+- name: ADD SEVERAL IPv4 OBJECTS AND A GROUP OF THEM
+  fmgr_fwobj_address:
+    mode: "add"
+    objects:
+      - {"ipv4": "ipmask", "name": "ansible_bulk_host", "ipv4addr": "10.7.220.40/32"}
+      - {"ipv4": "iprange", "name": "ansible_bulk_range", "start_ip": "10.7.220.50", "end_ip": "10.7.220.59"}
+      - {"ipv4": "fqdn", "name": "ansible_bulk_fqdn", "fqdn": "docs.ansible.com"}
+      - {"ipv4": "group", "name": "ansible_bulk_group", "group_members": ["ansible_bulk_host", "ansible_bulk_range"]}
+
 - name: ADD MULTICAST RANGE
   fmgr_fwobj_address:
     multicast: "multicastrange"
@@ -269,27 +347,54 @@ api_result:
   description: full API response, includes status code and message
   returned: always
   type: str
+failed_objects:
+  description: The objects of a bulk run that couldn't be written or deleted, with their code and message.
+  returned: when objects or objects_file is used
+  type: list
 """
 
 
-import re
+import csv
+import json
+import os
+
 from ansible.module_utils.basic import AnsibleModule, env_fallback
 from ansible.module_utils.connection import Connection
 from ansible.module_utils.network.fortimanager.fortimanager import FortiManagerHandler
+from ansible.module_utils.network.fortimanager.fortimanager_diff import FMGR_UNCHANGED_KEY
+from ansible.module_utils.network.fortimanager.fortimanager_address import FMGRAddress
 from ansible.module_utils.network.fortimanager.common import FMGBaseException
 from ansible.module_utils.network.fortimanager.common import FMGRCommon
 from ansible.module_utils.network.fortimanager.common import DEFAULT_RESULT_OBJ
 from ansible.module_utils.network.fortimanager.common import FAIL_SOCKET_MSG
+from ansible.module_utils.network.fortimanager.common import FMGR_BATCH_SIZE
+from ansible.module_utils.network.fortimanager.common import FMGRMethods
 
+try:
+    import yaml
+    HAS_YAML = True
+except ImportError:
+    HAS_YAML = False
 
-def fmgr_fwobj_ipv4(fmgr, paramgram):
+# THE TABLES OF A BULK RUN, IN THE ORDER THEY'RE WRITTEN. GROUPS COME LAST, AS THEY REFERENCE THE ADDRESSES
+FMGR_FWOBJ_TABLES = ["address", "address6", "multicast-address", "addrgrp", "addrgrp6"]
+
+# THE PARAMGRAM KEYS AN OBJECT OF A BULK RUN MAY SET, AND THOSE OF THEM WRITTEN WITH A HYPHEN
+FMGR_FWOBJ_HYPHENATED_KEYS = ["allow-routing", "associated-interface", "cache-ttl", "end-ip", "start-ip",
+                              "wildcard-fqdn", "obj-id"]
+FMGR_FWOBJ_OBJECT_KEYS = FMGR_FWOBJ_HYPHENATED_KEYS + ["color", "comment", "country", "fqdn", "name", "visibility",
+                                                       "wildcard", "ipv4", "ipv6", "multicast", "group_members",
+                                                       "group_name", "ipv4addr", "ipv6addr"]
+
+
+def fmgr_fwobj_ipv4_request(paramgram):
     """
-    :param fmgr: The fmgr object instance from fortimanager.py
-    :type fmgr: class object
+    Builds the request of an IPv4 address or address group.
+
     :param paramgram: The formatted dictionary of options to process
     :type paramgram: dict
-    :return: The response from the FortiManager
-    :rtype: dict
+    :return: The URL and the datagram of the request.
+    :rtype: tuple
     """
     # EVAL THE MODE PARAMETER FOR SET OR ADD
     if paramgram["mode"] in ['set', 'add']:
@@ -319,31 +424,16 @@ def fmgr_fwobj_ipv4(fmgr, paramgram):
         # IF type = 'ipmask'
         #########################
         if datagram["type"] == "ipmask":
-            # CREATE THE SUBNET LIST OBJECT
-            subnet = []
-            # EVAL THE IPV4ADDR INPUT AND SPLIT THE IP ADDRESS FROM THE MASK AND APPEND THEM TO THE SUBNET LIST
-            for subnets in paramgram["ipv4addr"].split("/"):
-                subnet.append(subnets)
-
-            # CHECK THAT THE SECOND ENTRY IN THE SUBNET LIST (WHAT WAS TO THE RIGHT OF THE / CHARACTER)
-            # IS IN SUBNET MASK FORMAT AND NOT CIDR FORMAT.
-            # IF IT IS IN CIDR FORMAT, WE NEED TO CONVERT IT TO SUBNET BIT MASK FORMAT FOR THE JSON API
-            if not re.match(r'\d{1,3}.\d{1,3}.\d{1,3}.\d{1,3}', subnet[1]):
-                # IF THE SUBNET PARAMETER INPUT DIDN'T LOOK LIKE xxx.xxx.xxx.xxx TO REGEX...
-                # ... RUN IT THROUGH THE CIDR_TO_NETMASK() FUNCTION
-                mask = fmgr._tools.cidr_to_netmask(subnet[1])
-                # AND THEN UPDATE THE SUBNET LIST OBJECT
-                subnet[1] = mask
-
-            # INCLUDE THE SUBNET LIST OBJECT IN THE DATAGRAM DICTIONARY TO BE SUBMITTED
-            datagram["subnet"] = subnet
+            # SPLIT THE IPV4ADDR INPUT INTO THE IP ADDRESS AND THE SUBNET MASK THE JSON API EXPECTS
+            # CIDR PREFIXES ARE CONVERTED TO SUBNET MASKS, AND /32 IS ASSUMED WHEN THE MASK IS OMITTED
+            datagram["subnet"] = FMGRAddress.ipv4_subnet(paramgram["ipv4addr"])
 
         #########################
         # IF type = 'iprange'
         #########################
         if datagram["type"] == "iprange":
-            datagram["start-ip"] = paramgram["start-ip"]
-            datagram["end-ip"] = paramgram["end-ip"]
+            datagram["start-ip"] = FMGRAddress.ipv4_address(paramgram["start-ip"])
+            datagram["end-ip"] = FMGRAddress.ipv4_address(paramgram["end-ip"])
             datagram["subnet"] = ["0.0.0.0", "0.0.0.0"]
 
         #########################
@@ -356,16 +446,7 @@ def fmgr_fwobj_ipv4(fmgr, paramgram):
         # IF type = 'wildcard'
         #########################
         if datagram["type"] == "wildcard":
-
-            subnet = []
-            for subnets in paramgram["wildcard"].split("/"):
-                subnet.append(subnets)
-
-            if not re.match(r'\d{1,3}.\d{1,3}.\d{1,3}.\d{1,3}', subnet[1]):
-                mask = fmgr._tools.cidr_to_netmask(subnet[1])
-                subnet[1] = mask
-
-            datagram["wildcard"] = subnet
+            datagram["wildcard"] = FMGRAddress.ipv4_wildcard(paramgram["wildcard"])
 
         #########################
         # IF type = 'wildcard-fqdn'
@@ -415,11 +496,10 @@ def fmgr_fwobj_ipv4(fmgr, paramgram):
             url = '/pm/config/adom/{adom}/obj/firewall/address/{name}'.format(adom=paramgram["adom"],
                                                                               name=paramgram["name"])
 
-    response = fmgr.process_request(url, datagram, paramgram["mode"])
-    return response
+    return url, datagram
 
 
-def fmgr_fwobj_ipv6(fmgr, paramgram):
+def fmgr_fwobj_ipv4(fmgr, paramgram):
     """
     :param fmgr: The fmgr object instance from fortimanager.py
     :type fmgr: class object
@@ -428,6 +508,20 @@ def fmgr_fwobj_ipv6(fmgr, paramgram):
     :return: The response from the FortiManager
     :rtype: dict
     """
+    url, datagram = fmgr_fwobj_ipv4_request(paramgram)
+    response = fmgr.process_request_if_changed(url, datagram, paramgram["mode"])
+    return response
+
+
+def fmgr_fwobj_ipv6_request(paramgram):
+    """
+    Builds the request of an IPv6 address or address group.
+
+    :param paramgram: The formatted dictionary of options to process
+    :type paramgram: dict
+    :return: The URL and the datagram of the request.
+    :rtype: tuple
+    """
     # EVAL THE MODE PARAMETER FOR SET OR ADD
     if paramgram["mode"] in ['set', 'add']:
         # CREATE THE DATAGRAM DICTIONARY
@@ -453,7 +547,7 @@ def fmgr_fwobj_ipv6(fmgr, paramgram):
         #########################
         if datagram["type"] == "ip":
             datagram["type"] = "ipprefix"
-            datagram["ip6"] = paramgram["ipv6addr"]
+            datagram["ip6"] = FMGRAddress.ipv6_prefix(paramgram["ipv6addr"])
 
         #########################
         # IF type = 'iprange'
@@ -497,11 +591,10 @@ def fmgr_fwobj_ipv6(fmgr, paramgram):
             url = '/pm/config/adom/{adom}/obj/firewall/address6/{name}'.format(adom=paramgram["adom"],
                                                                                name=paramgram["name"])
 
-    response = fmgr.process_request(url, datagram, paramgram["mode"])
-    return response
+    return url, datagram
 
 
-def fmgr_fwobj_multicast(fmgr, paramgram):
+def fmgr_fwobj_ipv6(fmgr, paramgram):
     """
     :param fmgr: The fmgr object instance from fortimanager.py
     :type fmgr: class object
@@ -510,6 +603,20 @@ def fmgr_fwobj_multicast(fmgr, paramgram):
     :return: The response from the FortiManager
     :rtype: dict
     """
+    url, datagram = fmgr_fwobj_ipv6_request(paramgram)
+    response = fmgr.process_request_if_changed(url, datagram, paramgram["mode"])
+    return response
+
+
+def fmgr_fwobj_multicast_request(paramgram):
+    """
+    Builds the request of a multicast address.
+
+    :param paramgram: The formatted dictionary of options to process
+    :type paramgram: dict
+    :return: The URL and the datagram of the request.
+    :rtype: tuple
+    """
     # EVAL THE MODE PARAMETER FOR SET OR ADD
     if paramgram["mode"] in ['set', 'add']:
         # CREATE THE DATAGRAM DICTIONARY
@@ -531,30 +638,16 @@ def fmgr_fwobj_multicast(fmgr, paramgram):
         # IF type = 'multicastrange'
         #########################
         if paramgram["multicast"] == "multicastrange":
-            datagram["start-ip"] = paramgram["start-ip"]
-            datagram["end-ip"] = paramgram["end-ip"]
+            datagram["start-ip"] = FMGRAddress.ipv4_address(paramgram["start-ip"])
+            datagram["end-ip"] = FMGRAddress.ipv4_address(paramgram["end-ip"])
             datagram["subnet"] = ["0.0.0.0", "0.0.0.0"]
 
         #########################
         # IF type = 'broadcastmask'
         #########################
         if paramgram["multicast"] == "broadcastmask":
-            # EVAL THE IPV4ADDR INPUT AND SPLIT THE IP ADDRESS FROM THE MASK AND APPEND THEM TO THE SUBNET LIST
-            subnet = []
-            for subnets in paramgram["ipv4addr"].split("/"):
-                subnet.append(subnets)
-            # CHECK THAT THE SECOND ENTRY IN THE SUBNET LIST (WHAT WAS TO THE RIGHT OF THE / CHARACTER)
-            # IS IN SUBNET MASK FORMAT AND NOT CIDR FORMAT.
-            # IF IT IS IN CIDR FORMAT, WE NEED TO CONVERT IT TO SUBNET BIT MASK FORMAT FOR THE JSON API
-            if not re.match(r'\d{1,3}.\d{1,3}.\d{1,3}.\d{1,3}', subnet[1]):
-                # IF THE SUBNET PARAMETER INPUT DIDN'T LOOK LIKE 255.255.255.255 TO REGEX...
-                # ... RUN IT THROUGH THE fmgr_cidr_to_netmask() FUNCTION
-                mask = fmgr._tools.cidr_to_netmask(subnet[1])
-                # AND THEN UPDATE THE SUBNET LIST OBJECT
-                subnet[1] = mask
-
-            # INCLUDE THE SUBNET LIST OBJECT IN THE DATAGRAM DICTIONARY TO BE SUBMITTED
-            datagram["subnet"] = subnet
+            # SPLIT THE IPV4ADDR INPUT INTO THE IP ADDRESS AND THE SUBNET MASK THE JSON API EXPECTS
+            datagram["subnet"] = FMGRAddress.ipv4_subnet(paramgram["ipv4addr"])
 
     # EVAL THE MODE PARAMETER FOR DELETE
     if paramgram["mode"] == "delete":
@@ -565,7 +658,226 @@ def fmgr_fwobj_multicast(fmgr, paramgram):
         url = '/pm/config/adom/{adom}/obj/firewall/multicast-address/{name}'.format(adom=paramgram["adom"],
                                                                                     name=paramgram["name"])
 
-    response = fmgr.process_request(url, datagram, paramgram["mode"])
+    return url, datagram
+
+
+def fmgr_fwobj_multicast(fmgr, paramgram):
+    """
+    :param fmgr: The fmgr object instance from fortimanager.py
+    :type fmgr: class object
+    :param paramgram: The formatted dictionary of options to process
+    :type paramgram: dict
+    :return: The response from the FortiManager
+    :rtype: dict
+    """
+    url, datagram = fmgr_fwobj_multicast_request(paramgram)
+    response = fmgr.process_request_if_changed(url, datagram, paramgram["mode"])
+    return response
+
+
+def fmgr_fwobj_delete_by_filter(fmgr, paramgram):
+    """
+    :param fmgr: The fmgr object instance from fortimanager.py
+    :type fmgr: class object
+    :param paramgram: The formatted dictionary of options to process
+    :type paramgram: dict
+    :return: The response from the FortiManager
+    :rtype: dict
+    """
+    # PICK THE TABLE THE FILTER APPLIES TO
+    url = '/pm/config/adom/{adom}/obj/firewall/{table}'.format(adom=paramgram["adom"],
+                                                               table=fmgr_fwobj_table(paramgram))
+
+    response = fmgr.delete_by_filter(url, paramgram["delete_filter"])
+    return response
+
+
+def fmgr_fwobj_table(paramgram):
+    """
+    Returns the table of the object type picked by the ipv4, ipv6 or multicast parameter.
+
+    :param paramgram: The formatted dictionary of options to process
+    :type paramgram: dict
+    :return: The table name, i.e. address or addrgrp6.
+    :rtype: str
+    """
+    if paramgram["ipv4"]:
+        return "addrgrp" if paramgram["ipv4"] == "group" else "address"
+    if paramgram["ipv6"]:
+        return "addrgrp6" if paramgram["ipv6"] == "group" else "address6"
+    return "multicast-address"
+
+
+def fmgr_fwobj_group_members(fmgr, paramgram):
+    """
+    :param fmgr: The fmgr object instance from fortimanager.py
+    :type fmgr: class object
+    :param paramgram: The formatted dictionary of options to process
+    :type paramgram: dict
+    :return: The response from the FortiManager
+    :rtype: dict
+    """
+    url = '/pm/config/adom/{adom}/obj/firewall/{table}/{name}'.format(adom=paramgram["adom"],
+                                                                      table=fmgr_fwobj_table(paramgram),
+                                                                      name=paramgram["group_name"])
+    members_add = [member.strip() for member in paramgram["group_members_add"] or [] if member.strip()]
+    members_remove = [member.strip() for member in paramgram["group_members_remove"] or [] if member.strip()]
+
+    # READ THE CURRENT MEMBERS, SO ONLY THE MISSING ONES ARE ADDED AND ONLY THE PRESENT ONES ARE REMOVED
+    # IF THE GROUP CAN'T BE READ, THE CHANGES ARE SENT AS THEY ARE AND THE FORTIMANAGER REPORTS THE ERROR
+    current = fmgr.process_request(url, {"fields": ["member"]}, FMGRMethods.GET)
+    if current[0] == 0 and isinstance(current[1], dict):
+        members = current[1].get("member") or []
+        members = set(members if isinstance(members, list) else [members])
+        members_add = [member for member in members_add if member not in members]
+        members_remove = [member for member in members_remove if member in members]
+
+    if not members_add and not members_remove:
+        return 0, {"status": {"code": 0, "message": "No changes needed. The group members already match."},
+                   "url": url, "added": [], "removed": [], FMGR_UNCHANGED_KEY: True}
+
+    # ONLY THE DELTA IS SENT, TO THE MEMBER SUB-TABLE OF THE GROUP. MEMBERS ARE ADDED FIRST, SO REPLACING THE LAST
+    # MEMBER OF A GROUP NEVER LEAVES IT EMPTY
+    response = 0, {}
+    with fmgr.transaction(adom=paramgram["adom"]):
+        if members_add:
+            response = fmgr.process_request(url + "/member", {"data": members_add}, FMGRMethods.ADD)
+        if members_remove and response[0] == 0:
+            response = fmgr.process_request(url + "/member", {"data": members_remove}, FMGRMethods.DELETE)
+    if response[0] != 0:
+        return response
+
+    msg = "Added " + str(len(members_add)) + " and removed " + str(len(members_remove)) + " group members."
+    return 0, {"status": {"code": 0, "message": msg}, "url": url, "added": members_add, "removed": members_remove}
+
+
+def fmgr_fwobj_load_objects_file(path):
+    """
+    Reads the objects of a bulk run from a CSV file with a header row of option names, or from a YAML or JSON file
+    holding a list of objects.
+
+    :param path: The path of the file.
+    :type path: str
+    :return: The objects.
+    :rtype: list
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in [".csv", ".yml", ".yaml", ".json"]:
+        raise FMGBaseException(msg="objects_file must be a .csv, .yml, .yaml or .json file: " + path)
+    if extension in [".yml", ".yaml"] and not HAS_YAML:
+        raise FMGBaseException(msg="Reading a YAML objects_file requires PyYAML.")
+    try:
+        with open(path, "r") as objects_file:
+            if extension == ".csv":
+                # EMPTY CELLS ARE UNSET OPTIONS, SO EACH ROW ONLY CARRIES THE COLUMNS IT FILLS
+                return [dict((key.strip(), value.strip()) for key, value in row.items() if key and value)
+                        for row in csv.DictReader(objects_file)]
+            if extension == ".json":
+                objects = json.load(objects_file)
+            else:
+                objects = yaml.safe_load(objects_file)
+    except Exception as err:
+        raise FMGBaseException(msg="Couldn't read objects_file " + path + ": " + str(err))
+    if not isinstance(objects, list) or not all(isinstance(obj, dict) for obj in objects):
+        raise FMGBaseException(msg="objects_file must hold a list of objects: " + path)
+    return objects
+
+
+def fmgr_fwobj_object_paramgram(paramgram, obj):
+    """
+    Builds the paramgram of one object of a bulk run. The object's options override the ones of the task, except
+    that a name is never inherited from the task.
+
+    :param paramgram: The formatted dictionary of options of the task
+    :type paramgram: dict
+    :param obj: The options of the object, named like the module options, i.e. start_ip.
+    :type obj: dict
+    :return: The formatted dictionary of options of the object
+    :rtype: dict
+    """
+    object_paramgram = dict(paramgram, name=None, group_name=None, group_members=None)
+    if any(obj.get(kind) for kind in ["ipv4", "ipv6", "multicast"]):
+        object_paramgram.update(ipv4=None, ipv6=None, multicast=None)
+    for option, value in obj.items():
+        key = option.replace("_", "-") if option.replace("_", "-") in FMGR_FWOBJ_HYPHENATED_KEYS else option
+        if key not in FMGR_FWOBJ_OBJECT_KEYS:
+            raise FMGBaseException(msg="Unsupported option " + str(option))
+        if value is not None and value != "":
+            object_paramgram[key] = value
+    if isinstance(object_paramgram["group_members"], list):
+        object_paramgram["group_members"] = ",".join(object_paramgram["group_members"])
+    # A GROUP MAY BE NAMED WITH NAME, WHICH SPARES A GROUP_NAME COLUMN IN CSV FILES
+    if "group" in [object_paramgram["ipv4"], object_paramgram["ipv6"]] and not object_paramgram["group_name"]:
+        object_paramgram["group_name"] = object_paramgram["name"]
+    return object_paramgram
+
+
+def fmgr_fwobj_bulk(fmgr, paramgram):
+    """
+    :param fmgr: The fmgr object instance from fortimanager.py
+    :type fmgr: class object
+    :param paramgram: The formatted dictionary of options to process
+    :type paramgram: dict
+    :return: The response from the FortiManager
+    :rtype: dict
+    """
+    objects = list(paramgram["objects"] or [])
+    if paramgram["objects_file"]:
+        objects.extend(fmgr_fwobj_load_objects_file(paramgram["objects_file"]))
+
+    # BUILD EVERY DATAGRAM FIRST, SO AN INVALID OBJECT IS REPORTED WITHOUT HOLDING BACK THE OTHERS
+    tables = dict((table, list()) for table in FMGR_FWOBJ_TABLES)
+    failed = list()
+    for index, obj in enumerate(objects):
+        try:
+            if not isinstance(obj, dict):
+                raise FMGBaseException(msg="Every object must be a dictionary.")
+            object_paramgram = fmgr_fwobj_object_paramgram(paramgram, obj)
+            if not (object_paramgram["ipv4"] or object_paramgram["ipv6"] or object_paramgram["multicast"]):
+                raise FMGBaseException(msg="The object sets none of ipv4, ipv6 or multicast.")
+            table = fmgr_fwobj_table(object_paramgram)
+            if paramgram["mode"] == "delete":
+                key = object_paramgram["group_name"] if table in ["addrgrp", "addrgrp6"] else object_paramgram["name"]
+                if not key:
+                    raise FMGBaseException(msg="The object has no name.")
+                tables[table].append(key)
+            elif object_paramgram["ipv4"]:
+                tables[table].append(fmgr_fwobj_ipv4_request(object_paramgram)[1])
+            elif object_paramgram["ipv6"]:
+                tables[table].append(fmgr_fwobj_ipv6_request(object_paramgram)[1])
+            else:
+                tables[table].append(fmgr_fwobj_multicast_request(object_paramgram)[1])
+        except Exception as err:
+            name = (obj.get("name") or obj.get("group_name")) if isinstance(obj, dict) else None
+            failed.append({"index": index, "name": name, "code": 1, "message": str(err)})
+
+    # ADDRESSES ARE WRITTEN BEFORE THE GROUPS THAT REFERENCE THEM, AND DELETED AFTER THEM
+    order = list(reversed(FMGR_FWOBJ_TABLES)) if paramgram["mode"] == "delete" else FMGR_FWOBJ_TABLES
+    done = 0
+    with fmgr.transaction(adom=paramgram["adom"]):
+        for table in order:
+            if not tables[table]:
+                continue
+            url = '/pm/config/adom/{adom}/obj/firewall/{table}'.format(adom=paramgram["adom"], table=table)
+            if paramgram["mode"] == "delete":
+                response = fmgr.delete_objects(url, tables[table])
+                done += len(response[1].get("deleted", []))
+            else:
+                response = fmgr.write_objects(url, tables[table], paramgram["mode"],
+                                              chunk_size=paramgram["chunk_size"])
+                done += len(response[1].get("written", []))
+            for failure in response[1].get("failed", []):
+                failed.append(dict(failure, table=table))
+            if response[0] != 0 and not response[1].get("failed"):
+                failed.append({"table": table, "code": response[0], "message": str(response[1])})
+
+    code = 0 if not failed else failed[0]["code"]
+    verb = "Deleted " if paramgram["mode"] == "delete" else "Wrote "
+    msg = verb + str(done) + " of " + str(len(objects)) + " objects."
+    response = code, {"status": {"code": code, "message": msg}, "objects": len(objects), "done": done,
+                      "failed_objects": failed}
+    if not done and not failed:
+        response[1][FMGR_UNCHANGED_KEY] = True
     return response
 
 
@@ -580,6 +892,10 @@ def main():
         color=dict(required=False, type="str", default=22),
         comment=dict(required=False, type="str"),
         country=dict(required=False, type="str"),
+        delete_filter=dict(required=False, type="list"),
+        objects=dict(required=False, type="list"),
+        objects_file=dict(required=False, type="path"),
+        chunk_size=dict(required=False, type="int", default=FMGR_BATCH_SIZE),
         fqdn=dict(required=False, type="str"),
         name=dict(required=False, type="str"),
         start_ip=dict(required=False, type="str"),
@@ -591,6 +907,8 @@ def main():
         wildcard_fqdn=dict(required=False, type="str"),
         ipv6=dict(required=False, type="str", choices=['ip', 'iprange', 'group']),
         group_members=dict(required=False, type="str"),
+        group_members_add=dict(required=False, type="list"),
+        group_members_remove=dict(required=False, type="list"),
         group_name=dict(required=False, type="str"),
         ipv4addr=dict(required=False, type="str"),
         ipv6addr=dict(required=False, type="str"),
@@ -603,7 +921,11 @@ def main():
                            mutually_exclusive=[
                                ['ipv4', 'ipv6'],
                                ['ipv4', 'multicast'],
-                               ['ipv6', 'multicast']
+                               ['ipv6', 'multicast'],
+                               ['objects', 'delete_filter'],
+                               ['objects_file', 'delete_filter'],
+                               ['group_members', 'group_members_add'],
+                               ['group_members', 'group_members_remove'],
                            ])
     paramgram = {
         "adom": module.params["adom"],
@@ -613,6 +935,10 @@ def main():
         "color": module.params["color"],
         "comment": module.params["comment"],
         "country": module.params["country"],
+        "delete_filter": module.params["delete_filter"],
+        "objects": module.params["objects"],
+        "objects_file": module.params["objects_file"],
+        "chunk_size": module.params["chunk_size"],
         "end-ip": module.params["end_ip"],
         "fqdn": module.params["fqdn"],
         "name": module.params["name"],
@@ -623,6 +949,8 @@ def main():
         "ipv6": module.params["ipv6"],
         "ipv4": module.params["ipv4"],
         "group_members": module.params["group_members"],
+        "group_members_add": module.params["group_members_add"],
+        "group_members_remove": module.params["group_members_remove"],
         "group_name": module.params["group_name"],
         "ipv4addr": module.params["ipv4addr"],
         "ipv6addr": module.params["ipv6addr"],
@@ -640,9 +968,24 @@ def main():
     else:
         module.fail_json(**FAIL_SOCKET_MSG)
 
+    if (paramgram["group_members_add"] or paramgram["group_members_remove"]) \
+            and not ("group" in [paramgram["ipv4"], paramgram["ipv6"]] and paramgram["group_name"]):
+        module.fail_json(msg="group_members_add and group_members_remove require group_name, and ipv4 or ipv6 set "
+                             "to group.")
+
     results = DEFAULT_RESULT_OBJ
     try:
-        if paramgram["ipv4"]:
+        if paramgram["objects"] or paramgram["objects_file"]:
+            results = fmgr_fwobj_bulk(fmgr, paramgram)
+
+        elif paramgram["group_members_add"] or paramgram["group_members_remove"]:
+            results = fmgr_fwobj_group_members(fmgr, paramgram)
+
+        elif paramgram["mode"] == "delete" and paramgram["delete_filter"] \
+                and (paramgram["ipv4"] or paramgram["ipv6"] or paramgram["multicast"]):
+            results = fmgr_fwobj_delete_by_filter(fmgr, paramgram)
+
+        elif paramgram["ipv4"]:
             results = fmgr_fwobj_ipv4(fmgr, paramgram)
 
         elif paramgram["ipv6"]:
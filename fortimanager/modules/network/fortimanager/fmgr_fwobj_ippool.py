@@ -287,12 +287,12 @@ api_result:
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.connection import Connection
 from ansible.module_utils.network.fortimanager.fortimanager import FortiManagerHandler
+from ansible.module_utils.network.fortimanager.fortimanager_address import FMGRAddress
 from ansible.module_utils.network.fortimanager.common import FMGBaseException
 from ansible.module_utils.network.fortimanager.common import FMGRCommon
 from ansible.module_utils.network.fortimanager.common import DEFAULT_RESULT_OBJ
 from ansible.module_utils.network.fortimanager.common import FAIL_SOCKET_MSG
-from ansible.module_utils.network.fortimanager.common import prepare_dict
-from ansible.module_utils.network.fortimanager.common import scrub_dict
+from ansible.module_utils.network.fortimanager.common import prepare_and_scrub_dict
 
 
 ###############
@@ -320,7 +320,9 @@ def fmgr_fwobj_ippool_modify(fmgr, paramgram):
     # EVAL THE MODE PARAMETER FOR SET OR ADD
     if mode in ['set', 'add', 'update']:
         url = '/pm/config/adom/{adom}/obj/firewall/ippool'.format(adom=adom)
-        datagram = scrub_dict(prepare_dict(paramgram))
+        datagram = prepare_and_scrub_dict(paramgram)
+        # WRITE THE ADDRESSES AND RANGES IN THE FORM THE FORTIMANAGER RETURNS THEM
+        datagram = FMGRAddress.normalize_ranges(datagram, ["startip", "endip", "source-startip", "source-endip"])
 
     # EVAL THE MODE PARAMETER FOR DELETE
     elif mode == "delete":
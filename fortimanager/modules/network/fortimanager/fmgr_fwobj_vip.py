@@ -1759,13 +1759,13 @@ api_result:
 from ansible.module_utils.basic import AnsibleModule, env_fallback
 from ansible.module_utils.connection import Connection
 from ansible.module_utils.network.fortimanager.fortimanager import FortiManagerHandler
+from ansible.module_utils.network.fortimanager.fortimanager_address import FMGRAddress
 from ansible.module_utils.network.fortimanager.common import FMGBaseException
 from ansible.module_utils.network.fortimanager.common import FMGRCommon
 from ansible.module_utils.network.fortimanager.common import FMGRMethods
 from ansible.module_utils.network.fortimanager.common import DEFAULT_RESULT_OBJ
 from ansible.module_utils.network.fortimanager.common import FAIL_SOCKET_MSG
-from ansible.module_utils.network.fortimanager.common import prepare_dict
-from ansible.module_utils.network.fortimanager.common import scrub_dict
+from ansible.module_utils.network.fortimanager.common import prepare_and_scrub_dict
 
 
 def fmgr_firewall_vip_modify(fmgr, paramgram):
@@ -1788,7 +1788,9 @@ def fmgr_firewall_vip_modify(fmgr, paramgram):
     # EVAL THE MODE PARAMETER FOR SET OR ADD
     if mode in ['set', 'add', 'update']:
         url = '/pm/config/adom/{adom}/obj/firewall/vip'.format(adom=adom)
-        datagram = scrub_dict(prepare_dict(paramgram))
+        datagram = prepare_and_scrub_dict(paramgram)
+        # WRITE THE ADDRESSES AND RANGES IN THE FORM THE FORTIMANAGER RETURNS THEM
+        datagram = FMGRAddress.normalize_ranges(datagram, ["extip", "mappedip"])
 
     # EVAL THE MODE PARAMETER FOR DELETE
     elif mode == "delete":
@@ -1796,7 +1798,7 @@ def fmgr_firewall_vip_modify(fmgr, paramgram):
         url = '/pm/config/adom/{adom}/obj/firewall/vip/{name}'.format(adom=adom, name=paramgram["name"])
         datagram = {}
 
-    response = fmgr.process_request(url, datagram, paramgram["mode"])
+    response = fmgr.process_request_if_changed(url, datagram, paramgram["mode"])
     return response
 
 
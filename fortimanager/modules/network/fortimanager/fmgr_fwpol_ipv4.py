@@ -68,6 +68,14 @@ options:
     choices: ["enable", "disable"]
     version_added: "2.9"
 
+  delete_filter:
+    description:
+      - A JSON-RPC filter selecting many policies of the package to delete at once, i.e. ["name", "like", "tmp-%"].
+      - Only used when mode = delete, and name is ignored.
+      - All matching policy IDs are found with a single query and deleted in batched requests, with one commit.
+    required: false
+    type: list
+
   wsso:
     description:
       - Enable/disable WiFi Single Sign On (WSSO).
@@ -961,6 +969,13 @@ EXAMPLES = '''
     av_profile: "sniffer-profile"
     ips_sensor: "default"
 
+- name: DELETE EVERY POLICY WHOSE NAME STARTS WITH tmp-
+  fmgr_fwpol_ipv4:
+    mode: "delete"
+    adom: "ansible"
+    package_name: "default"
+    delete_filter: ["name", "like", "tmp-%"]
+
 '''
 
 RETURN = """
@@ -978,8 +993,7 @@ from ansible.module_utils.network.fortimanager.common import FMGRCommon
 from ansible.module_utils.network.fortimanager.common import FMGRMethods
 from ansible.module_utils.network.fortimanager.common import DEFAULT_RESULT_OBJ
 from ansible.module_utils.network.fortimanager.common import FAIL_SOCKET_MSG
-from ansible.module_utils.network.fortimanager.common import prepare_dict
-from ansible.module_utils.network.fortimanager.common import scrub_dict
+from ansible.module_utils.network.fortimanager.common import prepare_and_scrub_dict
 
 
 def fmgr_firewall_policy_modify(fmgr, paramgram):
@@ -1005,8 +1019,9 @@ def fmgr_firewall_policy_modify(fmgr, paramgram):
     # EVAL THE MODE PARAMETER FOR SET OR ADD
     if mode in ['set', 'add', 'update']:
         url = '/pm/config/adom/{adom}/pkg/{pkg}/firewall/policy'.format(adom=adom, pkg=paramgram["package_name"])
-        datagram = scrub_dict((prepare_dict(paramgram)))
+        datagram = prepare_and_scrub_dict(paramgram)
         del datagram["package_name"]
+        datagram.pop("delete_filter", None)
         datagram = fmgr._tools.split_comma_strings_into_lists(datagram)
 
     # EVAL THE MODE PARAMETER FOR DELETE
@@ -1023,6 +1038,22 @@ def fmgr_firewall_policy_modify(fmgr, paramgram):
     return response
 
 
+def fmgr_firewall_policy_delete_by_filter(fmgr, paramgram):
+    """
+    :param fmgr: The fmgr object instance from fmgr_utils.py
+    :type fmgr: class object
+    :param paramgram: The formatted dictionary of options to process
+    :type paramgram: dict
+
+    :return: The response from the FortiManager
+    :rtype: dict
+    """
+    url = '/pm/config/adom/{adom}/pkg/{pkg}/firewall/policy'.format(adom=paramgram["adom"],
+                                                                    pkg=paramgram["package_name"])
+    response = fmgr.delete_by_filter(url, paramgram["delete_filter"], key="policyid")
+    return response
+
+
 #############
 # END METHODS
 #############
@@ -1035,6 +1066,7 @@ def main():
         package_name=dict(type="str", required=False, default="default"),
         fail_on_missing_dependency=dict(type="str", required=False, default="disable", choices=["enable",
                                                                                                 "disable"]),
+        delete_filter=dict(required=False, type="list"),
         wsso=dict(required=False, type="str", choices=["disable", "enable"]),
         webfilter_profile=dict(required=False, type="str"),
         webcache_https=dict(required=False, type="str", choices=["disable", "enable"]),
@@ -1174,6 +1206,7 @@ def main():
         "mode": module.params["mode"],
         "adom": module.params["adom"],
         "package_name": module.params["package_name"],
+        "delete_filter": module.params["delete_filter"],
         "wsso": module.params["wsso"],
         "webfilter-profile": module.params["webfilter_profile"],
         "webcache-https": module.params["webcache_https"],
@@ -1323,13 +1356,14 @@ def main():
     # BEGIN MODULE-SPECIFIC LOGIC -- THINGS NEED TO HAPPEN DEPENDING ON THE ENDPOINT AND OPERATION
     results = DEFAULT_RESULT_OBJ
     try:
-        if paramgram["mode"] == "delete":
+        if paramgram["mode"] == "delete" and not paramgram["delete_filter"]:
             # WE NEED TO GET THE POLICY ID FROM THE NAME OF THE POLICY TO DELETE IT
             url = '/pm/config/adom/{adom}/pkg/{pkg}/firewall' \
                   '/policy/'.format(adom=paramgram["adom"],
                                     pkg=paramgram["package_name"])
             datagram = {
-                "filter": ["name", "==", paramgram["name"]]
+                "filter": ["name", "==", paramgram["name"]],
+                "fields": ["policyid"]
             }
             response = fmgr.process_request(url, datagram, FMGRMethods.GET)
             try:
@@ -1344,7 +1378,10 @@ def main():
         raise FMGBaseException(err)
 
     try:
-        results = fmgr_firewall_policy_modify(fmgr, paramgram)
+        if paramgram["mode"] == "delete" and paramgram["delete_filter"]:
+            results = fmgr_firewall_policy_delete_by_filter(fmgr, paramgram)
+        else:
+            results = fmgr_firewall_policy_modify(fmgr, paramgram)
         if module.params["fail_on_missing_dependency"] == "disable":
             fmgr.govern_response(module=module, results=results, good_codes=[0, -9998],
                                  ansible_facts=fmgr.construct_ansible_facts(results, module.params, paramgram))
@@ -162,6 +162,20 @@ options:
       - If None, then NAME will be used.
     required: false
     version_added: 2.9
+
+  async_task:
+    description:
+      - Only applies to mode install when FortiManager is in Workspace Mode, where the module otherwise waits for
+        the package install to finish.
+      - When true, the module returns the task ID as soon as the install has started, so packages can be installed
+        to different devices at the same time. Wait for them with the fmgr_task_wait module.
+      - Without Workspace Mode the module never waits for the task, whether this is set or not.
+      - Either way the task ID is returned under results.task, i.e. "{{ install.results.task }}" for a task
+        registered as install.
+    required: false
+    type: bool
+    default: false
+    version_added: 2.9
 '''
 
 
@@ -212,6 +226,21 @@ EXAMPLES = '''
     adom: "ansible"
     name: "ansibleTestPackage1"
 
+- name: INSTALL PACKAGE WITHOUT WAITING FOR IT
+  fmgr_fwpol_package:
+    mode: "install"
+    adom: "ansible"
+    name: "ansibleTestPackage1"
+    object_type: "pkg"
+    async_task: true
+  register: install
+
+- name: WAIT FOR THE INSTALL
+  fmgr_task_wait:
+    adom: "ansible"
+    task_ids:
+      - "{{ install.results.task }}"
+
 - name: REMOVE PACKAGE
   fmgr_fwpol_package:
     mode: "delete"
@@ -606,6 +635,7 @@ def main():
         parent_folder=dict(required=False, type="str"),
         target_folder=dict(required=False, type="str"),
         target_name=dict(required=False, type="str"),
+        async_task=dict(required=False, type="bool", default=False),
 
     )
     module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=False,)
@@ -627,6 +657,7 @@ def main():
         "parent_folder": module.params["parent_folder"],
         "target_folder": module.params["target_folder"],
         "target_name": module.params["target_name"],
+        "async_task": module.params["async_task"],
         "append_members_list": list(),
         "existing_members_list": list(),
         "package_exists": None,
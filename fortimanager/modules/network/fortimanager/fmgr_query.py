@@ -65,6 +65,22 @@ options:
         - DICTIONARY JSON FORMAT ONLY -- Custom dictionary/datagram to send to the endpoint.
     required: false
 
+  page_size:
+    description:
+        - Only used when object = custom. Reads the custom endpoint in pages of this many objects, using the
+          JSON-RPC range parameter, instead of in one response. Use it for large tables.
+        - Sub-tables are not loaded when paging unless custom_dict sets loadsub.
+    required: false
+    version_added: "2.9"
+
+  fields:
+    description:
+      - A LIST of the attributes to return for each object, i.e. ["name", "sn", "ip", "conn_status"].
+      - Used with object = device or custom. The FortiManager only sends back these attributes, which keeps the
+        responses of large tables small. All attributes are returned when left blank.
+    required: false
+    version_added: "2.9"
+
   device_ip:
     description:
       - The IP of the device you want to query.
@@ -105,6 +121,13 @@ EXAMPLES = '''
     object: "device"
     device_serial: "FGVM000000117992"
 
+- name: QUERY ONLY THE NAME, SERIAL, IP AND CONNECTION STATUS OF A FORTIGATE DEVICE
+  fmgr_query:
+    adom: "ansible"
+    object: "device"
+    device_ip: "10.7.220.41"
+    fields: ["name", "sn", "ip", "conn_status"]
+
 - name: QUERY FORTIGATE DEVICE BY FRIENDLY NAME
   fmgr_query:
     adom: "ansible"
@@ -130,6 +153,13 @@ EXAMPLES = '''
     object: "custom"
     custom_endpoint: "/dvmdb/adom/ansible/script"
     custom_dict: { "type": "cli" }
+
+- name: READ A LARGE ADDRESS TABLE IN PAGES OF 2000
+  fmgr_query:
+    adom: "ansible"
+    object: "custom"
+    custom_endpoint: "/pm/config/adom/ansible/obj/firewall/address"
+    page_size: 2000
 '''
 
 RETURN = """
@@ -160,12 +190,24 @@ def fmgr_get_custom(fmgr, paramgram):
     """
     # IF THE CUSTOM DICTIONARY (OFTEN CONTAINING FILTERS) IS DEFINED CREATED THAT
     if paramgram["custom_dict"] is not None:
-        datagram = paramgram["custom_dict"]
+        datagram = dict(paramgram["custom_dict"])
     else:
         datagram = dict()
+    # ONLY ASK FOR THE REQUESTED ATTRIBUTES
+    if paramgram["fields"]:
+        datagram["fields"] = paramgram["fields"]
 
     # SET THE CUSTOM ENDPOINT PROVIDED
     url = paramgram["custom_endpoint"]
+    # WALK LARGE TABLES PAGE BY PAGE INSTEAD OF IN ONE RESPONSE
+    if paramgram["page_size"]:
+        objects = list()
+        try:
+            for page in fmgr.iter_pages(url, datagram, page_size=paramgram["page_size"]):
+                objects.extend(page)
+        except FMGBaseException as err:
+            return 1, {"status": {"code": 1, "message": str(err)}}
+        return 0, objects
     # MAKE THE CALL AND RETURN RESULTS
     response = fmgr.process_request(url, datagram, FMGRMethods.GET)
     return response
@@ -235,6 +277,8 @@ def fmgr_get_device(fmgr, paramgram):
         datagram = {
             "filter": ["sn", "==", paramgram["device_serial"]]
         }
+        if paramgram["fields"]:
+            datagram["fields"] = paramgram["fields"]
         response = fmgr.process_request(url, datagram, FMGRMethods.GET)
         if len(response[1]) >= 0:
             device_found = 1
@@ -244,6 +288,8 @@ def fmgr_get_device(fmgr, paramgram):
         datagram = {
             "filter": ["name", "==", paramgram["device_unique_name"]]
         }
+        if paramgram["fields"]:
+            datagram["fields"] = paramgram["fields"]
         response = fmgr.process_request(url, datagram, FMGRMethods.GET)
         if len(response[1]) >= 0:
             device_found = 1
@@ -253,6 +299,8 @@ def fmgr_get_device(fmgr, paramgram):
         datagram = {
             "filter": ["ip", "==", paramgram["device_ip"]]
         }
+        if paramgram["fields"]:
+            datagram["fields"] = paramgram["fields"]
         response = fmgr.process_request(url, datagram, FMGRMethods.GET)
         if len(response[1]) >= 0:
             device_found = 1
@@ -277,7 +325,10 @@ def fmgr_get_cluster_nodes(fmgr, paramgram):
     url = ""
     datagram = {}
     # USE THE DEVICE METHOD TO GET THE CLUSTER INFORMATION SO WE CAN SEE THE HA_SLAVE NODES
-    response = fmgr_get_device(fmgr, paramgram)
+    # ONLY THE NAME AND SERIAL OF THE CLUSTER ARE NEEDED. HA_SLAVE IS A SUB-OBJECT, WHICH THE PROJECTION DOESN'T DROP
+    cluster_paramgram = dict(paramgram)
+    cluster_paramgram["fields"] = paramgram["fields"] or ["name", "sn"]
+    response = fmgr_get_device(fmgr, cluster_paramgram)
     # CHECK FOR HA_SLAVE NODES, IF CLUSTER IS MISSING COMPLETELY THEN QUIT
     try:
         returned_nodes = response[1][0]["ha_slave"]
@@ -335,6 +386,8 @@ def main():
         object=dict(required=True, type="str", choices=["device", "cluster_nodes", "task", "custom"]),
         custom_endpoint=dict(required=False, type="str"),
         custom_dict=dict(required=False, type="dict"),
+        page_size=dict(required=False, type="int"),
+        fields=dict(required=False, type="list"),
         device_ip=dict(required=False, type="str"),
         device_unique_name=dict(required=False, type="str"),
         device_serial=dict(required=False, type="str"),
@@ -352,7 +405,9 @@ def main():
         "nodes": module.params["nodes"],
         "task_id": module.params["task_id"],
         "custom_endpoint": module.params["custom_endpoint"],
-        "custom_dict": module.params["custom_dict"]
+        "custom_dict": module.params["custom_dict"],
+        "page_size": module.params["page_size"],
+        "fields": module.params["fields"],
     }
     module.paramgram = paramgram
     fmgr = None
@@ -100,6 +100,23 @@ options:
       - Number of times to query FortiManager to check if the script has finished or not, before unlocking the ADOM.
     required: false
     default: 150
+
+  async_task:
+    description:
+      - Only applies to mode execute when FortiManager is in Workspace Mode, where the module otherwise waits for
+        the script to finish before it commits and unlocks the ADOM.
+      - When true, a script with the remote_device target returns its task ID as soon as it has started, so
+        scripts against different devices can run at the same time. Wait for them with the fmgr_task_wait module.
+      - Scripts against the ADOM or device database fail if the ADOM is unlocked while they run, so for them this
+        is ignored and the module still waits, keeping the ADOM locked. Honouring it costs one extra request to
+        look up the target of the script.
+      - Without Workspace Mode the module never waits for the task, whether this is set or not.
+      - Either way the task ID is returned under results.task, i.e. "{{ script.results.task }}" for a task
+        registered as script.
+    required: false
+    type: bool
+    default: false
+    version_added: 2.9
 '''
 
 EXAMPLES = '''
@@ -119,6 +136,21 @@ EXAMPLES = '''
     mode: "execute"
     script_scope: "FGT1,FGT2"
 
+- name: EXECUTE SCRIPT WITHOUT WAITING FOR IT
+  fmgr_script:
+    adom: "root"
+    script_name: "TestScript"
+    mode: "execute"
+    script_scope: "FGT1,FGT2"
+    async_task: true
+  register: script
+
+- name: WAIT FOR THE SCRIPT
+  fmgr_task_wait:
+    adom: "root"
+    task_ids:
+      - "{{ script.results.task }}"
+
 - name: DELETE SCRIPT
   fmgr_script:
     adom: "root"
@@ -208,6 +240,18 @@ def execute_script(fmgr, paramgram):
         'scope': scope_list,
     }
 
+    if paramgram.get("async_task"):
+        # A SCRIPT AGAINST THE ADOM OR DEVICE DATABASE FAILS IF THE ADOM IS UNLOCKED BEFORE IT HAS FINISHED (SEE THE
+        # 7.29.19 FIX IN FORTIMANAGER.PY), SO ONLY REMOTE_DEVICE SCRIPTS ARE LEFT RUNNING. THE OTHERS ARE WAITED ON.
+        script = fmgr.process_request('/dvmdb/adom/{adom}/script/{script_name}'.format(
+            adom=paramgram["adom"], script_name=paramgram["script_name"]), {}, FMGRMethods.GET)
+        try:
+            target = script[1]["target"]
+        except (KeyError, TypeError):
+            target = None
+        if target != "remote_device":
+            paramgram["async_task"] = False
+
     url = '/dvmdb/adom/{adom}/script/execute'.format(adom=paramgram["adom"])
     response = fmgr.process_request(url, datagram, FMGRMethods.EXEC)
     return response
@@ -227,6 +271,7 @@ def main():
         script_package=dict(required=False, type="str"),
         retry_interval=dict(required=False, type="int", default=5),
         retry_count=dict(required=False, type="int", default=150),
+        async_task=dict(required=False, type="bool", default=False),
     )
 
     module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=False, )
@@ -243,6 +288,7 @@ def main():
         "mode": module.params["mode"],
         "retry_interval": module.params["retry_interval"],
         "retry_count": module.params["retry_count"],
+        "async_task": module.params["async_task"],
     }
     module.paramgram = paramgram
     fmgr = None
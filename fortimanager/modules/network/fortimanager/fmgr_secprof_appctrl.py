@@ -354,8 +354,7 @@ from ansible.module_utils.network.fortimanager.common import FMGBaseException
 from ansible.module_utils.network.fortimanager.common import FMGRCommon
 from ansible.module_utils.network.fortimanager.common import DEFAULT_RESULT_OBJ
 from ansible.module_utils.network.fortimanager.common import FAIL_SOCKET_MSG
-from ansible.module_utils.network.fortimanager.common import prepare_dict
-from ansible.module_utils.network.fortimanager.common import scrub_dict
+from ansible.module_utils.network.fortimanager.common import prepare_and_scrub_dict
 
 ###############
 # START METHODS
@@ -382,7 +381,7 @@ def fmgr_application_list_modify(fmgr, paramgram):
     # EVAL THE MODE PARAMETER FOR SET OR ADD
     if paramgram["mode"] in ['set', 'add', 'update']:
         url = '/pm/config/adom/{adom}/obj/application/list'.format(adom=paramgram["adom"])
-        datagram = scrub_dict(prepare_dict(paramgram))
+        datagram = prepare_and_scrub_dict(paramgram)
 
     # EVAL THE MODE PARAMETER FOR DELETE
     elif paramgram["mode"] == "delete":
@@ -983,8 +983,7 @@ from ansible.module_utils.network.fortimanager.common import FMGBaseException
 from ansible.module_utils.network.fortimanager.common import FMGRCommon
 from ansible.module_utils.network.fortimanager.common import DEFAULT_RESULT_OBJ
 from ansible.module_utils.network.fortimanager.common import FAIL_SOCKET_MSG
-from ansible.module_utils.network.fortimanager.common import prepare_dict
-from ansible.module_utils.network.fortimanager.common import scrub_dict
+from ansible.module_utils.network.fortimanager.common import prepare_and_scrub_dict
 
 ###############
 # START METHODS
@@ -1008,7 +1007,7 @@ def fmgr_antivirus_profile_modify(fmgr, paramgram):
     # EVAL THE MODE PARAMETER FOR SET OR ADD
     if mode in ['set', 'add', 'update']:
         url = '/pm/config/adom/{adom}/obj/antivirus/profile'.format(adom=adom)
-        datagram = scrub_dict(prepare_dict(paramgram))
+        datagram = prepare_and_scrub_dict(paramgram)
 
     # EVAL THE MODE PARAMETER FOR DELETE
     else:
@@ -1016,7 +1015,7 @@ def fmgr_antivirus_profile_modify(fmgr, paramgram):
         url = '/pm/config/adom/{adom}/obj/antivirus/profile/{name}'.format(adom=adom, name=paramgram["name"])
         datagram = {}
 
-    response = fmgr.process_request(url, datagram, paramgram["mode"])
+    response = fmgr.process_request_if_changed(url, datagram, paramgram["mode"])
     return response
 
 #############
@@ -0,0 +1,185 @@
+#!/usr/bin/python
+#
+# This file is part of Ansible
+#
+# Ansible is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Ansible is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Ansible.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+ANSIBLE_METADATA = {
+    "metadata_version": "1.1",
+    "status": ["preview"],
+    "supported_by": "community"
+}
+
+DOCUMENTATION = '''
+---
+module: fmgr_task_wait
+version_added: "2.9"
+notes:
+    - Full Documentation at U(https://ftnt-ansible-docs.readthedocs.io/en/latest/).
+author: Luke Weighall (@lweighall)
+short_description: Waits for one or more FortiManager tasks to finish.
+description:
+  - Waits for all of the given FortiManager tasks together, such as the installs and script runs started by
+    fmgr_fwpol_package, fmgr_device_config and fmgr_script with async_task enabled.
+  - All pending tasks are checked with a single query per poll, and the interval between polls backs off from half
+    a second up to I(retry_interval).
+  - Returns the status and the per-device line logs of every task. Fails if any task reported errors.
+
+options:
+  adom:
+    description:
+      - The ADOM the tasks were started in.
+    required: false
+    default: root
+
+  task_ids:
+    description:
+      - The IDs of the tasks to wait for. Modules that start a task return its ID under results.task.
+    required: true
+    type: list
+
+  retry_interval:
+    description:
+      - Maximum number of seconds to wait between two queries of the task status.
+    required: false
+    default: 5
+
+  retry_count:
+    description:
+      - Together with I(retry_interval), sets how long to wait in total (retry_interval * retry_count seconds)
+        before giving up.
+    required: false
+    default: 150
+'''
+
+EXAMPLES = '''
+- name: INSTALL THE PACKAGE WITHOUT WAITING
+  fmgr_fwpol_package:
+    adom: "ansible"
+    mode: "install"
+    name: "ansibleTestPackage1"
+    object_type: "pkg"
+    async_task: true
+  register: install
+
+- name: RUN A SCRIPT WITHOUT WAITING
+  fmgr_script:
+    adom: "ansible"
+    script_name: "TestScript"
+    mode: "execute"
+    script_scope: "FGT1,FGT2"
+    async_task: true
+  register: script
+
+- name: WAIT FOR BOTH
+  fmgr_task_wait:
+    adom: "ansible"
+    task_ids:
+      - "{{ install.results.task }}"
+      - "{{ script.results.task }}"
+'''
+
+RETURN = """
+api_result:
+  description: full API response, includes status code and message
+  returned: always
+  type: str
+tasks:
+  description: The last status of every task, in the order of task_ids, with its line logs under "lines".
+  returned: always
+  type: list
+"""
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.connection import Connection
+from ansible.module_utils.network.fortimanager.fortimanager import FortiManagerHandler
+from ansible.module_utils.network.fortimanager.common import FMGBaseException
+from ansible.module_utils.network.fortimanager.common import FMGRCommon
+from ansible.module_utils.network.fortimanager.common import DEFAULT_RESULT_OBJ
+from ansible.module_utils.network.fortimanager.common import FAIL_SOCKET_MSG
+
+
+def fmgr_task_wait(fmgr, paramgram):
+    """
+    :param fmgr: The fmgr object instance from fortimanager.py
+    :type fmgr: class object
+    :param paramgram: The formatted dictionary of options to process
+    :type paramgram: dict
+    :return: The response from the FortiManager
+    :rtype: dict
+    """
+    task_ids = paramgram["task_ids"]
+    tasks = fmgr.wait_for_tasks(task_ids, adom=paramgram["adom"], max_interval=paramgram["retry_interval"],
+                                timeout=paramgram["retry_interval"] * paramgram["retry_count"])
+    lines = fmgr.get_task_lines(task_ids)
+
+    task_results = list()
+    failed_tasks = list()
+    for task_id in task_ids:
+        task = dict(tasks.get(task_id, {"id": task_id}))
+        task["lines"] = lines.get(task_id, [])
+        if task.get("num_err"):
+            failed_tasks.append(task_id)
+        task_results.append(task)
+
+    if failed_tasks:
+        msg = "Task(s) " + str(failed_tasks) + " finished with errors."
+        response = (1, {"status": {"code": 1, "message": msg}, "tasks": task_results})
+    else:
+        response = (0, {"status": {"code": 0, "message": "All tasks finished."}, "tasks": task_results})
+    return response
+
+
+def main():
+    argument_spec = dict(
+        adom=dict(required=False, type="str", default="root"),
+        task_ids=dict(required=True, type="list"),
+        retry_interval=dict(required=False, type="int", default=5),
+        retry_count=dict(required=False, type="int", default=150),
+    )
+
+    module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=False, )
+    paramgram = {
+        "adom": module.params["adom"],
+        "task_ids": [int(task_id) for task_id in module.params["task_ids"]],
+        "retry_interval": module.params["retry_interval"],
+        "retry_count": module.params["retry_count"],
+    }
+    module.paramgram = paramgram
+    fmgr = None
+    if module._socket_path:
+        connection = Connection(module._socket_path)
+        fmgr = FortiManagerHandler(connection, module)
+        fmgr.tools = FMGRCommon()
+    else:
+        module.fail_json(**FAIL_SOCKET_MSG)
+
+    results = DEFAULT_RESULT_OBJ
+    try:
+        results = fmgr_task_wait(fmgr, paramgram)
+        fmgr.govern_response(module=module, results=results, changed=False,
+                             ansible_facts=fmgr.construct_ansible_facts(results, module.params, paramgram))
+
+    except Exception as err:
+        raise FMGBaseException(err)
+
+    return module.exit_json(**results[1])
+
+
+if __name__ == "__main__":
+    main()
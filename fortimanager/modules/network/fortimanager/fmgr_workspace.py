@@ -0,0 +1,187 @@
+#!/usr/bin/python
+#
+# This file is part of Ansible
+#
+# Ansible is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Ansible is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Ansible.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+ANSIBLE_METADATA = {
+    "metadata_version": "1.1",
+    "status": ["preview"],
+    "supported_by": "community"
+}
+
+DOCUMENTATION = '''
+---
+module: fmgr_workspace
+version_added: "2.9"
+notes:
+    - Full Documentation at U(https://ftnt-ansible-docs.readthedocs.io/en/latest/).
+    - Intended for use with the I(deferred_commit) option of the fortimanager httpapi plugin
+      (ansible_httpapi_fmgr_deferred_commit), where the other modules stop committing after each write.
+author: Luke Weighall (@lweighall)
+short_description: Locks, commits, unlocks or discards a FortiManager workspace.
+description:
+  - Controls the workspace of an ADOM when FortiManager workspace mode is enabled, so a play can lock an ADOM once,
+    run many tasks against it, and commit all of their changes with a single commit at the end.
+  - Does nothing when workspace mode is disabled on the FortiManager.
+
+options:
+  adom:
+    description:
+      - The ADOM whose workspace should be controlled.
+    required: false
+    default: root
+  action:
+    description:
+      - C(lock) locks the ADOM and holds the lock for the rest of the play. Requires I(deferred_commit).
+      - C(commit) commits the changes made to the ADOM. The ADOM stays locked.
+      - C(unlock) releases the lock. Fails if the ADOM still has uncommitted changes.
+      - C(discard) releases the lock without committing, so the uncommitted changes are discarded.
+    required: true
+    choices: ["lock", "commit", "unlock", "discard"]
+'''
+
+EXAMPLES = '''
+- name: LOCK THE ADOM FOR THE PLAY
+  fmgr_workspace:
+    adom: "ansible"
+    action: "lock"
+
+- name: COMMIT EVERYTHING THE PLAY CHANGED
+  fmgr_workspace:
+    adom: "ansible"
+    action: "commit"
+
+- name: RELEASE THE ADOM
+  fmgr_workspace:
+    adom: "ansible"
+    action: "unlock"
+
+- name: THROW AWAY THE UNCOMMITTED CHANGES
+  fmgr_workspace:
+    adom: "ansible"
+    action: "discard"
+'''
+
+RETURN = """
+api_result:
+  description: full API response, includes status code and message
+  returned: always
+  type: str
+"""
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.connection import Connection
+from ansible.module_utils.network.fortimanager.fortimanager import FortiManagerHandler
+from ansible.module_utils.network.fortimanager.common import FMGBaseException
+from ansible.module_utils.network.fortimanager.common import FMGRCommon
+from ansible.module_utils.network.fortimanager.common import DEFAULT_RESULT_OBJ
+from ansible.module_utils.network.fortimanager.common import FAIL_SOCKET_MSG
+
+
+def fmgr_workspace_lock(fmgr, paramgram):
+    """
+    :param fmgr: The fmgr object instance from fortimanager.py
+    :type fmgr: class object
+    :param paramgram: The formatted dictionary of options to process
+    :type paramgram: dict
+    :return: The response from the FortiManager
+    :rtype: dict
+    """
+    return fmgr.lock_adom(adom=paramgram["adom"])
+
+
+def fmgr_workspace_commit(fmgr, paramgram):
+    """
+    :param fmgr: The fmgr object instance from fortimanager.py
+    :type fmgr: class object
+    :param paramgram: The formatted dictionary of options to process
+    :type paramgram: dict
+    :return: The response from the FortiManager
+    :rtype: dict
+    """
+    return fmgr.commit_changes(adom=paramgram["adom"])
+
+
+def fmgr_workspace_unlock(fmgr, paramgram):
+    """
+    :param fmgr: The fmgr object instance from fortimanager.py
+    :type fmgr: class object
+    :param paramgram: The formatted dictionary of options to process
+    :type paramgram: dict
+    :return: The response from the FortiManager
+    :rtype: dict
+    """
+    return fmgr.unlock_adom(adom=paramgram["adom"])
+
+
+def main():
+    argument_spec = dict(
+        adom=dict(required=False, type="str", default="root"),
+        action=dict(required=True, type="str", choices=["lock", "commit", "unlock", "discard"]),
+    )
+
+    module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=False, )
+    paramgram = {
+        "adom": module.params["adom"],
+        "action": module.params["action"],
+    }
+    module.paramgram = paramgram
+    fmgr = None
+    if module._socket_path:
+        connection = Connection(module._socket_path)
+        fmgr = FortiManagerHandler(connection, module)
+        fmgr.tools = FMGRCommon()
+    else:
+        module.fail_json(**FAIL_SOCKET_MSG)
+
+    if not fmgr.uses_workspace:
+        module.exit_json(msg="Workspace mode is disabled on the FortiManager. Nothing to do.", changed=False,
+                         skipped=True)
+
+    adom = paramgram["adom"]
+    action = paramgram["action"]
+    if action == "lock" and not fmgr.deferred_commit:
+        module.fail_json(msg="Holding a lock across tasks requires the deferred_commit option of the fortimanager "
+                             "httpapi plugin (ansible_httpapi_fmgr_deferred_commit).")
+    if action == "lock" and fmgr.is_adom_held(adom):
+        module.exit_json(msg="ADOM " + adom + " is already locked by this play.", changed=False)
+    if action == "commit" and fmgr.is_adom_held(adom) and not fmgr.is_adom_dirty(adom):
+        module.exit_json(msg="ADOM " + adom + " has no uncommitted changes.", changed=False)
+    if action == "unlock" and fmgr.is_adom_dirty(adom):
+        module.fail_json(msg="ADOM " + adom + " has uncommitted changes. Use action commit or discard first.")
+
+    results = DEFAULT_RESULT_OBJ
+    try:
+        if action == "lock":
+            results = fmgr_workspace_lock(fmgr, paramgram)
+        elif action == "commit":
+            results = fmgr_workspace_commit(fmgr, paramgram)
+        elif action in ["unlock", "discard"]:
+            results = fmgr_workspace_unlock(fmgr, paramgram)
+        fmgr.govern_response(module=module, results=results, changed_if_success=True,
+                             ansible_facts=fmgr.construct_ansible_facts(results, module.params, paramgram))
+
+    except Exception as err:
+        raise FMGBaseException(err)
+
+    return module.exit_json(**results[1])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,2 @@
+#!/bin/bash
+ansible-playbook fmgr_bulk_addresses.yml -vvvv
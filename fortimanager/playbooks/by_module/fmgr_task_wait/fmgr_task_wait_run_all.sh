@@ -0,0 +1,2 @@
+#!/bin/bash
+ansible-playbook fmgr_task_wait_install.yml -vvvv
@@ -0,0 +1,3 @@
+#!/bin/bash
+ansible-playbook fmgr_workspace_deferred_commit.yml -vvvv
+ansible-playbook fmgr_workspace_discard.yml -vvvv
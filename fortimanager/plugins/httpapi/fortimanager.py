@@ -31,18 +31,157 @@ short_description: HttpApi Plugin for Fortinet FortiManager Appliance or VM.
 description:
   - This HttpApi plugin provides methods to connect to Fortinet FortiManager Appliance or VM via JSON RPC API.
 version_added: "2.8"
+options:
+  session_cache:
+    description:
+      - Stores the session ID and the inspected workspace/ADOM state on disk, keyed by host and user, so that new
+        persistent connections can skip the login handshake.
+      - A cached session is verified with a single sys/status call. If that fails, a full login is performed.
+      - While enabled, the session is not logged out when the persistent connection closes, so it can be reused.
+    type: boolean
+    default: False
+    env:
+      - name: ANSIBLE_FMGR_SESSION_CACHE
+    vars:
+      - name: ansible_httpapi_fmgr_session_cache
+  session_cache_path:
+    description:
+      - Directory the cached sessions are written to. Files are created readable by the owner only.
+    type: path
+    default: ~/.ansible/fmgr_session_cache
+    env:
+      - name: ANSIBLE_FMGR_SESSION_CACHE_PATH
+    vars:
+      - name: ansible_httpapi_fmgr_session_cache_path
+  debug:
+    description:
+      - Adds the per-URL request latency and payload-size statistics collected by the plugin to the ansible facts
+        returned by modules.
+    type: boolean
+    default: False
+    env:
+      - name: ANSIBLE_FMGR_DEBUG
+    vars:
+      - name: ansible_httpapi_fmgr_debug
+  cassette_mode:
+    description:
+      - When set to C(record), every JSON-RPC request/response pair handled by the plugin is appended to
+        I(cassette_path).
+      - When set to C(replay), the recorded responses are served from I(cassette_path) without contacting the
+        FortiManager. Useful to benchmark and debug modules offline and deterministically.
+      - Passwords and session IDs are masked before anything is written to the cassette.
+    type: string
+    choices: ['off', 'record', 'replay']
+    default: 'off'
+    env:
+      - name: ANSIBLE_FMGR_CASSETTE_MODE
+    vars:
+      - name: ansible_httpapi_fmgr_cassette_mode
+  cassette_path:
+    description:
+      - Path of the cassette file used by I(cassette_mode).
+    type: path
+    env:
+      - name: ANSIBLE_FMGR_CASSETTE_PATH
+    vars:
+      - name: ansible_httpapi_fmgr_cassette_path
+  request_retries:
+    description:
+      - Number of times a request is retried after a transient failure.
+      - GET requests are retried on connection resets, timeouts and HTTP 502/503/504 responses. Other methods
+        are only retried when the connection couldn't be established, so the request never reached the
+        FortiManager.
+      - An expired session (code -11) triggers one silent re-login, after which the request is sent again.
+    type: int
+    default: 2
+    env:
+      - name: ANSIBLE_FMGR_REQUEST_RETRIES
+    vars:
+      - name: ansible_httpapi_fmgr_request_retries
+  request_retry_backoff:
+    description:
+      - Base backoff in seconds between retries. It doubles with each attempt and is randomly jittered.
+    type: float
+    default: 1.0
+    env:
+      - name: ANSIBLE_FMGR_REQUEST_RETRY_BACKOFF
+    vars:
+      - name: ansible_httpapi_fmgr_request_retry_backoff
+  request_retry_max_backoff:
+    description:
+      - Upper bound in seconds of the backoff between retries.
+    type: float
+    default: 30.0
+    env:
+      - name: ANSIBLE_FMGR_REQUEST_RETRY_MAX_BACKOFF
+    vars:
+      - name: ansible_httpapi_fmgr_request_retry_max_backoff
+  deferred_commit:
+    description:
+      - In workspace mode, modules don't commit after each write. The written ADOMs stay locked for the lifetime of
+        the persistent connection and are tracked as dirty, so a play can commit them once at the end with the
+        fmgr_workspace module.
+      - ADOMs that are still locked when the connection closes are unlocked without committing, which discards
+        their uncommitted changes.
+    type: boolean
+    default: False
+    env:
+      - name: ANSIBLE_FMGR_DEFERRED_COMMIT
+    vars:
+      - name: ansible_httpapi_fmgr_deferred_commit
+  get_cache_ttl:
+    description:
+      - Seconds a GET response is cached in the persistent connection, keyed by the URL and parameters. C(0)
+        disables the cache.
+      - Writes invalidate the cached entries of the written URL, its parents and its children. Any exec outside of
+        the workspace lock/commit calls clears the whole cache. Task status and sys/status are never cached.
+      - The hit and miss counters are returned in the ansible facts of every module, under get_cache.
+    type: float
+    default: 0
+    env:
+      - name: ANSIBLE_FMGR_GET_CACHE_TTL
+    vars:
+      - name: ansible_httpapi_fmgr_get_cache_ttl
+  facts_mode:
+    description:
+      - Controls the ansible facts returned by modules. C(full) returns the scrubbed module parameters, the
+        paramgram and the system status of the connected FortiManager. C(minimal) only returns the response and
+        the module parameters, and skips the scrubbing.
+    type: string
+    choices: ['full', 'minimal']
+    default: 'full'
+    env:
+      - name: ANSIBLE_FMGR_FACTS_MODE
+    vars:
+      - name: ansible_httpapi_fmgr_facts_mode
 """
 
+import hashlib
 import json
+import os
+import re
+import time
+from io import BytesIO
 from ansible.plugins.httpapi import HttpApiBase
+from ansible.module_utils.basic import to_bytes
 from ansible.module_utils.basic import to_text
 from ansible.module_utils.network.fortimanager.common import BASE_HEADERS
+from ansible.module_utils.network.fortimanager.common import FMGRCassette
+from ansible.module_utils.network.fortimanager.common import FMGR_BATCH_SIZE
 from ansible.module_utils.network.fortimanager.common import FMGBaseException
 from ansible.module_utils.network.fortimanager.common import FMGRCommon
+from ansible.module_utils.network.fortimanager.common import FMGRGetCache
+from ansible.module_utils.network.fortimanager.common import FMGRJSONCodec
 from ansible.module_utils.network.fortimanager.common import FMGRMethods
+from ansible.module_utils.network.fortimanager.common import FMGRRequestStats
+from ansible.module_utils.network.fortimanager.common import FMGRRetryPolicy
 
 
 class HttpApi(HttpApiBase):
+    # THE WORKSPACE ACTION OF A REQUEST URL, AND THE ADOM A REQUEST URL BELONGS TO
+    WORKSPACE_ACTION_URL = re.compile(r"/workspace/(lock|unlock|commit)/?$")
+    ADOM_URL = re.compile(r"(?:^|/)(?:adom/([^/]+)|(global))(?:/|$)")
+
     def __init__(self, connection):
         super(HttpApi, self).__init__(connection)
         self._req_id = 0
@@ -63,6 +202,15 @@ class HttpApi(HttpApiBase):
         self._uses_adoms = False
         self._adom_list = list()
         self._logged_in_user = None
+        self._mode_checked = False
+        self._request_stats = FMGRRequestStats()
+        self._cassette = None
+        self._retry_policy = FMGRRetryPolicy()
+        self._retry_log = list()
+        self._deferred_commit = False
+        self._held_adoms = dict()
+        self._session_locks = dict()
+        self._get_cache = FMGRGetCache()
 
     def set_become(self, become_context):
         """
@@ -91,12 +239,24 @@ class HttpApi(HttpApiBase):
         :return: Dictionary of status, if it logged in or not.
         """
         self._logged_in_user = username
+        self.debug = self._get_plugin_option("debug", False)
+        cassette_mode = self._get_plugin_option("cassette_mode", "off")
+        if cassette_mode != "off":
+            self._cassette = FMGRCassette(self._get_plugin_option("cassette_path"), cassette_mode)
+        self._retry_policy = FMGRRetryPolicy(retries=self._get_plugin_option("request_retries", 2),
+                                             backoff=self._get_plugin_option("request_retry_backoff", 1.0),
+                                             max_backoff=self._get_plugin_option("request_retry_max_backoff", 30.0))
+        self._deferred_commit = self._get_plugin_option("deferred_commit", False)
+        self._get_cache = FMGRGetCache(self._get_plugin_option("get_cache_ttl", 0))
+        if self._restore_cached_session():
+            return
         self.send_request(FMGRMethods.EXEC, self._tools.format_request(FMGRMethods.EXEC, "sys/login/user",
                                                                        passwd=password, user=username, ))
 
         if "FortiManager object connected to FortiManager" in self.__str__():
             # If Login worked, then inspect the FortiManager for Workspace Mode, and it's system information.
             self.inspect_fmgr()
+            self._save_cached_session()
             return
         else:
             raise FMGBaseException(msg="Unknown error while logging in...connection was lost during login operation...."
@@ -132,11 +292,126 @@ class HttpApi(HttpApiBase):
             if self.uses_workspace:
                 self.get_lock_info()
                 self.run_unlock()
+                # ADOMS HELD FOR A DEFERRED COMMIT THAT NOBODY COMMITTED ARE RELEASED, DISCARDING THEIR CHANGES
+                for adom in list(self._held_adoms):
+                    self.unlock_adom(adom)
+            if self._get_plugin_option("session_cache", False):
+                # LEAVE THE SESSION OPEN ON THE FORTIMANAGER SO THE NEXT CONNECTION CAN REUSE IT FROM THE CACHE
+                return None
             ret_code, response = self.send_request(FMGRMethods.EXEC,
                                                    self._tools.format_request(FMGRMethods.EXEC, "sys/logout"))
             self.sid = None
             return ret_code, response
 
+    def _get_plugin_option(self, option, default=None):
+        """
+        Returns the value of a plugin option, or the default if it isn't set or can't be read.
+        """
+        try:
+            value = self.get_option(option)
+        except Exception:
+            return default
+        if value is None:
+            return default
+        return value
+
+    def _session_cache_file(self):
+        """
+        Returns the path of the session cache file for the current host and user.
+        """
+        cache_dir = os.path.expanduser(self._get_plugin_option("session_cache_path", "~/.ansible/fmgr_session_cache"))
+        cache_key = to_text(self.connection._url) + "|" + to_text(self._logged_in_user)
+        return os.path.join(cache_dir, hashlib.sha256(cache_key.encode("utf-8")).hexdigest() + ".json")
+
+    def _save_cached_session(self):
+        """
+        Writes the session ID and the inspected workspace/ADOM state to the session cache, if enabled.
+        """
+        if not self._get_plugin_option("session_cache", False) or self.sid is None:
+            return
+        cache_file = self._session_cache_file()
+        cached = {
+            "sid": self.sid,
+            "uses_workspace": self.uses_workspace,
+            "uses_adoms": self.uses_adoms,
+            "adom_list": self._adom_list,
+        }
+        try:
+            cache_dir = os.path.dirname(cache_file)
+            if not os.path.isdir(cache_dir):
+                os.makedirs(cache_dir, 0o700)
+            fd = os.open(cache_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as cache:
+                json.dump(cached, cache)
+        except (IOError, OSError):
+            # THE CACHE IS ONLY AN OPTIMIZATION, SO A FAILED WRITE SHOULDN'T FAIL THE LOGIN
+            pass
+
+    def return_request_stats(self):
+        """
+        Returns the per-URL request statistics collected so far, if the debug option is enabled.
+
+        :return: dict
+        """
+        if not self.debug:
+            return None
+        stats = self._request_stats.summary()
+        stats["retries"] = self._retry_log
+        return stats
+
+    def return_get_cache_stats(self):
+        """
+        Returns the hit, miss and invalidation counters of the GET cache, if it is enabled.
+
+        :return: dict
+        """
+        if not self._get_cache.enabled:
+            return None
+        return self._get_cache.summary()
+
+    def _restore_cached_session(self):
+        """
+        Tries to reuse a cached session. The session is verified with a single sys/status call.
+
+        :return: True if the cached session was restored, False if a full login is required.
+        :rtype: bool
+        """
+        if not self._get_plugin_option("session_cache", False):
+            return False
+        cache_file = self._session_cache_file()
+        try:
+            with open(cache_file, "r") as cache:
+                cached = json.load(cache)
+        except (IOError, OSError, ValueError):
+            return False
+
+        self.sid = cached.get("sid")
+        try:
+            status = self.get_system_status()
+        except Exception:
+            status = (None, None)
+        if self.sid is None or status[0] != 0:
+            self.sid = None
+            try:
+                os.remove(cache_file)
+            except (IOError, OSError):
+                pass
+            return False
+
+        self.uses_workspace = cached.get("uses_workspace", False)
+        self.uses_adoms = cached.get("uses_adoms", False)
+        self._adom_list = cached.get("adom_list", list())
+        self._mode_checked = True
+        try:
+            self._connected_fmgr = status[1]
+            self._host = self._connected_fmgr["Hostname"]
+            # LOCKS MAY HAVE CHANGED SINCE THE SESSION WAS CACHED, SO THEY ARE ALWAYS RE-READ
+            if self.uses_workspace:
+                self.get_locked_adom_list()
+        except BaseException:
+            pass
+        return True
+
     def send_request(self, method, params):
         """
         Responsible for actual sending of data to the connection httpapi base plugin. Does some formatting too.
@@ -147,6 +422,111 @@ class HttpApi(HttpApiBase):
 
         :return: Dictionary of status, if it logged in or not.
         """
+        if method == FMGRMethods.GET:
+            cached = self._get_cache.get(params)
+            if cached is not None:
+                return cached
+        self._check_connection(params)
+        try:
+            result = self._send_jsonrpc(method, params)
+            response = self._handle_response(result)
+        except Exception as err:
+            raise FMGBaseException(err)
+        if method == FMGRMethods.GET:
+            self._get_cache.store(params, response)
+        else:
+            self._track_session_locks(method, params[0].get("url", ""), response[0])
+        return response
+
+    def send_batch(self, requests, chunk_size=FMGR_BATCH_SIZE):
+        """
+        Packs many operations into as few JSON-RPC round trips as possible. Consecutive operations sharing the same
+        method are sent together in one "params" list, and each result[i] is mapped back to its caller.
+        Order is preserved, so a write followed by a read of the same object still behaves as expected.
+
+        :param requests: A list of (method, url, datagram) entries. The datagram may be empty or None.
+        :type requests: list
+        :param chunk_size: The maximum number of operations to place in a single JSON-RPC request.
+        :type chunk_size: int
+
+        :return: A list of (code, data) tuples, one per request, in the same order as the requests.
+        :rtype: list
+        """
+        if not requests:
+            return list()
+        chunk_size = max(int(chunk_size), 1)
+        batches = list()
+        for method, url, datagram in requests:
+            params = self._tools.format_request(method, url, **(datagram or {}))
+            if batches and batches[-1][0] == method and len(batches[-1][1]) < chunk_size:
+                batches[-1][1].extend(params)
+            else:
+                batches.append((method, params))
+
+        self._check_connection(batches[0][1])
+        results = list()
+        try:
+            for method, params in batches:
+                response = self._send_jsonrpc(method, params)
+                self._set_sid(response)
+                response_results = response["result"]
+                if not isinstance(response_results, list):
+                    response_results = [response_results]
+                if len(response_results) != len(params):
+                    raise FMGBaseException(msg="Batched request returned " + to_text(len(response_results)) +
+                                               " results for " + to_text(len(params)) + " operations.")
+                for result in response_results:
+                    results.append(self._parse_result(result))
+        except FMGBaseException:
+            raise
+        except Exception as err:
+            raise FMGBaseException(err)
+        for request, result in zip(requests, results):
+            self._track_session_locks(request[0], request[1], result[0])
+        return results
+
+    def handle_httperror(self, exc):
+        """
+        Raises the HTTP errors of a load balancer or proxy in front of a briefly unavailable FortiManager, so the
+        retry policy sees them. HttpApiBase would return them as the response, and their HTML body would then fail
+        to decode as JSON.
+
+        :param exc: The HTTPError raised by the connection.
+        :type exc: HTTPError
+
+        :return: False for the transient codes, otherwise what HttpApiBase returns.
+        """
+        if exc.code in FMGRRetryPolicy.TRANSIENT_HTTP_CODES:
+            return False
+        return super(HttpApi, self).handle_httperror(exc)
+
+    def _track_session_locks(self, method, url, code):
+        """
+        Keeps track of the ADOMs locked by this session, and of whether they have uncommitted writes, so a re-login
+        knows which workspace locks were lost with an expired session.
+        """
+        if code != 0 or method == FMGRMethods.GET or not self.uses_workspace:
+            return
+        match = self.ADOM_URL.search(to_text(url))
+        if match is None:
+            return
+        adom = match.group(1) or match.group(2)
+        action = self.WORKSPACE_ACTION_URL.search(to_text(url))
+        if action is None:
+            if adom in self._session_locks:
+                self._session_locks[adom] = True
+        elif action.group(1) == "lock":
+            self._session_locks[adom] = False
+        elif action.group(1) == "commit":
+            if adom in self._session_locks:
+                self._session_locks[adom] = False
+        else:
+            self._session_locks.pop(adom, None)
+
+    def _check_connection(self, params):
+        """
+        Opens the underlying connection if we don't have a session yet, unless we're in the middle of logging in.
+        """
         try:
             if self.sid is None and params[0]["url"] != "sys/login/user":
                 # If not connected, send connection request.
@@ -159,6 +539,32 @@ class HttpApi(HttpApiBase):
             raise FMGBaseException("An attempt was made at communicating with a FMG with "
                                    "no valid session and an unexpected error was discovered. \n Error: " + to_text(err))
 
+    def _post_jsonrpc(self, method, params):
+        """
+        Wraps the params list in a JSON-RPC envelope and sends it, retrying transient failures as allowed by the
+        retry policy. Returns the request payload and the raw response buffer.
+        """
+        if method != FMGRMethods.GET and self._get_cache.enabled:
+            for param in params:
+                self._get_cache.invalidate(method, param.get("url", ""))
+        attempt = 0
+        while True:
+            try:
+                return self._post_jsonrpc_once(method, params)
+            except Exception as err:
+                reason = self._retry_policy.retry_reason(method, err, attempt)
+                if reason is None:
+                    raise
+                delay = self._retry_policy.delay(attempt)
+                self._record_retry(method, params, attempt + 1, reason + ": " + to_text(err), delay)
+                time.sleep(delay)
+                attempt += 1
+
+    def _post_jsonrpc_once(self, method, params):
+        """
+        Wraps the params list in a JSON-RPC envelope and sends it once. Returns the request payload and the raw
+        response buffer.
+        """
         self._update_request_id()
         json_request = {
             "method": method,
@@ -167,17 +573,107 @@ class HttpApi(HttpApiBase):
             "id": self.req_id,
             "verbose": 1
         }
-        data = json.dumps(json_request, ensure_ascii=False).replace('\\\\', '\\')
-        try:
-            # Sending URL and Data in Unicode, per Ansible Specifications for Connection Plugins
+        data = FMGRJSONCodec.encode_request(json_request)
+        # Sending URL and Data in Unicode, per Ansible Specifications for Connection Plugins
+        start_time = time.time()
+        if self._cassette is not None and self._cassette.mode == "replay":
+            response_data = BytesIO(to_bytes(json.dumps(self._cassette.replay(method, params))))
+        else:
             response, response_data = self.connection.send(path=to_text(self._url), data=to_text(data),
                                                            headers=BASE_HEADERS)
-            # Get Unicode Response - Must convert from StringIO to unicode first so we can do a replace function below
-            result = json.loads(to_text(response_data.getvalue()))
-            self._update_self_from_response(result, self._url, data)
-            return self._handle_response(result)
-        except Exception as err:
-            raise FMGBaseException(err)
+            if self._cassette is not None and self._cassette.mode == "record":
+                self._cassette.record(method, params, FMGRJSONCodec.decode_buffer(response_data))
+        self._record_request(method, params, data, response_data, time.time() - start_time)
+        return data, response_data
+
+    def _record_request(self, method, params, data, response_data, elapsed):
+        """
+        Records the latency and payload sizes of a request in the per-URL statistics.
+        """
+        try:
+            url = params[0]["url"]
+            if len(params) > 1:
+                url = "[batch] " + url
+            # SEEKING TO THE END GIVES THE SIZE WITHOUT COPYING THE BUFFER
+            position = response_data.tell()
+            response_data.seek(0, 2)
+            response_bytes = response_data.tell()
+            response_data.seek(position)
+            self._request_stats.record(method, to_text(url), elapsed, len(to_bytes(data)), response_bytes)
+        except Exception:
+            # STATISTICS ARE INFORMATIONAL ONLY AND MUST NEVER BREAK A REQUEST
+            pass
+
+    def _send_jsonrpc(self, method, params):
+        """
+        Wraps the params list in a JSON-RPC envelope, sends it, and returns the decoded response.
+        """
+        data, response_data = self._post_jsonrpc(method, params)
+        result = FMGRJSONCodec.decode_buffer(response_data)
+        if self._session_expired(result, params):
+            # THE SESSION TIMED OUT ON THE FORTIMANAGER, SO THE REQUEST WAS REJECTED. LOG IN AGAIN AND RESEND IT ONCE.
+            self._record_retry(method, params, 1, "session expired", 0)
+            self._relogin()
+            data, response_data = self._post_jsonrpc(method, params)
+            result = FMGRJSONCodec.decode_buffer(response_data)
+        self._update_self_from_response(result, self._url, data)
+        return result
+
+    def _session_expired(self, response, params):
+        """
+        Returns True if a response says our session is no longer valid, and a re-login may fix it.
+        """
+        if self.sid is None or self._cassette is not None or params[0]["url"] in ["sys/login/user", "sys/logout"]:
+            return False
+        try:
+            result = response["result"]
+            if isinstance(result, list):
+                result = result[0]
+            return result["status"]["code"] == -11
+        except (IndexError, KeyError, TypeError):
+            return False
+
+    def _relogin(self):
+        """
+        Replaces an expired session with a new one, without re-inspecting the FortiManager.
+        """
+        self.sid = None
+        params = self._tools.format_request(FMGRMethods.EXEC, "sys/login/user",
+                                            passwd=self.connection.get_option("password"), user=self._logged_in_user)
+        response = FMGRJSONCodec.decode_buffer(self._post_jsonrpc(FMGRMethods.EXEC, params)[1])
+        self._set_sid(response)
+        if self.sid is None:
+            raise FMGBaseException(msg="The session expired, and logging in again failed.")
+        self._save_cached_session()
+
+        # WORKSPACE LOCKS BELONG TO THE SESSION. CHANGES THE EXPIRED SESSION DIDN'T COMMIT ARE GONE, SO THAT MUST FAIL.
+        # LOCKS WITHOUT CHANGES ARE TAKEN AGAIN, SO THE NEXT WRITES DON'T RUN UNLOCKED
+        lost = sorted(adom for adom, uncommitted in self._session_locks.items() if uncommitted)
+        if lost:
+            self._session_locks = dict()
+            raise FMGBaseException(msg="The session expired with uncommitted changes in ADOM(s) " + ", ".join(lost) +
+                                       ". The changes were lost with the workspace lock. Run the tasks again.")
+        for adom in sorted(self._session_locks):
+            code, response = self.lock_adom(adom)
+            if code != 0:
+                raise FMGBaseException(msg="The session expired, and ADOM " + to_text(adom) +
+                                           " couldn't be locked again. Error: " + to_text(response))
+
+    def _record_retry(self, method, params, attempt, reason, delay):
+        """
+        Keeps a record of every retry and backoff, so they show up in the request statistics.
+        """
+        try:
+            url = to_text(params[0]["url"])
+        except (IndexError, KeyError, TypeError):
+            url = None
+        self._retry_log.append({
+            "method": method,
+            "url": url,
+            "attempt": attempt,
+            "reason": reason,
+            "backoff": delay,
+        })
 
     def _handle_response(self, response):
         self._set_sid(response)
@@ -185,6 +681,10 @@ class HttpApi(HttpApiBase):
             result = response["result"][0]
         else:
             result = response["result"]
+        return self._parse_result(result)
+
+    @staticmethod
+    def _parse_result(result):
         if "data" in result:
             return result["status"]["code"], result["data"]
         else:
@@ -218,6 +718,44 @@ class HttpApi(HttpApiBase):
         except Exception:
             raise FMGBaseException("Couldn't Retrieve Connected FMGR Stats")
 
+    def return_session_state(self):
+        """
+        Returns the workspace/ADOM state learned at login, so module handlers don't have to query it again.
+
+        :return: dict
+        """
+        if not self._mode_checked:
+            raise FMGBaseException("The workspace and ADOM mode haven't been determined for this session.")
+        return {
+            "uses_workspace": self.uses_workspace,
+            "uses_adoms": self.uses_adoms,
+            "adom_list": self._adom_list,
+            "debug": self.debug,
+            "deferred_commit": self._deferred_commit,
+            "held_adoms": self._held_adoms,
+            "get_cache": self._get_cache.enabled,
+            "facts_mode": self._get_plugin_option("facts_mode", "full"),
+            "connected_fmgr": self._connected_fmgr,
+        }
+
+    def mark_adom_dirty(self, adom):
+        """
+        Records that an ADOM held by this connection has uncommitted changes.
+        """
+        self._held_adoms[adom] = True
+
+    def mark_adom_clean(self, adom):
+        """
+        Records that an ADOM is held by this connection with no uncommitted changes, after a lock or a commit.
+        """
+        self._held_adoms[adom] = False
+
+    def release_adom(self, adom):
+        """
+        Stops tracking an ADOM that was unlocked by a module.
+        """
+        self._held_adoms.pop(adom, None)
+
     def get_system_status(self):
         """
         Returns the system status page from the FortiManager, for logging and other uses.
@@ -296,7 +834,7 @@ class HttpApi(HttpApiBase):
                                                                       url,
                                                                       fields=["workspace-mode", "adom-status"]))
         try:
-            if resp_obj["workspace-mode"] == "workflow":
+            if resp_obj["workspace-mode"] in ["workflow", "normal"]:
                 self.uses_workspace = True
             elif resp_obj["workspace-mode"] == "disabled":
                 self.uses_workspace = False
@@ -309,6 +847,7 @@ class HttpApi(HttpApiBase):
                 self.uses_adoms = False
         except KeyError:
             raise FMGBaseException(msg="Couldn't determine adom-status in the plugin")
+        self._mode_checked = True
 
     def run_unlock(self):
         """
@@ -348,6 +887,7 @@ class HttpApi(HttpApiBase):
         code, respobj = self.send_request(FMGRMethods.EXEC, self._tools.format_request(FMGRMethods.EXEC, url))
         if code == 0 and respobj["status"]["message"].lower() == "ok":
             self.remove_adom_from_lock_list(adom)
+            self.release_adom(adom)
         return code, respobj
 
     def commit_changes(self, adom=None, aux=False, *args, **kwargs):
@@ -366,10 +906,10 @@ class HttpApi(HttpApiBase):
             url = "/dvmdb/adom/root/workspace/commit"
         return self.send_request(FMGRMethods.EXEC, self._tools.format_request(FMGRMethods.EXEC, url))
 
-    def get_lock_info(self, adom=None):
+    @staticmethod
+    def _get_lock_info_url(adom=None):
         """
-        Gets ADOM lock info so it can be displayed with the error messages. Or if determined to be locked by ansible
-        for some reason, then unlock it.
+        Returns the lockinfo URL for an ADOM
         """
         if not adom or adom == "root":
             url = "/dvmdb/adom/root/workspace/lockinfo"
@@ -378,6 +918,14 @@ class HttpApi(HttpApiBase):
                 url = "/dvmdb/global/workspace/lockinfo/"
             else:
                 url = "/dvmdb/adom/{adom}/workspace/lockinfo/".format(adom=adom)
+        return url
+
+    def get_lock_info(self, adom=None):
+        """
+        Gets ADOM lock info so it can be displayed with the error messages. Or if determined to be locked by ansible
+        for some reason, then unlock it.
+        """
+        url = self._get_lock_info_url(adom)
         datagram = {}
         data = self._tools.format_request(FMGRMethods.GET, url, **datagram)
         resp_obj = self.send_request(FMGRMethods.GET, data)
@@ -417,17 +965,22 @@ class HttpApi(HttpApiBase):
 
     def get_locked_adom_list(self):
         """
-        Gets the list of locked adoms
+        Gets the list of locked adoms. The lockinfo of every ADOM is queried in a single batched request.
         """
         try:
             locked_list = list()
             locked_by_user_list = list()
-            for adom in self._adom_list:
-                adom_lock_info = self.get_lock_info(adom=adom)
+            lock_info_requests = [(FMGRMethods.GET, self._get_lock_info_url(adom), {}) for adom in self._adom_list]
+            # LOCKINFO QUERIES ARE TINY, SO THEY ALL GO IN ONE REQUEST REGARDLESS OF THE DEFAULT BATCH SIZE
+            lock_info_results = self.send_batch(lock_info_requests, chunk_size=len(lock_info_requests))
+            for adom, adom_lock_info in zip(self._adom_list, lock_info_results):
+                if adom_lock_info[0] != 0:
+                    raise FMGBaseException(msg=("An error occurred trying to get the ADOM Lock Info for " +
+                                                to_text(adom) + ". Error: " + to_text(adom_lock_info)))
                 try:
                     if adom_lock_info[1]["status"]["message"] == "OK":
                         continue
-                except IndexError as err:
+                except (IndexError, KeyError, TypeError):
                     pass
                 try:
                     if adom_lock_info[1][0]["lock_user"]:
@@ -0,0 +1,79 @@
+# Copyright 2018 Fortinet, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Ansible.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Micro-benchmark of prepare_dict/scrub_dict on nested paramgrams.
+
+Compares the previous implementation, which scrubbed every subtree twice per level, with the single-pass
+scrub_dict() and the fused prepare_and_scrub_dict(). Run it from an environment where the fortimanager module_utils
+are importable:
+
+    python fortimanager/test/benchmarks/bench_scrub_dict.py
+"""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import timeit
+
+from ansible.module_utils.network.fortimanager.common import prepare_dict
+from ansible.module_utils.network.fortimanager.common import prepare_and_scrub_dict
+from ansible.module_utils.network.fortimanager.common import scrub_dict
+
+
+def legacy_prepare_dict(obj):
+    list_of_elems = ["mode", "adom", "host", "username", "password"]
+
+    if isinstance(obj, dict):
+        obj = dict((key, legacy_prepare_dict(value)) for (key, value) in obj.items() if key not in list_of_elems)
+    return obj
+
+
+def legacy_scrub_dict(obj):
+    if isinstance(obj, dict):
+        return dict((k, legacy_scrub_dict(v)) for k, v in obj.items() if v and legacy_scrub_dict(v))
+    else:
+        return obj
+
+
+def nested_paramgram(depth, width=10):
+    """
+    Builds a paramgram shaped like the nested option trees of fmgr_secprof_ssl_ssh or the dynamic_mapping of
+    fmgr_fwobj_vip: every level holds a mix of set and unset options, and one nested child.
+    """
+    paramgram = {"mode": "set", "adom": "root"}
+    for index in range(width):
+        paramgram["option-" + str(index)] = "enable" if index % 2 else None
+    if depth:
+        paramgram["child"] = nested_paramgram(depth - 1, width)
+    return paramgram
+
+
+def run(depths=(4, 8, 12, 14), number=5):
+    print("{0:>5} {1:>14} {2:>14} {3:>14} {4:>9}".format("depth", "legacy (ms)", "scrub (ms)", "fused (ms)",
+                                                         "speedup"))
+    for depth in depths:
+        paramgram = nested_paramgram(depth)
+        assert prepare_and_scrub_dict(paramgram) == legacy_scrub_dict(legacy_prepare_dict(paramgram))
+
+        legacy = timeit.timeit(lambda: legacy_scrub_dict(legacy_prepare_dict(paramgram)), number=number) / number
+        single = timeit.timeit(lambda: scrub_dict(prepare_dict(paramgram)), number=number) / number
+        fused = timeit.timeit(lambda: prepare_and_scrub_dict(paramgram), number=number) / number
+        print("{0:>5} {1:>14.3f} {2:>14.3f} {3:>14.3f} {4:>8.0f}x".format(depth, legacy * 1000, single * 1000,
+                                                                          fused * 1000, legacy / fused))
+
+
+if __name__ == "__main__":
+    run()
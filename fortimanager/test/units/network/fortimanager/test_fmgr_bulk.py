@@ -0,0 +1,152 @@
+# Copyright 2018 Fortinet, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Ansible.  If not, see <https://www.gnu.org/licenses/>.
+
+# Make coding more python3-ish
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import os
+import json
+from ansible.module_utils.network.fortimanager.fortimanager import FortiManagerHandler
+import pytest
+
+try:
+    from ansible.modules.network.fortimanager import fmgr_bulk
+except ImportError:
+    pytest.skip("Could not load required modules for testing", allow_module_level=True)
+
+
+def load_fixtures():
+    fixture_path = os.path.join(os.path.dirname(__file__), 'fixtures') + "/{filename}.json".format(
+        filename=os.path.splitext(os.path.basename(__file__))[0])
+    try:
+        with open(fixture_path, "r") as fixture_file:
+            fixture_data = json.load(fixture_file)
+    except IOError:
+        return []
+    return [fixture_data]
+
+
+@pytest.fixture(autouse=True)
+def module_mock(mocker):
+    connection_class_mock = mocker.patch('ansible.module_utils.basic.AnsibleModule')
+    return connection_class_mock
+
+
+@pytest.fixture(autouse=True)
+def connection_mock(mocker):
+    connection_class_mock = mocker.patch('ansible.modules.network.fortimanager.fmgr_bulk.Connection')
+    return connection_class_mock
+
+
+@pytest.fixture(scope="function", params=load_fixtures())
+def fixture_data(request):
+    func_name = request.function.__name__.replace("test_", "")
+    return request.param.get(func_name, None)
+
+
+fmg_instance = FortiManagerHandler(connection_mock, module_mock)
+
+PROCESS_REQUEST_IF_CHANGED = "ansible.module_utils.network.fortimanager.fortimanager.FortiManagerHandler." \
+    "process_request_if_changed"
+
+
+def test_fmgr_bulk_run(fixture_data, mocker):
+    from ansible.modules.network.fortimanager import fmgr_fwobj_address
+    #  Fixture sets used:###########################
+
+    ##################################################
+    # adom: ansible
+    # target_module: fmgr_fwobj_address
+    # target_function: fmgr_fwobj_ipv4
+    # mode: set
+    # items: [bulk_host1, bulk_host2]
+    # continue_on_error: False
+    ##################################################
+    ##################################################
+    # adom: ansible
+    # target_module: fmgr_fwobj_address
+    # target_function: fmgr_fwobj_ipv4
+    # mode: add
+    # items: [bulk_host3, bulk_host1, bulk_host4]
+    # continue_on_error: False / True
+    ##################################################
+
+    # Test using fixture 1 #
+    mocker.patch(PROCESS_REQUEST_IF_CHANGED,
+                 side_effect=[tuple(response) for response in fixture_data[0]['raw_response']])
+    output = fmgr_bulk.fmgr_bulk_run(fmg_instance, fixture_data[0]['paramgram_used'],
+                                     fmgr_fwobj_address.fmgr_fwobj_ipv4)
+    assert output[0] == 0
+    assert [result['changed'] for result in output[1]['results']] == [True, False]
+    assert output[1]['changed_items'] == 1
+    # Test using fixture 2 #
+    mocker.patch(PROCESS_REQUEST_IF_CHANGED,
+                 side_effect=[tuple(response) for response in fixture_data[1]['raw_response']])
+    output = fmgr_bulk.fmgr_bulk_run(fmg_instance, fixture_data[1]['paramgram_used'],
+                                     fmgr_fwobj_address.fmgr_fwobj_ipv4)
+    assert output[0] == 1
+    assert [result['name'] for result in output[1]['results']] == ["bulk_host3", "bulk_host1"]
+    assert output[1]['results'][1]['rc'] == -2
+    # Test using fixture 2 with continue_on_error #
+    mocker.patch(PROCESS_REQUEST_IF_CHANGED,
+                 side_effect=[tuple(response) for response in fixture_data[1]['raw_response']])
+    paramgram = dict(fixture_data[1]['paramgram_used'], continue_on_error=True)
+    output = fmgr_bulk.fmgr_bulk_run(fmg_instance, paramgram, fmgr_fwobj_address.fmgr_fwobj_ipv4)
+    assert output[0] == 1
+    assert len(output[1]['results']) == 3
+    assert output[1]['changed_items'] == 2
+
+
+def test_fmgr_bulk_run_group_members(fixture_data, mocker):
+    from ansible.modules.network.fortimanager import fmgr_fwobj_address
+    #  Fixture sets used:###########################
+
+    ##################################################
+    # adom: ansible
+    # target_module: fmgr_fwobj_address
+    # target_function: fmgr_fwobj_group_members
+    # mode: set
+    # items: [bulk_grp1, bulk_grp2]
+    # continue_on_error: False
+    ##################################################
+
+    # THE TARGET FUNCTION OPENS ITS OWN TRANSACTION INSIDE THE ONE OPENED FOR THE WHOLE RUN
+    handler = "ansible.module_utils.network.fortimanager.fortimanager.FortiManagerHandler."
+    mocker.patch(handler + "lock_adom")
+    mocker.patch(handler + "unlock_adom")
+    commit_changes = mocker.patch(handler + "commit_changes")
+    mocker.patch(handler + "process_request",
+                 side_effect=[tuple(response) for response in fixture_data[0]['raw_response']])
+    fmg_instance.begin_transaction(adom=fixture_data[0]['paramgram_used']['adom'])
+    output = fmgr_bulk.fmgr_bulk_run(fmg_instance, fixture_data[0]['paramgram_used'],
+                                     fmgr_fwobj_address.fmgr_fwobj_group_members)
+    assert fmg_instance.in_transaction()
+    fmg_instance.commit_transaction()
+    assert output[0] == 0
+    assert [result['rc'] for result in output[1]['results']] == [0, 0]
+    assert output[1]['changed_items'] == 2
+    assert not fmg_instance.in_transaction()
+    assert commit_changes.call_count <= 1
+
+
+def test_load_target_function():
+    from ansible.module_utils.network.fortimanager.common import FMGBaseException
+    from ansible.modules.network.fortimanager import fmgr_fwobj_address
+    assert fmgr_bulk.load_target_function("fmgr_fwobj_address", "fmgr_fwobj_ipv4") is fmgr_fwobj_address.fmgr_fwobj_ipv4
+    with pytest.raises(FMGBaseException):
+        fmgr_bulk.load_target_function("fmgr_fwobj_address", "main")
+    with pytest.raises(FMGBaseException):
+        fmgr_bulk.load_target_function("fmgr_sys_proxy", "fmgr_sys_proxy_modify")
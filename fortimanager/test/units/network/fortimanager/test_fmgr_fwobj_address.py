@@ -20,6 +20,7 @@ __metaclass__ = type
 import os
 import json
 from ansible.module_utils.network.fortimanager.fortimanager import FortiManagerHandler
+from ansible.module_utils.network.fortimanager.common import FMGBaseException
 import pytest
 
 try:
@@ -154,3 +155,102 @@ def test_fmgr_fwobj_multicast(fixture_data, mocker):
     # Test using fixture 3 #
     output = fmgr_fwobj_address.fmgr_fwobj_multicast(fmg_instance, fixture_data[2]['paramgram_used'])
     assert output['raw_response']['status']['code'] == 0
+
+
+def test_fmgr_fwobj_delete_by_filter(fixture_data, mocker):
+    mocker.patch("ansible.module_utils.network.fortimanager.fortimanager.FortiManagerHandler.delete_by_filter",
+                 side_effect=fixture_data)
+
+    # Test using fixture 1 #
+    output = fmgr_fwobj_address.fmgr_fwobj_delete_by_filter(fmg_instance, fixture_data[0]['paramgram_used'])
+    assert output['raw_response']['status']['code'] == 0
+    assert len(output['raw_response']['deleted']) == 3
+    # Test using fixture 2 #
+    output = fmgr_fwobj_address.fmgr_fwobj_delete_by_filter(fmg_instance, fixture_data[1]['paramgram_used'])
+    assert output['raw_response']['status']['code'] == 0
+    assert output['raw_response']['deleted'] == []
+
+
+def test_fmgr_fwobj_bulk(fixture_data, mocker):
+    write_mock = mocker.patch("ansible.module_utils.network.fortimanager.fortimanager.FortiManagerHandler."
+                              "write_objects", side_effect=[tuple(response) for response
+                                                            in fixture_data[0]['raw_response']])
+    delete_mock = mocker.patch("ansible.module_utils.network.fortimanager.fortimanager.FortiManagerHandler."
+                               "delete_objects", side_effect=[tuple(response) for response
+                                                              in fixture_data[1]['raw_response']])
+
+    # Test using fixture 1 #
+    output = fmgr_fwobj_address.fmgr_fwobj_bulk(fmg_instance, fixture_data[0]['paramgram_used'])
+    tables = [call[0][0].rsplit("/", 1)[1] for call in write_mock.call_args_list]
+    assert tables == ["address", "address6", "addrgrp"]
+    assert write_mock.call_args_list[0][0][1][0]["subnet"] == ["10.7.220.41", "255.255.255.255"]
+    assert write_mock.call_args_list[2][0][1][0]["member"] == ["bulk_host1", "bulk_range1"]
+    assert output[0] == 1
+    assert output[1]['done'] == 3
+    assert [failure['name'] for failure in output[1]['failed_objects']] == ["bulk_bad", "bulk_group1"]
+    # Test using fixture 2 #
+    output = fmgr_fwobj_address.fmgr_fwobj_bulk(fmg_instance, fixture_data[1]['paramgram_used'])
+    assert [call[0][1] for call in delete_mock.call_args_list] == [["bulk_group1"], ["bulk_host1"]]
+    assert output[0] == 0
+    assert output[1]['done'] == 2
+
+
+def test_fmgr_fwobj_group_members(fixture_data, mocker):
+    request_mock = mocker.patch("ansible.module_utils.network.fortimanager.fortimanager.FortiManagerHandler."
+                                "process_request", side_effect=[tuple(response) for fixture in fixture_data
+                                                                for response in fixture['raw_response']])
+
+    # Test using fixture 1 #
+    output = fmgr_fwobj_address.fmgr_fwobj_group_members(fmg_instance, fixture_data[0]['paramgram_used'])
+    assert output[0] == 0
+    assert output[1]['added'] == ["ansible_v4Obj"]
+    assert output[1]['removed'] == ["ansible_range"]
+    assert request_mock.call_args_list[1][0] == ("/pm/config/adom/ansible/obj/firewall/addrgrp/ansibleIPv4Group/member",
+                                                 {"data": ["ansible_v4Obj"]}, "add")
+    assert request_mock.call_args_list[2][0][2] == "delete"
+    # Test using fixture 2 #
+    output = fmgr_fwobj_address.fmgr_fwobj_group_members(fmg_instance, fixture_data[1]['paramgram_used'])
+    assert output[0] == 0
+    assert output[1]['unchanged'] is True
+    assert request_mock.call_count == 4
+
+
+def test_fmgr_fwobj_load_objects_file(tmpdir, mocker):
+    mocker.patch("ansible.modules.network.fortimanager.fmgr_fwobj_address.HAS_YAML", False)
+    objects = [{"ipv4": "ipmask", "name": "bulk_host1", "ipv4addr": "10.7.220.41/32"}]
+
+    # JSON IS READ WITH THE STANDARD LIBRARY, SO PYYAML ISN'T NEEDED #
+    json_file = tmpdir.join("objects.json")
+    json_file.write(json.dumps(objects))
+    assert fmgr_fwobj_address.fmgr_fwobj_load_objects_file(str(json_file)) == objects
+    # CSV #
+    csv_file = tmpdir.join("objects.csv")
+    csv_file.write("ipv4,name,ipv4addr,comment\nipmask,bulk_host1,10.7.220.41/32,\n")
+    assert fmgr_fwobj_address.fmgr_fwobj_load_objects_file(str(csv_file)) == objects
+    # YAML WITHOUT PYYAML #
+    yaml_file = tmpdir.join("objects.yml")
+    yaml_file.write("- name: bulk_host1\n")
+    with pytest.raises(FMGBaseException):
+        fmgr_fwobj_address.fmgr_fwobj_load_objects_file(str(yaml_file))
+    # NOT A LIST OF OBJECTS #
+    json_file.write(json.dumps({"name": "bulk_host1"}))
+    with pytest.raises(FMGBaseException):
+        fmgr_fwobj_address.fmgr_fwobj_load_objects_file(str(json_file))
+
+
+def test_write_objects(mocker):
+    connection = mocker.Mock(**{"send_request.return_value": (0, {"workspace-mode": 0, "adom-status": 1})})
+    fmgr = FortiManagerHandler(connection, mocker.Mock(paramgram={"adom": "ansible"}))
+    datagrams = [{"name": "bulk_host" + str(index)} for index in range(1, 6)]
+    connection.send_batch.side_effect = [
+        [(0, {}), (-10, {"status": {"code": -10, "message": "Invalid subnet"}}), (0, {})],
+        [(0, {}), (-10, {"status": {"code": -10, "message": "Invalid subnet"}})],
+    ]
+
+    output = fmgr.write_objects("/pm/config/adom/ansible/obj/firewall/address", datagrams, "add", chunk_size=2)
+    # THE FAILED CHUNK OF bulk_host3 AND bulk_host4 IS SENT AGAIN, ONE OBJECT PER OPERATION
+    retried = connection.send_batch.call_args_list[1][0][0]
+    assert [request[2]["data"]["name"] for request in retried] == ["bulk_host3", "bulk_host4"]
+    assert output[0] == -10
+    assert sorted(output[1]['written']) == ["bulk_host1", "bulk_host2", "bulk_host3", "bulk_host5"]
+    assert output[1]['failed'] == [{"name": "bulk_host4", "code": -10, "message": "Invalid subnet"}]
@@ -104,3 +104,31 @@ def test_fmgr_get_task_status(fixture_data, mocker):
     # Test using fixture 1 #
     output = fmgr_query.fmgr_get_task_status(fmg_instance, fixture_data[0]['paramgram_used'])
     assert isinstance(output['raw_response'], dict) is True
+
+
+def test_fmgr_get_custom_paged(mocker):
+    pages = [[{"name": "tmp-host" + str(i)} for i in range(2)], [{"name": "tmp-host2"}]]
+    iter_pages = mocker.patch("ansible.module_utils.network.fortimanager.fortimanager.FortiManagerHandler.iter_pages",
+                              return_value=iter(pages))
+    paramgram_used = {"custom_endpoint": "/pm/config/adom/ansible/obj/firewall/address", "custom_dict": None,
+                      "page_size": 2, "fields": None, "adom": "ansible", "object": "custom"}
+
+    output = fmgr_query.fmgr_get_custom(fmg_instance, paramgram_used)
+    assert output[0] == 0
+    assert [obj["name"] for obj in output[1]] == ["tmp-host0", "tmp-host1", "tmp-host2"]
+    iter_pages.assert_called_once_with("/pm/config/adom/ansible/obj/firewall/address", {}, page_size=2)
+
+
+def test_fmgr_get_custom_fields(mocker):
+    process_request = mocker.patch(
+        "ansible.module_utils.network.fortimanager.fortimanager.FortiManagerHandler.process_request",
+        return_value=(0, [{"name": "FGT1", "sn": "FGVM000000117992"}]))
+    paramgram_used = {"custom_endpoint": "/dvmdb/adom/ansible/device", "custom_dict": {"loadsub": 0},
+                      "page_size": None, "fields": ["name", "sn"], "adom": "ansible", "object": "custom"}
+
+    output = fmgr_query.fmgr_get_custom(fmg_instance, paramgram_used)
+    assert output[0] == 0
+    process_request.assert_called_once_with("/dvmdb/adom/ansible/device", {"loadsub": 0, "fields": ["name", "sn"]},
+                                            "get")
+    # THE CUSTOM_DICT OF THE TASK IS LEFT UNTOUCHED
+    assert paramgram_used["custom_dict"] == {"loadsub": 0}
@@ -0,0 +1,97 @@
+# Copyright 2018 Fortinet, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Ansible.  If not, see <https://www.gnu.org/licenses/>.
+
+# Make coding more python3-ish
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import os
+import json
+from ansible.module_utils.network.fortimanager.fortimanager import FortiManagerHandler
+import pytest
+
+try:
+    from ansible.modules.network.fortimanager import fmgr_task_wait
+except ImportError:
+    pytest.skip("Could not load required modules for testing", allow_module_level=True)
+
+
+def load_fixtures():
+    fixture_path = os.path.join(os.path.dirname(__file__), 'fixtures') + "/{filename}.json".format(
+        filename=os.path.splitext(os.path.basename(__file__))[0])
+    try:
+        with open(fixture_path, "r") as fixture_file:
+            fixture_data = json.load(fixture_file)
+    except IOError:
+        return []
+    return [fixture_data]
+
+
+@pytest.fixture(autouse=True)
+def module_mock(mocker):
+    connection_class_mock = mocker.patch('ansible.module_utils.basic.AnsibleModule')
+    return connection_class_mock
+
+
+@pytest.fixture(autouse=True)
+def connection_mock(mocker):
+    connection_class_mock = mocker.patch('ansible.modules.network.fortimanager.fmgr_task_wait.Connection')
+    return connection_class_mock
+
+
+@pytest.fixture(scope="function", params=load_fixtures())
+def fixture_data(request):
+    func_name = request.function.__name__.replace("test_", "")
+    return request.param.get(func_name, None)
+
+
+fmg_instance = FortiManagerHandler(connection_mock, module_mock)
+
+
+def fixture_side_effect(fixture_data, key):
+    # JSON OBJECT KEYS ARE ALWAYS STRINGS, THE MODULE WORKS WITH INTEGER TASK IDS
+    return [dict((int(task_id), value) for task_id, value in fixture["raw_response"][key].items())
+            for fixture in fixture_data]
+
+
+def test_fmgr_task_wait(fixture_data, mocker):
+    mocker.patch("ansible.module_utils.network.fortimanager.fortimanager.FortiManagerHandler.wait_for_tasks",
+                 side_effect=fixture_side_effect(fixture_data, "tasks"))
+    mocker.patch("ansible.module_utils.network.fortimanager.fortimanager.FortiManagerHandler.get_task_lines",
+                 side_effect=fixture_side_effect(fixture_data, "lines"))
+    #  Fixture sets used:###########################
+
+    ##################################################
+    # adom: ansible
+    # task_ids: [1141, 1142]
+    # retry_interval: 5
+    # retry_count: 150
+    ##################################################
+    ##################################################
+    # adom: ansible
+    # task_ids: [1143]
+    # retry_interval: 5
+    # retry_count: 150
+    ##################################################
+
+    # Test using fixture 1 #
+    output = fmgr_task_wait.fmgr_task_wait(fmg_instance, fixture_data[0]['paramgram_used'])
+    assert output[0] == 0
+    assert [task['id'] for task in output[1]['tasks']] == [1141, 1142]
+    assert output[1]['tasks'][1]['lines'][0]['name'] == "FGT2"
+    # Test using fixture 2 #
+    output = fmgr_task_wait.fmgr_task_wait(fmg_instance, fixture_data[1]['paramgram_used'])
+    assert output[0] == 1
+    assert output[1]['tasks'][0]['state'] == "error"
@@ -0,0 +1,140 @@
+# Copyright 2018 Fortinet, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Ansible.  If not, see <https://www.gnu.org/licenses/>.
+
+# Make coding more python3-ish
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+from ansible.module_utils.network.fortimanager.common import FMGBaseException
+from ansible.module_utils.network.fortimanager.common import FMGRCommon
+from ansible.module_utils.network.fortimanager.common import FMGR_NETMASKS
+from ansible.module_utils.network.fortimanager.fortimanager_address import FMGRAddress
+from ansible.module_utils.network.fortimanager.fortimanager_address import FMGRLRUCache
+import pytest
+
+
+def test_netmask_table():
+    assert len(FMGR_NETMASKS) == 33
+    assert FMGR_NETMASKS[0] == "0.0.0.0"
+    assert FMGR_NETMASKS[1] == "128.0.0.0"
+    assert FMGR_NETMASKS[24] == "255.255.255.0"
+    assert FMGR_NETMASKS[27] == "255.255.255.224"
+    assert FMGR_NETMASKS[32] == "255.255.255.255"
+
+
+@pytest.mark.parametrize("cidr, netmask", [(0, "0.0.0.0"), ("0", "0.0.0.0"), (16, "255.255.0.0"),
+                                           ("22", "255.255.252.0"), (32, "255.255.255.255"),
+                                           ("32", "255.255.255.255")])
+def test_cidr_to_netmask(cidr, netmask):
+    assert FMGRCommon.cidr_to_netmask(cidr) == netmask
+
+
+@pytest.mark.parametrize("cidr", [33, -1, "33", "abc", "", None, True, "255.255.255.0"])
+def test_cidr_to_netmask_invalid(cidr):
+    with pytest.raises(FMGBaseException):
+        FMGRCommon.cidr_to_netmask(cidr)
+
+
+@pytest.mark.parametrize("value, subnet", [
+    ("10.0.0.0/24", ["10.0.0.0", "255.255.255.0"]),
+    ("10.0.0.0/255.255.255.0", ["10.0.0.0", "255.255.255.0"]),
+    ("10.0.0.0 255.255.255.0", ["10.0.0.0", "255.255.255.0"]),
+    (" 10.0.0.0 / 24 ", ["10.0.0.0", "255.255.255.0"]),
+    ("10.0.0.1", ["10.0.0.1", "255.255.255.255"]),
+    ("10.0.0.1/32", ["10.0.0.1", "255.255.255.255"]),
+    ("0.0.0.0/0", ["0.0.0.0", "0.0.0.0"]),
+    ("010.000.000.001/32", ["10.0.0.1", "255.255.255.255"]),
+])
+def test_ipv4_subnet(value, subnet):
+    assert FMGRAddress.ipv4_subnet(value) == subnet
+
+
+def test_ipv4_subnet_returns_a_new_list():
+    FMGRAddress.ipv4_subnet("10.1.0.0/16").append("changed")
+    assert FMGRAddress.ipv4_subnet("10.1.0.0/16") == ["10.1.0.0", "255.255.0.0"]
+
+
+@pytest.mark.parametrize("value", ["10.0.0.0/33", "10.0.0/24", "10.0.0.256/24", "10.0.0.0/255.255.255.256",
+                                   "host.example.com", "", "10.0.0.0/-1", 167772160, None])
+def test_ipv4_subnet_invalid(value):
+    with pytest.raises(FMGBaseException):
+        FMGRAddress.ipv4_subnet(value)
+
+
+def test_ipv4_wildcard():
+    assert FMGRAddress.ipv4_wildcard("10.0.0.0/255.255.0.255") == ["10.0.0.0", "255.255.0.255"]
+    assert FMGRAddress.ipv4_wildcard("10.0.0.0 0.0.255.0") == ["10.0.0.0", "0.0.255.0"]
+    assert FMGRAddress.ipv4_wildcard("10.0.0.0/16") == ["10.0.0.0", "255.255.0.0"]
+
+
+@pytest.mark.parametrize("value, netmask", [(0, "0.0.0.0"), (24, "255.255.255.0"), ("32", "255.255.255.255"),
+                                            ("255.255.255.128", "255.255.255.128")])
+def test_netmask(value, netmask):
+    assert FMGRAddress.netmask(value) == netmask
+
+
+@pytest.mark.parametrize("value", [33, "33", "255.255.255", True])
+def test_netmask_invalid(value):
+    with pytest.raises(FMGBaseException):
+        FMGRAddress.netmask(value)
+
+
+@pytest.mark.parametrize("value, address_range", [
+    ("10.0.0.1-10.0.0.9", "10.0.0.1-10.0.0.9"),
+    ("10.0.0.1 - 10.0.0.9", "10.0.0.1-10.0.0.9"),
+    ("10.0.0.1", "10.0.0.1"),
+])
+def test_ipv4_range(value, address_range):
+    assert FMGRAddress.ipv4_range(value) == address_range
+
+
+@pytest.mark.parametrize("value", ["10.0.0.1-", "10.0.0.1-10.0.0", "10.0.0.1-10.0.0.9-10.0.0.10", "a-b"])
+def test_ipv4_range_invalid(value):
+    with pytest.raises(FMGBaseException):
+        FMGRAddress.ipv4_range(value)
+
+
+@pytest.mark.parametrize("value, prefix", [
+    ("2001:0db8:0000::1", "2001:db8::1/128"),
+    ("2001:db8::/32", "2001:db8::/32"),
+    ("::/0", "::/0"),
+])
+def test_ipv6_prefix(value, prefix):
+    assert FMGRAddress.ipv6_prefix(value) == prefix
+
+
+@pytest.mark.parametrize("value", ["2001:db8::/129", "2001:db8::g", "10.0.0.1/24", "2001:db8::/x"])
+def test_ipv6_prefix_invalid(value):
+    with pytest.raises(FMGBaseException):
+        FMGRAddress.ipv6_prefix(value)
+
+
+def test_normalize_ranges():
+    datagram = {"extip": "10.0.0.1 - 10.0.0.9", "name": "vip1", "mappedip": "host1",
+                "dynamic_mapping": [{"extip": "10.0.1.1 -10.0.1.2,10.0.2.1"}]}
+    assert FMGRAddress.normalize_ranges(datagram, ["extip", "mappedip"]) is datagram
+    assert datagram["extip"] == "10.0.0.1-10.0.0.9"
+    assert datagram["mappedip"] == "host1"
+    assert datagram["dynamic_mapping"][0]["extip"] == "10.0.1.1-10.0.1.2,10.0.2.1"
+
+
+def test_lru_cache():
+    cache = FMGRLRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert len(cache) == 2
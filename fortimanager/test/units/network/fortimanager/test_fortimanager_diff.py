@@ -0,0 +1,95 @@
+# Copyright 2018 Fortinet, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Ansible.  If not, see <https://www.gnu.org/licenses/>.
+
+# Make coding more python3-ish
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+from ansible.module_utils.network.fortimanager.common import FMGRMethods
+from ansible.module_utils.network.fortimanager.fortimanager import FortiManagerHandler
+from ansible.module_utils.network.fortimanager.fortimanager_diff import FMGRDiff
+from ansible.module_utils.network.fortimanager.fortimanager_diff import FMGR_UNCHANGED_KEY
+
+
+def test_comma_separated_list_matches_list():
+    assert FMGRDiff.diff({"member": "host1, host2"}, {"member": ["host2", "host1"]}) == {}
+    assert FMGRDiff.diff({"member": ["host1", "host2"]}, {"member": "host1,host2"}) == {}
+    assert "member" in FMGRDiff.diff({"member": "host1, host3"}, {"member": ["host1", "host2"]})
+
+
+def test_comma_in_scalar_is_not_split():
+    assert FMGRDiff.diff({"comment": "a, b"}, {"comment": "a, b"}) == {}
+    assert FMGRDiff.diff({"comment": "a, b"}, {"comment": "a,b"}) == {"comment": {"before": "a,b", "after": "a, b"}}
+    assert "comment" in FMGRDiff.diff({"comment": "b, a"}, {"comment": "a, b"})
+
+
+def test_hyphen_and_underscore_keys_match():
+    assert FMGRDiff.diff({"associated_interface": "port1"}, {"associated-interface": "port1"}) == {}
+    assert FMGRDiff.diff({"start-ip": "10.0.0.1"}, {"start_ip": "10.0.0.1"}) == {}
+    diff = FMGRDiff.diff({"associated_interface": "port2"}, {"associated-interface": "port1"})
+    assert diff == {"associated_interface": {"before": "port1", "after": "port2"}}
+
+
+def test_numeric_strings_match_numbers():
+    assert FMGRDiff.diff({"color": "22", "ttl": 3600, "weight": 1.0}, {"color": 22, "ttl": "3600", "weight": 1}) == {}
+    assert FMGRDiff.diff({"visibility": True}, {"visibility": "true"}) == {}
+    assert "color" in FMGRDiff.diff({"color": "22"}, {"color": 21})
+
+
+def test_missing_and_empty_values_match():
+    assert FMGRDiff.diff({"comment": "", "tags": [], "unset": None}, {}) == {}
+    assert "comment" in FMGRDiff.diff({"comment": "x"}, {})
+
+
+def test_nested_tables():
+    current = {"dynamic_mapping": [{"_scope": [{"name": "FGT1", "vdom": "root"}], "subnet": ["10.0.0.0", "255.0.0.0"]}]}
+    desired = {"dynamic_mapping": [{"_scope": [{"name": "FGT1", "vdom": "root"}], "subnet": "10.0.0.0, 255.0.0.0"}]}
+    assert FMGRDiff.diff(desired, current) == {}
+    desired["dynamic_mapping"][0]["_scope"][0]["vdom"] = "vdom1"
+    assert "dynamic_mapping" in FMGRDiff.diff(desired, current)
+    assert "dynamic_mapping" in FMGRDiff.diff({"dynamic_mapping": [{"subnet": "10.0.0.0"}, {"subnet": "10.1.0.0"}]},
+                                              current)
+
+
+def test_nested_object_against_scalar():
+    assert "nested" in FMGRDiff.diff({"nested": "a"}, {"nested": {"a": 1}})
+    assert "nested" in FMGRDiff.diff({"nested": {"a": 1}}, {"nested": "a"})
+
+
+def test_projected_fields():
+    fields = FMGRDiff.projected_fields({"name": "host1", "subnet": "10.0.0.1/32", "comment": None,
+                                        "dynamic_mapping": [{"subnet": "10.0.0.0"}]})
+    assert sorted(fields) == ["name", "subnet"]
+    assert FMGRDiff.projected_fields({"name": "host1", "nested": {"a": 1}}) is None
+
+
+def test_object_missing_writes_with_full_diff(mocker):
+    connection = mocker.Mock(**{"send_request.return_value": (0, {"workspace-mode": 0, "adom-status": 1})})
+    module = mocker.Mock(paramgram={"adom": "root"})
+    fmgr = FortiManagerHandler(connection, module)
+    connection.send_request.return_value = (-3, {"status": {"code": -3, "message": "Object does not exist"}})
+    process_request = mocker.patch.object(fmgr, "process_request", return_value=(0, {"status": {"code": 0}}))
+
+    datagram = {"name": "host1", "subnet": "10.0.0.1/32", "comment": None}
+    response = fmgr.process_request_if_changed("/pm/config/adom/root/obj/firewall/address", datagram,
+                                               FMGRMethods.ADD)
+    process_request.assert_called_once_with("/pm/config/adom/root/obj/firewall/address", datagram, FMGRMethods.ADD)
+    assert sorted(response[1]["diff"]) == ["name", "subnet"]
+    assert FMGR_UNCHANGED_KEY not in response[1]
+
+    # NOTHING TO DELETE, SO THE DELETE ISN'T SENT
+    response = fmgr.process_request_if_changed("/pm/config/adom/root/obj/firewall/address/host1", {},
+                                               FMGRMethods.DELETE)
+    assert response[0] == -3
+    assert process_request.call_count == 1
@@ -0,0 +1,132 @@
+# Copyright 2018 Fortinet, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Ansible.  If not, see <https://www.gnu.org/licenses/>.
+
+# Make coding more python3-ish
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+import json
+from io import BytesIO
+import pytest
+
+try:
+    from ansible.module_utils.network.fortimanager.common import FMGBaseException
+    from ansible.module_utils.network.fortimanager.common import FMGRMethods
+    from ansible.module_utils.six.moves.urllib.error import HTTPError
+    from ansible.plugins.httpapi.fortimanager import HttpApi
+except ImportError:
+    pytest.skip("Could not load required modules for testing", allow_module_level=True)
+
+
+class FakeConnection(object):
+    """
+    Replays canned replies, handling an HTTPError reply the way the httpapi connection plugin does: the plugin's
+    handle_httperror() decides whether it is raised or returned as the response.
+    """
+    _connected = True
+
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.sent = list()
+        self.httpapi = None
+
+    def send(self, path, data, **kwargs):
+        self.sent.append(json.loads(data))
+        reply = self.replies.pop(0)
+        if isinstance(reply, HTTPError):
+            handled = self.httpapi.handle_httperror(reply)
+            if handled is False:
+                raise reply
+            return handled, handled
+        return None, BytesIO(json.dumps(reply).encode("utf-8"))
+
+    def get_option(self, option):
+        return {"password": "fortinet"}.get(option)
+
+
+def reply(code=0, data=None, session=None):
+    result = {"status": {"code": code, "message": "OK" if code == 0 else "error"}, "url": "/"}
+    if data is not None:
+        result["data"] = data
+    response = {"id": 1, "result": [result]}
+    if session is not None:
+        response["session"] = session
+    return response
+
+
+def bad_gateway():
+    return HTTPError("https://fmgr/jsonrpc", 502, "Bad Gateway", {}, BytesIO(b"<html>Bad Gateway</html>"))
+
+
+def make_httpapi(replies, uses_workspace=False):
+    connection = FakeConnection(replies)
+    httpapi = HttpApi(connection)
+    connection.httpapi = httpapi
+    httpapi._retry_policy.backoff = 0
+    httpapi._logged_in_user = "admin"
+    httpapi._save_cached_session = lambda: None
+    httpapi.sid = "expired"
+    httpapi.uses_workspace = uses_workspace
+    return httpapi, connection
+
+
+def test_get_is_retried_after_bad_gateway():
+    httpapi, connection = make_httpapi([bad_gateway(), reply(data={"name": "addr1"})])
+    code, data = httpapi.send_request(FMGRMethods.GET, [{"url": "/pm/config/adom/root/obj/firewall/address"}])
+    assert code == 0
+    assert data == {"name": "addr1"}
+    assert len(connection.sent) == 2
+    assert httpapi._retry_log[0]["reason"].startswith("transient failure")
+
+
+def test_write_is_not_retried_after_bad_gateway():
+    httpapi, connection = make_httpapi([bad_gateway(), reply()])
+    with pytest.raises(FMGBaseException):
+        httpapi.send_request(FMGRMethods.ADD, [{"url": "/pm/config/adom/root/obj/firewall/address"}])
+    assert len(connection.sent) == 1
+
+
+def test_relogin_locks_held_adoms_again():
+    httpapi, connection = make_httpapi([reply(), reply(code=-11), reply(session="renewed"), reply(), reply()],
+                                       uses_workspace=True)
+    httpapi.lock_adom("root")
+    httpapi.send_request(FMGRMethods.GET, [{"url": "/pm/config/adom/root/obj/firewall/address"}])
+    assert httpapi.sid == "renewed"
+    assert connection.sent[3]["params"][0]["url"] == "/dvmdb/adom/root/workspace/lock/"
+    assert httpapi._session_locks == {"root": False}
+
+
+def test_relogin_fails_when_uncommitted_changes_were_lost():
+    httpapi, connection = make_httpapi([reply(), reply(), reply(code=-11), reply(session="renewed")],
+                                       uses_workspace=True)
+    httpapi.lock_adom("root")
+    httpapi.send_request(FMGRMethods.ADD, [{"url": "/pm/config/adom/root/obj/firewall/address"}])
+    with pytest.raises(FMGBaseException) as err:
+        httpapi.send_request(FMGRMethods.GET, [{"url": "/pm/config/adom/root/obj/firewall/address"}])
+    assert "root" in str(err.value)
+    assert len(connection.sent) == 4
+
+
+@pytest.mark.parametrize("has_orjson", [True, False])
+def test_response_is_decoded_from_the_buffer(has_orjson, monkeypatch):
+    from ansible.module_utils.network.fortimanager import common
+    if has_orjson and not common.HAS_ORJSON:
+        pytest.skip("orjson is not installed")
+    monkeypatch.setattr(common, "HAS_ORJSON", has_orjson)
+    monkeypatch.setattr(common, "HAS_UJSON", False)
+    address = {"name": u"addr-\u00e9", "subnet": ["10.0.0.1", "255.255.255.255"]}
+    httpapi, connection = make_httpapi([reply(data=[address])])
+    code, data = httpapi.send_request(FMGRMethods.GET, [{"url": "/pm/config/adom/root/obj/firewall/address"}])
+    assert code == 0
+    assert data == [address]
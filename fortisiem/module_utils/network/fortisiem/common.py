@@ -900,6 +900,10 @@ class SendSyslog(object):
 
 
 # RECURSIVE FUNCTIONS START
+# PARAMGRAM KEYS THAT ONLY MEAN SOMETHING TO THE MODULE, AND ARE STRIPPED BEFORE THE PARAMGRAM IS SENT
+MODULE_ONLY_KEYS = ("mode", "adom", "host", "username", "password")
+
+
 def prepare_dict(obj):
     """
     Removes any keys from a dictionary that are only specific to our use in the module. FortiSIEM will reject
@@ -912,10 +916,8 @@ def prepare_dict(obj):
     :rtype: dict
     """
 
-    list_of_elems = ["mode", "adom", "host", "username", "password"]
-
     if isinstance(obj, dict):
-        obj = dict((key, prepare_dict(value)) for (key, value) in obj.items() if key not in list_of_elems)
+        obj = dict((key, prepare_dict(value)) for (key, value) in obj.items() if key not in MODULE_ONLY_KEYS)
     return obj
 
 
@@ -931,7 +933,44 @@ def scrub_dict(obj):
     :rtype: dict
     """
 
+    return _scrub(obj, ())
+
+
+def prepare_and_scrub_dict(obj):
+    """
+    Same as scrub_dict(prepare_dict(obj)), in a single pass over the dictionary.
+
+    :param obj: Dictionary object to be processed.
+    :type obj: dict
+
+    :return: Processed dictionary.
+    :rtype: dict
+    """
+    return _scrub(obj, MODULE_ONLY_KEYS)
+
+
+def _scrub(obj, drop_keys):
+    """
+    Scrubs every subtree exactly once, so the cost grows with the size of the dictionary and not with its depth.
+    Dictionaries inside lists are scrubbed too, and the ones left empty are removed from the list. drop_keys are
+    only removed from dictionaries, as prepare_dict() never looked inside lists.
+    """
     if isinstance(obj, dict):
-        return dict((k, scrub_dict(v)) for k, v in obj.items() if v and scrub_dict(v))
-    else:
-        return obj
+        scrubbed = dict()
+        for key, value in obj.items():
+            if not value or key in drop_keys:
+                continue
+            value = _scrub(value, drop_keys)
+            if value:
+                scrubbed[key] = value
+        return scrubbed
+    if isinstance(obj, list):
+        scrubbed = list()
+        for value in obj:
+            if isinstance(value, (dict, list)):
+                value = _scrub(value, ())
+                if isinstance(value, dict) and not value:
+                    continue
+            scrubbed.append(value)
+        return scrubbed
+    return obj